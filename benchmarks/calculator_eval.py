@@ -0,0 +1,70 @@
+"""
+Compares the calculator's ExpressionEngine with eval() on long expression chains.
+
+Usage:
+    python benchmarks/calculator_eval.py [--terms 100 1000 5000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sample_use.simple_calculator import ExpressionEngine
+
+
+def build_chain(terms):
+    """Returns a chain like ``12*3+45/6-...`` with ``terms`` numbers."""
+    operators = "+-*/"
+    parts = []
+    for i in range(terms):
+        if i:
+            parts.append(operators[i % 4])
+        parts.append(str(i % 97 + 1))
+    return "".join(parts)
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'terms':>8} {'eval':>12} {'typing':>12} {'cold':>12} {'warm':>12}")
+    for terms in args.terms:
+        expression = build_chain(terms)
+
+        def typing():
+            engine = ExpressionEngine()
+            for char in expression:
+                engine.push(char)
+
+        def cold():
+            engine = ExpressionEngine()
+            engine.set_text(expression)
+            engine.evaluate()
+
+        warm_engine = ExpressionEngine()
+        warm_engine.set_text(expression)
+        warm_engine.evaluate()
+
+        timings = (
+            best_of(args.repeat, lambda: eval(expression)),
+            best_of(args.repeat, typing),
+            best_of(args.repeat, cold),
+            best_of(args.repeat, warm_engine.evaluate),
+        )
+        print(f"{terms:>8} " + " ".join(f"{t * 1000:>10.3f}ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Headless benchmark suite for gui_lib.
+
+Runs every benchmark (or the ones whose name contains --filter), prints a
+table and writes the results as JSON. Each median is compared with a
+stored results file (benchmarks/baseline.json unless --baseline names
+another, or --no-baseline is given) and the run fails (exit code 1) when a
+benchmark got slower than --tolerance allows. Benchmarks missing from the
+baseline are reported as new. Baselines are machine specific; record one on
+the machine that runs the comparison.
+
+On Linux without a display an Xvfb server is started for the run, so the
+suite works on CI machines with no GPU (install the xvfb package).
+Settings are written to a temporary file, never to the user's own.
+
+Usage:
+    python benchmarks/run.py [--filter set_theme] [--quick] [--output results.json]
+                             [--baseline other.json | --no-baseline] [--tolerance 0.2]
+    python benchmarks/run.py --output benchmarks/baseline.json   # record a baseline
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS = []
+
+
+def benchmark(name, display=True):
+    """
+    Registers a benchmark.
+
+    The function receives the Context and returns ``{result_name: [seconds, ...]}``.
+    """
+    def register(func):
+        BENCHMARKS.append({"name": name, "func": func, "display": display})
+        return func
+    return register
+
+
+class Context:
+    """Shared state handed to every benchmark."""
+    def __init__(self, quick):
+        self.quick = quick
+        self.repeat = 3 if quick else 7
+        self._app = None
+
+    @property
+    def app(self):
+        """A MainWindow shared by the in-process benchmarks, created on first use."""
+        if self._app is None:
+            from gui_lib import MainWindow
+            self._app = MainWindow(title="gui_lib benchmarks")
+            self._app.update()
+        return self._app
+
+    def pump(self, seconds):
+        """Runs the Tk event loop for ``seconds``."""
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            self.app.update()
+            time.sleep(0.001)
+
+    def close(self):
+        if self._app is not None:
+            self._app.destroy()
+            self._app = None
+
+
+def run_child(code, repeat):
+    """Runs ``code`` in fresh interpreters and returns the float each one prints last."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append([float(value) for value in output.split()[-1].split(",")])
+    return samples
+
+
+# --- Startup -----------------------------------------------------------------
+
+@benchmark("cold_import", display=False)
+def bench_cold_import(ctx):
+    code = "import time; t = time.perf_counter(); import gui_lib; print(time.perf_counter() - t)"
+    return {"cold_import": [sample[0] for sample in run_child(code, ctx.repeat)]}
+
+
+@benchmark("mainwindow_startup")
+def bench_mainwindow_startup(ctx):
+    code = ("import time, gui_lib; t = time.perf_counter(); app = gui_lib.MainWindow(title='bench'); "
+            "app.update_idletasks(); print(time.perf_counter() - t); app.destroy()")
+    return {"mainwindow_startup": [sample[0] for sample in run_child(code, ctx.repeat)]}
+
+
+# --- Widget creation ---------------------------------------------------------
+
+def _element_factories():
+    from gui_lib import (CustomButton, CustomLabel, CustomEntry, CustomCombobox, CustomCheckbutton,
+                         CustomSparkline, CustomTable)
+    return {
+        "button": lambda parent, i: CustomButton(parent, text=f"Button {i}", command=None),
+        "label": lambda parent, i: CustomLabel(parent, text=f"Label {i}", bootstyle="info"),
+        "entry": lambda parent, i: CustomEntry(parent, width=20),
+        "combobox": lambda parent, i: CustomCombobox(parent, values=["One", "Two", "Three"]),
+        "checkbutton": lambda parent, i: CustomCheckbutton(parent, text=f"Check {i}"),
+        "sparkline": lambda parent, i: CustomSparkline(parent, capacity=60),
+        "table": lambda parent, i: CustomTable(parent, columns=["A", "B"], data=[(1, 2)] * 100, height=60),
+    }
+
+
+@benchmark("create_elements")
+def bench_create_elements(ctx):
+    import ttkbootstrap as ttk
+    count = 100 if ctx.quick else 500
+    results = {}
+    for kind, factory in _element_factories().items():
+        samples = []
+        for _ in range(ctx.repeat):
+            frame = ttk.Frame(ctx.app.get_content_frame())
+            start = time.perf_counter()
+            for i in range(count):
+                factory(frame, i).pack()
+            ctx.app.update_idletasks()
+            samples.append(time.perf_counter() - start)
+            frame.destroy()
+            ctx.app.update_idletasks()
+        results[f"create_{kind}[{count}]"] = samples
+    return results
+
+
+@benchmark("batch_build")
+def bench_batch_build(ctx):
+    from widget_batch import build_form
+    count = 200 if ctx.quick else 1000
+    return {
+        f"build_form[{count}]": [build_form(ctx.app, count, batched=False) for _ in range(ctx.repeat)],
+        f"build_form_batched[{count}]": [build_form(ctx.app, count, batched=True) for _ in range(ctx.repeat)],
+    }
+
+
+# --- Theme switching ---------------------------------------------------------
+
+@benchmark("set_theme")
+def bench_set_theme(ctx):
+    import ttkbootstrap as ttk
+    from gui_lib import CustomButton, CustomLabel
+    theme_manager = ctx.app.theme_manager
+    themes = theme_manager.get_available_themes()
+    original = theme_manager.get_current_theme()
+    results = {}
+    for count in (10, 100, 1000) if ctx.quick else (10, 100, 1000, 10000):
+        frame = ttk.Frame(ctx.app.get_content_frame())
+        with ctx.app.batch():
+            for i in range(count):
+                if i % 2:
+                    CustomButton(frame, text=str(i), command=None).grid(row=i // 20, column=i % 20)
+                else:
+                    CustomLabel(frame, text=str(i)).grid(row=i // 20, column=i % 20)
+        ctx.app.update_idletasks()
+        samples = []
+        for run in range(ctx.repeat):
+            start = time.perf_counter()
+            theme_manager.set_theme(themes[run % len(themes)])
+            ctx.app.update_ui()
+            ctx.app.update_idletasks()
+            samples.append(time.perf_counter() - start)
+        results[f"set_theme[{count}]"] = samples
+        frame.destroy()
+        ctx.app.update_idletasks()
+    theme_manager.set_theme(original)
+    return results
+
+
+# --- Event-loop responsiveness -----------------------------------------------
+
+@benchmark("ripple_lag")
+def bench_ripple_lag(ctx):
+    from gui_lib import CustomButton, LatencyHistogram
+    button = CustomButton(ctx.app.get_content_frame(), text="Ripple", command=None)
+    button.pack(pady=10)
+    ctx.pump(0.1)
+    watchdog = ctx.app.enable_watchdog(interval=5)
+    samples = []
+    for _ in range(ctx.repeat * 3):
+        watchdog.lag = LatencyHistogram()
+        button.element.event_generate("<ButtonPress-1>", x=5, y=5)
+        ctx.pump(button.ripple_duration + 0.05)
+        samples.append(watchdog.lag.max / 1000.0)
+    ctx.app.disable_watchdog()
+    button.element.destroy()
+    return {"ripple_click_max_lag": samples}
+
+
+# --- Text editor -------------------------------------------------------------
+
+@benchmark("text_editor")
+def bench_text_editor(ctx):
+    size_mb = 4 if ctx.quick else 32
+    directory = tempfile.mkdtemp(prefix="gui-lib-bench-")
+    path = os.path.join(directory, "large.py")
+    line = "def handler(event, value=42):  # a line of fairly typical Python source\n"
+    with open(path, "w") as file:
+        file.write(line * (size_mb * 1024 * 1024 // len(line)))
+    code = f"""
+import os, sys, time
+sys.path.append(os.path.join({ROOT!r}, "sample_use"))
+from text_editor import TextEditorApp
+app = TextEditorApp()
+app.update()
+start = time.perf_counter()
+app._load_file({path!r})
+while app._loader is not None:
+    app.update()
+opened = time.perf_counter() - start
+start = time.perf_counter()
+app._write_file({os.path.join(directory, "saved.py")!r}, wait=True)
+saved = time.perf_counter() - start
+app.destroy()
+print(f"{{opened}},{{saved}}")
+"""
+    try:
+        samples = run_child(code, max(1, ctx.repeat // 2))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        f"text_editor_open[{size_mb}MB]": [sample[0] for sample in samples],
+        f"text_editor_save[{size_mb}MB]": [sample[1] for sample in samples],
+    }
+
+
+# --- Pure Python -------------------------------------------------------------
+
+@benchmark("calculator_engine", display=False)
+def bench_calculator_engine(ctx):
+    from calculator_eval import build_chain
+    from sample_use.simple_calculator import ExpressionEngine
+    expression = build_chain(5000)
+    samples = []
+    for _ in range(ctx.repeat):
+        engine = ExpressionEngine()
+        start = time.perf_counter()
+        engine.set_text(expression)
+        engine.evaluate()
+        samples.append(time.perf_counter() - start)
+    return {"calculator_engine[5000]": samples}
+
+
+# --- Runner ------------------------------------------------------------------
+
+def ensure_display():
+    """Starts Xvfb when there is no display; returns False if none can be had."""
+    if sys.platform != "linux" or os.environ.get("DISPLAY"):
+        return True
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return False
+    for number in range(99, 200):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        server = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and server.poll() is None:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                atexit.register(server.terminate)
+                os.environ["DISPLAY"] = f":{number}"
+                return True
+            time.sleep(0.05)
+        server.terminate()
+    return False
+
+
+def summarize(samples):
+    milliseconds = [sample * 1000.0 for sample in samples]
+    return {
+        "median_ms": statistics.median(milliseconds),
+        "min_ms": min(milliseconds),
+        "max_ms": max(milliseconds),
+        "runs": len(milliseconds),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Prints the comparison with a baseline and returns the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<36} {'median':>11} {'baseline':>11} {'change':>8}")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<36} {result['median_ms']:>9.2f}ms {'-':>11} {'new':>8}")
+            continue
+        change = result["median_ms"] / reference["median_ms"] - 1.0 if reference["median_ms"] else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<36} {result['median_ms']:>9.2f}ms {reference['median_ms']:>9.2f}ms {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes and fewer runs")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Compare with this results file (default: benchmarks/baseline.json)")
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the baseline comparison")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Read before running, so recording a new baseline over it still compares with the old one
+    baseline = None
+    if not args.no_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        elif args.baseline != DEFAULT_BASELINE:
+            parser.error(f"baseline not found: {args.baseline}")
+
+    settings_dir = tempfile.mkdtemp(prefix="gui-lib-bench-settings-")
+    atexit.register(shutil.rmtree, settings_dir, True)
+    os.environ["EASY_GUI_SETTINGS"] = os.path.join(settings_dir, "settings.json")
+    random.seed(0)
+
+    selected = [entry for entry in BENCHMARKS if args.filter in entry["name"]]
+    has_display = ensure_display()
+    ctx = Context(args.quick)
+    results = {}
+    skipped = []
+    try:
+        for entry in selected:
+            if entry["display"] and not has_display:
+                print(f"{entry['name']:<36} skipped (no display and Xvfb is not installed)")
+                skipped.append(entry["name"])
+                continue
+            for name, samples in entry["func"](ctx).items():
+                results[name] = summarize(samples)
+                print(f"{name:<36} {results[name]['median_ms']:>9.2f}ms  (min {results[name]['min_ms']:.2f}ms)")
+    finally:
+        ctx.close()
+
+    import tkinter
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "tk": tkinter.TkVersion,
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "display": has_display,
+            "skipped": skipped,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if baseline is not None:
+        if baseline.get("meta", {}).get("quick") != args.quick:
+            print("Warning: baseline was recorded with a different --quick setting")
+        if compare(results, baseline.get("results", {}), args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
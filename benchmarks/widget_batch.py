@@ -0,0 +1,66 @@
+"""
+Times building a form of CustomLabel/CustomButton rows with and without MainWindow.batch().
+
+Needs a display (run under Xvfb on headless machines).
+
+Usage:
+    python benchmarks/widget_batch.py [--widgets 1000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from gui_lib import MainWindow, CustomButton, CustomLabel
+
+
+def build_form(app, widgets, batched):
+    """Builds ``widgets`` widgets into a fresh frame and waits for Tk to lay them out."""
+    frame = ttk.Frame(app.get_content_frame())
+    start = time.perf_counter()
+    if batched:
+        with app.batch() as batch:
+            batch.pack(frame, fill=BOTH, expand=True)
+            _add_rows(frame, widgets)
+    else:
+        frame.pack(fill=BOTH, expand=True)
+        _add_rows(frame, widgets)
+    app.update_idletasks()
+    elapsed = time.perf_counter() - start
+    frame.destroy()
+    app.update_idletasks()
+    return elapsed
+
+
+def _add_rows(frame, widgets):
+    for i in range(widgets // 2):
+        CustomLabel(frame, text=f"Field {i}", bootstyle="info").pack(fill=X)
+        CustomButton(frame, text=f"Edit {i}", command=None, bootstyle="secondary").pack(fill=X)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--widgets", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = MainWindow(title="Batch Benchmark")
+    try:
+        # Warm up ttkbootstrap's style builders so both runs start equal
+        build_form(app, 20, batched=False)
+        results = {}
+        for batched in (False, True):
+            results[batched] = min(build_form(app, args.widgets, batched) for _ in range(args.repeat))
+        print(f"{args.widgets} widgets, best of {args.repeat}")
+        print(f"  one at a time: {results[False] * 1000:9.1f}ms")
+        print(f"  batched:       {results[True] * 1000:9.1f}ms")
+        print(f"  speedup:       {results[False] / results[True]:9.2f}x")
+    finally:
+        app.destroy()
+
+
+if __name__ == "__main__":
+    main()
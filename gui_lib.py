@@ -1,22 +1,741 @@
 import tkinter as tk
+import tkinter.font as tkfont
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+import atexit
+import bisect
+import functools
+import hashlib
+import inspect
 import json
+import math
 import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import weakref
+from array import array
+from collections import OrderedDict, deque
+from types import MappingProxyType
+
+
+def _freeze(value):
+    """Returns an immutable copy of nested lists, tuples and dicts."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Tasks of coroutine commands, kept referenced until they finish
+_command_tasks = set()
+
+
+def _run_command(command, *args):
+    """
+    Calls a widget command; coroutine functions are scheduled as asyncio tasks.
+
+    Coroutine commands need the asyncio loop of ``MainWindow.run(async_mode=True)``.
+    """
+    result = command(*args)
+    if not inspect.iscoroutine(result):
+        return result
+    import asyncio
+    driver = _AsyncioDriver.current
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        if driver is None:
+            result.close()
+            print("Error running command: coroutine commands need MainWindow.run(async_mode=True)")
+            return None
+        loop = driver.loop
+    task = loop.create_task(result)
+    _command_tasks.add(task)
+    task.add_done_callback(_command_done)
+    if driver is not None and driver.loop is loop:
+        driver.wake()
+    return task
+
+
+def _command_done(task):
+    _command_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Error in command: {task.exception()}")
+
+
+class _AsyncioDriver:
+    """
+    Runs an asyncio loop inside Tk's main loop, stepped only when it has work.
+
+    Each step runs one iteration of the asyncio loop without blocking
+    (``call_soon(loop.stop)`` followed by ``run_forever``). The next step is
+    scheduled from what the loop has pending: right away while callbacks
+    are ready, otherwise with ``after`` for its earliest timer. I/O is
+    watched by Tk itself: on POSIX the file descriptor of the loop's
+    selector is registered with ``createfilehandler``, so socket, pipe and
+    subprocess events as well as ``call_soon_threadsafe`` run a step as soon
+    as Tk sees them. Timers, servers and transports keep working without
+    any task, and an idle loop costs nothing. Where Tk cannot watch the
+    selector (Windows, whose Tk has no file handlers), the loop is also
+    stepped every ``poll_interval`` seconds.
+    """
+    # Driver of the running MainWindow.run(async_mode=True), if any
+    current = None
+
+    def __init__(self, widget, loop, poll_interval):
+        self.widget = widget
+        self.loop = loop
+        self.poll_interval = poll_interval
+        self._after_id = None
+        self._fd = None
+        selector = getattr(loop, "_selector", None)
+        if hasattr(widget.tk, "createfilehandler") and hasattr(selector, "fileno"):
+            self._fd = selector.fileno()
+            widget.tk.createfilehandler(self._fd, tk.READABLE, self._on_readable)
+        self._schedule(0)
+
+    def wake(self):
+        """Runs a step as soon as possible, e.g. after a task was created from Tk."""
+        self._schedule(0)
+
+    def _schedule(self, delay):
+        """Replaces the pending step, if any, with one in ``delay`` seconds."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._after_id = self.widget.after(math.ceil(delay * 1000), self._step)
+
+    def _on_readable(self, fd, mask):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._step()
+
+    def _step(self):
+        self._after_id = None
+        loop = self.loop
+        if loop.is_running():
+            # Tk events were processed from inside a coroutine (update()); try once it returns
+            self._schedule(self.poll_interval)
+            return
+        loop.call_soon(loop.stop)
+        LoopWatchdog.call("asyncio", loop.run_forever)
+        # The event loop keeps ready callbacks in _ready and timers in the _scheduled heap
+        if loop._ready:
+            self._schedule(0)
+        elif loop._scheduled:
+            delay = max(0.0, loop._scheduled[0].when() - loop.time())
+            self._schedule(delay if self._fd is not None else min(delay, self.poll_interval))
+        elif self._fd is None:
+            self._schedule(self.poll_interval)
+
+    def close(self):
+        """Cancels the remaining tasks, lets them finish and closes the loop."""
+        import asyncio
+        try:
+            if self._after_id is not None:
+                self.widget.after_cancel(self._after_id)
+            if self._fd is not None:
+                self.widget.tk.deletefilehandler(self._fd)
+        except tk.TclError:
+            pass
+        self._after_id = None
+        self._fd = None
+        loop = self.loop
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+class _Span:
+    """Context manager that records one Profiler span."""
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        Profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class _NullSpan:
+    """Span used while profiling is disabled; does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Opt-in timing spans for gui_lib's hot paths.
+
+    Theme application and switching, widget construction and configuration,
+    ``update_ui`` and button command dispatch are wrapped with ``profiled``.
+    While disabled (the default) a wrapped call costs one attribute check.
+    Once enabled, every span is kept (up to ``max_events``) and feeds a
+    per-name LatencyHistogram. Results can be exported as JSON or in the
+    Chrome trace format (open it in chrome://tracing or Perfetto).
+    Setting ``EASY_GUI_PROFILE`` to a file path enables profiling at import
+    and writes a Chrome trace there at exit.
+    """
+    enabled = False
+    # Spans kept for export; older ones are dropped
+    max_events = 100000
+    _events = deque(maxlen=max_events)
+    _histograms = {}
+    _origin = time.perf_counter()
+
+    @classmethod
+    def enable(cls):
+        """Starts recording spans."""
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls):
+        """Stops recording spans; recorded data is kept."""
+        cls.enabled = False
+
+    @classmethod
+    def reset(cls):
+        """Drops every recorded span and histogram."""
+        cls._events.clear()
+        cls._histograms.clear()
+
+    @classmethod
+    def span(cls, name):
+        """
+        Returns a context manager timing the enclosed block as ``name``.
+
+        Example::
+
+            with Profiler.span("load_report"):
+                load_report()
+        """
+        return _Span(name) if cls.enabled else _NULL_SPAN
+
+    @classmethod
+    def record(cls, name, start, end):
+        """Adds a span measured with ``time.perf_counter`` timestamps."""
+        cls._events.append((name, start, end - start, threading.get_ident()))
+        histogram = cls._histograms.get(name)
+        if histogram is None:
+            histogram = cls._histograms[name] = LatencyHistogram()
+        histogram.add((end - start) * 1000.0)
+
+    @classmethod
+    def stats(cls):
+        """Returns ``{name: {"count", "mean", "p50", "p99", "max"}}`` in milliseconds."""
+        return {name: histogram.summary() for name, histogram in cls._histograms.items()}
+
+    @classmethod
+    def export_json(cls, path=None):
+        """
+        Returns the span statistics and the recorded spans as a dict.
+
+        Args:
+            path (str, optional): Also write them to this JSON file.
+        """
+        data = {
+            "stats": cls.stats(),
+            "spans": [{"name": name, "start_ms": (start - cls._origin) * 1000.0, "duration_ms": duration * 1000.0,
+                       "thread": thread} for name, start, duration, thread in list(cls._events)],
+        }
+        if path:
+            cls._write(path, data)
+        return data
+
+    @classmethod
+    def export_chrome_trace(cls, path=None):
+        """
+        Returns the recorded spans in the Chrome trace event format.
+
+        Args:
+            path (str, optional): Also write them to this JSON file.
+        """
+        pid = os.getpid()
+        data = {
+            "traceEvents": [{"name": name, "cat": "gui_lib", "ph": "X", "pid": pid, "tid": thread,
+                             "ts": (start - cls._origin) * 1e6, "dur": duration * 1e6}
+                            for name, start, duration, thread in list(cls._events)],
+            "displayTimeUnit": "ms",
+        }
+        if path:
+            cls._write(path, data)
+        return data
+
+    @staticmethod
+    def _write(path, data):
+        try:
+            with open(path, "w") as file:
+                json.dump(data, file)
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+
+
+def profiled(name):
+    """Decorator timing every call of the function as a Profiler span called ``name``."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not Profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                Profiler.record(name, start, time.perf_counter())
+        return wrapper
+    return decorate
+
+
+if os.environ.get("EASY_GUI_PROFILE"):
+    Profiler.enable()
+    atexit.register(Profiler.export_chrome_trace, os.environ["EASY_GUI_PROFILE"])
+
+
+class StyleSheet:
+    """
+    Frozen, fully resolved set of ttk style calls for one theme.
+
+    Attributes:
+        theme_name (str): Name of the theme the sheet was compiled from.
+        colors (Mapping): The theme's base colors and font family.
+        state_colors (Mapping): Hover, active and disabled colors per role.
+        component_fonts (Mapping): Font tuple per component.
+        syntax_colors (Mapping): Foreground color per syntax token type.
+        rules (Mapping): Options keyed by ``(method, style_name)``, where
+            method is ``"configure"`` or ``"map"``.
+    """
+    __slots__ = ("theme_name", "colors", "state_colors", "component_fonts", "syntax_colors", "rules")
+
+    def __init__(self, theme_name, colors, state_colors, component_fonts, syntax_colors, rules):
+        self.theme_name = theme_name
+        self.colors = _freeze(colors)
+        self.state_colors = _freeze(state_colors)
+        self.component_fonts = _freeze(component_fonts)
+        self.syntax_colors = _freeze(syntax_colors)
+        self.rules = MappingProxyType({
+            (method, style_name): _freeze(options)
+            for method, style_name, options in rules
+        })
+
+
+class ColorEngine:
+    """
+    Parses palettes once into packed RGB and derives color variants in bulk.
+
+    A palette (a theme's ``{role: "#rrggbb"}`` dict) is parsed into an
+    ``array('I')`` of ``0xRRGGBB`` values. Variants such as brightness scaling
+    and alpha blending over the background are computed for every role in one
+    pass and memoized per palette and factor. Returning to a theme, or
+    deriving a shade ramp that was already derived, is a dictionary lookup.
+    Palettes are keyed by their contents, so an edited theme is parsed again
+    without explicit invalidation.
+
+    Every result is an opaque ``#rrggbb`` string. Tk has no alpha channel, so
+    translucency is resolved by blending against the background here.
+    """
+    # Memoized palettes and variant tables kept before the least recently used are dropped
+    cache_size = 512
+    _cache = OrderedDict()
+    _hex = tuple(f"{value:02x}" for value in range(256))
+
+    @classmethod
+    def parse(cls, color):
+        """
+        Returns a ``#rgb`` or ``#rrggbb`` color as a packed ``0xRRGGBB`` int.
+
+        Raises:
+            ValueError: If ``color`` is not a hex color.
+        """
+        if not isinstance(color, str) or not color.startswith("#") or len(color) not in (4, 7):
+            raise ValueError(f"Not a hex color: {color!r}")
+        if len(color) == 4:
+            color = "#" + "".join(digit * 2 for digit in color[1:])
+        return int(color[1:], 16)
+
+    @classmethod
+    def format(cls, rgb):
+        """Returns a packed ``0xRRGGBB`` int as a ``#rrggbb`` string."""
+        hex_ = cls._hex
+        return "#" + hex_[(rgb >> 16) & 0xFF] + hex_[(rgb >> 8) & 0xFF] + hex_[rgb & 0xFF]
+
+    @classmethod
+    def _cached(cls, key, compute):
+        """Returns the memoized value for ``key``, computing and storing it on a miss."""
+        cache = cls._cache
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            return value
+        value = cache[key] = compute()
+        while len(cache) > cls.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    @classmethod
+    def palette(cls, colors):
+        """
+        Parses the hex colors of a palette once.
+
+        Args:
+            colors (dict): Role to color; entries that are not hex colors
+                (such as ``font``) are skipped.
+
+        Returns:
+            tuple: ``(key, roles, packed)``. ``key`` identifies the palette
+            contents, ``roles`` is a tuple of role names and ``packed`` an
+            ``array('I')`` of their ``0xRRGGBB`` values in the same order.
+        """
+        key = tuple(colors.items())
+
+        def compute():
+            hex_colors = [(role, color) for role, color in key
+                          if isinstance(color, str) and color.startswith("#")]
+            return (key, tuple(role for role, _ in hex_colors),
+                    array('I', [cls.parse(color) for _, color in hex_colors]))
+
+        return cls._cached(("palette", key), compute)
+
+    @classmethod
+    def scale(cls, colors, factor):
+        """
+        Scales the brightness of every color of a palette.
+
+        Each channel is multiplied by ``factor``, truncated and clamped to 255.
+
+        Returns:
+            Mapping: Role to scaled ``#rrggbb`` color.
+        """
+        key, roles, packed = cls.palette(colors)
+
+        def compute():
+            fmt = cls.format
+            scaled = [min(255, int(((rgb >> 16) & 0xFF) * factor)) << 16
+                      | min(255, int(((rgb >> 8) & 0xFF) * factor)) << 8
+                      | min(255, int((rgb & 0xFF) * factor))
+                      for rgb in packed]
+            return MappingProxyType(dict(zip(roles, map(fmt, scaled))))
+
+        return cls._cached(("scale", key, factor), compute)
+
+    @classmethod
+    def blend(cls, colors, alpha, background="background"):
+        """
+        Composites every color of a palette over its background.
+
+        Args:
+            colors (dict): The palette.
+            alpha (float): Opacity of the palette colors, 0 to 1.
+            background (str): Role, or ``#rrggbb`` color, to blend against.
+
+        Returns:
+            Mapping: Role to the opaque ``#rrggbb`` color seen on screen.
+        """
+        key, roles, packed = cls.palette(colors)
+
+        def compute():
+            base = cls.parse(background) if background.startswith("#") else packed[roles.index(background)]
+            inverse = 1.0 - alpha
+            base_r = ((base >> 16) & 0xFF) * inverse
+            base_g = ((base >> 8) & 0xFF) * inverse
+            base_b = (base & 0xFF) * inverse
+            blended = [int(((rgb >> 16) & 0xFF) * alpha + base_r + 0.5) << 16
+                       | int(((rgb >> 8) & 0xFF) * alpha + base_g + 0.5) << 8
+                       | int((rgb & 0xFF) * alpha + base_b + 0.5)
+                       for rgb in packed]
+            return MappingProxyType(dict(zip(roles, map(cls.format, blended))))
+
+        return cls._cached(("blend", key, alpha, background), compute)
+
+    @classmethod
+    def ramp(cls, colors, role, factors):
+        """
+        Returns a shade ramp of one role, one brightness factor per step.
+
+        Every step scales the whole palette, so ramps of the other roles with
+        the same factors are already computed.
+
+        Returns:
+            tuple: ``#rrggbb`` colors in the order of ``factors``.
+        """
+        return tuple(cls.scale(colors, factor)[role] for factor in factors)
+
+    @classmethod
+    def scale_color(cls, color, factor):
+        """Scales the brightness of a single ``#rrggbb`` color."""
+        return cls.scale({"color": color}, factor)["color"]
+
+    @classmethod
+    def blend_color(cls, color, background, alpha):
+        """Composites a single color with opacity ``alpha`` over ``background``."""
+        return cls.blend({"color": color}, alpha, background)["color"]
+
+    @classmethod
+    def clear(cls):
+        """Drops every memoized palette and variant."""
+        cls._cache.clear()
+
+
+class SettingsStore:
+    """
+    Persistent application settings shared by every window.
+
+    Changes are kept in memory and written by a background worker once no
+    further change arrived for ``write_delay`` seconds (or at the latest
+    ``max_write_delay`` seconds after the first pending change). Files are
+    replaced atomically, so a crash never leaves a half-written file behind.
+    A failed write keeps the changes pending and is retried with a growing
+    delay; the first failure of a streak is passed to ``on_error``.
+    """
+    _instance = None
+    # Seconds of quiet before pending changes are written
+    write_delay = 0.5
+    # Upper bound on how long a change can stay unwritten
+    max_write_delay = 2.0
+    # Seconds before the first retry of a failed write; doubles per failure
+    retry_delay = 1.0
+    # Upper bound on the delay between retries
+    max_retry_delay = 60.0
+    # Settings file used by older versions, relative to the working directory
+    legacy_file = "app_settings.json"
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(SettingsStore, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, path=None):
+        """
+        Initializes the settings store.
+
+        Args:
+            path (str, optional): Settings file. Defaults to ``default_path()``.
+        """
+        if hasattr(self, '_initialized'):
+            return
+        self._initialized = True
+        self.path = path or self.default_path()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._written_version = 0
+        self._first_change = None
+        self._last_change = None
+        self._worker = None
+        self._closed = False
+        # Consecutive failed writes and the monotonic time of the next retry
+        self._failures = 0
+        self._retry_at = None
+        # Called with the exception of a failed write (on the writing thread)
+        self.on_error = None
+        self._data = self._read()
+        atexit.register(self.close)
+
+    @staticmethod
+    def default_path():
+        """
+        Returns the per-user settings file location.
+
+        ``EASY_GUI_SETTINGS`` overrides it; otherwise ``%APPDATA%`` is used on
+        Windows and ``$XDG_CONFIG_HOME`` (or ``~/.config``) elsewhere.
+        """
+        override = os.environ.get("EASY_GUI_SETTINGS")
+        if override:
+            return override
+        if sys.platform == "win32":
+            base = os.environ.get("APPDATA") or os.path.expanduser("~")
+        else:
+            base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        return os.path.join(base, "easy_gui", "settings.json")
+
+    def _read(self):
+        """Loads the settings file, falling back to the legacy file."""
+        for settings_file in (self.path, self.legacy_file):
+            if os.path.exists(settings_file):
+                try:
+                    with open(settings_file, "r") as file:
+                        settings = json.load(file)
+                    if isinstance(settings, dict):
+                        return settings
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"Error reading settings: {e}")
+        return {}
+
+    def get(self, key, default=None, app=None):
+        """
+        Returns a setting.
+
+        Args:
+            key (str): Setting name.
+            default: Value returned when the setting is missing.
+            app (str, optional): Application name for per-app preferences.
+        """
+        with self._cond:
+            section = self._data.get("apps", {}).get(app, {}) if app else self._data
+            return section.get(key, default)
+
+    def set(self, key, value, app=None):
+        """
+        Changes a setting and schedules it to be written.
+
+        Args:
+            key (str): Setting name.
+            value: Any JSON-serializable value.
+            app (str, optional): Application name for per-app preferences.
+        """
+        with self._cond:
+            if app:
+                section = self._data.setdefault("apps", {}).setdefault(app, {})
+            else:
+                section = self._data
+            if key in section and section[key] == value:
+                return
+            section[key] = value
+            self._version += 1
+            now = time.monotonic()
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            if self._worker is None and not self._closed:
+                self._worker = threading.Thread(target=self._run, name="easy-gui-settings", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+
+    def _due(self):
+        """Returns the monotonic time at which pending changes must be written."""
+        due = min(self._last_change + self.write_delay, self._first_change + self.max_write_delay)
+        return max(due, self._retry_at) if self._retry_at is not None else due
+
+    def _pending(self):
+        return self._version != self._written_version and self._first_change is not None
+
+    def _take_snapshot(self):
+        """Serializes the settings. Must be called with the condition held."""
+        self._first_change = None
+        self._last_change = None
+        return self._version, json.dumps(self._data, indent=2)
+
+    def _run(self):
+        """Background worker that writes coalesced changes."""
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending():
+                        wait = self._due() - time.monotonic()
+                        if wait <= 0 or self._closed:
+                            break
+                        self._cond.wait(wait)
+                    elif self._closed:
+                        return
+                    else:
+                        self._cond.wait()
+                snapshot = self._take_snapshot()
+            self._write(*snapshot)
+
+    def _write(self, version, payload):
+        """Atomically replaces the settings file unless a newer version was written."""
+        with self._write_lock:
+            if version <= self._written_version:
+                return
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, "w") as file:
+                        file.write(payload)
+                        file.flush()
+                        os.fsync(file.fileno())
+                    os.replace(temp_path, self.path)
+                except BaseException:
+                    os.unlink(temp_path)
+                    raise
+            except OSError as e:
+                self._write_failed(e)
+                return
+            self._written_version = version
+            with self._cond:
+                self._failures = 0
+                self._retry_at = None
+
+    def _write_failed(self, error):
+        """Keeps the unwritten changes pending and schedules a retry."""
+        with self._cond:
+            self._failures += 1
+            first = self._failures == 1
+            if not self._closed:
+                now = time.monotonic()
+                if self._first_change is None:
+                    self._first_change = self._last_change = now
+                self._retry_at = now + min(self.max_retry_delay, self.retry_delay * 2 ** (self._failures - 1))
+                self._cond.notify()
+        # Retries of a failing write are not reported again
+        if first:
+            if self.on_error is not None:
+                self.on_error(error)
+            else:
+                print(f"Error saving settings: {error}")
+
+    def flush(self):
+        """Writes pending changes immediately on the calling thread, ignoring any retry delay."""
+        with self._cond:
+            if not self._pending():
+                return
+            snapshot = self._take_snapshot()
+        self._write(*snapshot)
+
+    def close(self):
+        """Flushes pending changes and stops the background worker."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
 
 class ThemeManager:
     """Manages the application's theme and color palette."""
     _instance = None
+    # Number of compiled style sheets kept in the LRU cache
+    style_sheet_cache_size = 16
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
             cls._instance = super(ThemeManager, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self, default_theme="nordic_frost"):
-        """Initializes the theme manager."""
+    def __init__(self, default_theme="nordic_frost", apply=True):
+        """
+        Initializes the theme manager.
+
+        Args:
+            default_theme (str): Theme used when no saved theme is found.
+            apply (bool): Replay the current theme into Tk right away. Pass
+                False to create the manager before the Tk root exists (the
+                root is then styled by a later ``set_theme``).
+        """
         if hasattr(self, '_initialized'):
             return
         self._initialized = True
+        self.settings = SettingsStore()
         # Remove tk instance since we don't need it anymore
         self.themes = {
             "ocean_ui_dark": {
@@ -145,7 +864,15 @@ class ThemeManager:
         self.current_theme = self.load_theme()
         if not self.current_theme or self.current_theme not in self.themes:
             self.current_theme = default_theme
-        
+
+        # Compiled style sheets, most recently used last
+        self._style_sheets = OrderedDict()
+        # Sheet last replayed into Tk and the interpreter/ttk theme it went to
+        self._applied_sheet = None
+        self._applied_to = None
+        # Style calls changed outside the sheet since it was applied; replayed in full
+        self._touched_styles = set()
+
         # Component Styles
         self.component_styles = {
             "button": {
@@ -153,347 +880,1109 @@ class ThemeManager:
                 "borderwidth": 0,
                 "relief": "flat",
                 "hover_opacity": 0.9,
-                "font": (self.themes[self.current_theme]["font"], 10)
             },
             "entry": {
                 "padding": (8, 4),
                 "borderwidth": 1,
                 "relief": "solid",
-                "font": (self.themes[self.current_theme]["font"], 10)
             },
             "label": {
                 "padding": (5, 5),
                 "wraplength": 300,
-                "font": (self.themes[self.current_theme]["font"], 10)
             },
             "combobox": {
                 "padding": (5, 4),
                 "arrowsize": 12,
                 "listbox_height": 5,
-                "font": (self.themes[self.current_theme]["font"], 10)
             },
-            "checkbutton": {
-                "indicatorcolor": self.themes[self.current_theme]["background"],
-                "font": (self.themes[self.current_theme]["font"], 10)
-            }
+            "checkbutton": {}
         }
 
         # State Colors
-        self.state_colors = {
-            "hover": {
-                "primary": self._adjust_color_brightness(self.themes[self.current_theme]["primary"], 1.1),
-                "secondary": self._adjust_color_brightness(self.themes[self.current_theme]["secondary"], 1.1),
-                "success": self._adjust_color_brightness(self.themes[self.current_theme]["success"], 1.1),
-                "info": self._adjust_color_brightness(self.themes[self.current_theme]["info"], 1.1),
-                "warning": self._adjust_color_brightness(self.themes[self.current_theme]["warning"], 1.1),
-                "danger": self._adjust_color_brightness(self.themes[self.current_theme]["danger"], 1.1),
-                "foreground": self.themes[self.current_theme]["foreground"]  # Added foreground
-            },
-            "active": {
-                "primary": self._adjust_color_brightness(self.themes[self.current_theme]["primary"], 0.9),
-                "secondary": self._adjust_color_brightness(self.themes[self.current_theme]["secondary"], 0.9),
-                "success": self._adjust_color_brightness(self.themes[self.current_theme]["success"], 0.9),
-                "info": self._adjust_color_brightness(self.themes[self.current_theme]["info"], 0.9),
-                "warning": self._adjust_color_brightness(self.themes[self.current_theme]["warning"], 0.9),
-                "danger": self._adjust_color_brightness(self.themes[self.current_theme]["danger"], 0.9),
-                "foreground": self.themes[self.current_theme]["foreground"]  # Added foreground
-            },
-            "disabled": {
-                "background": self._adjust_color_opacity(self.themes[self.current_theme]["background"], 0.5),
-                "foreground": self._adjust_color_opacity(self.themes[self.current_theme]["foreground"], 0.5),
-            }
-        }
+        self.state_colors = {"hover": {}, "active": {}, "disabled": {}}
 
-        self.apply_theme()
+        # ttkbootstrap theme names registered for our themes
+        self._ttk_themes = {}
+
+        self._sync_theme_state(self.get_style_sheet(self.current_theme))
+        if apply:
+            self.apply_theme()
 
     def _adjust_color_brightness(self, color, factor):
         """Adjust the brightness of a color by a factor"""
-        # Convert hex to RGB, adjust brightness, convert back to hex
-        r = int(color[1:3], 16)
-        g = int(color[3:5], 16)
-        b = int(color[5:7], 16)
-        
-        r = min(255, int(r * factor))
-        g = min(255, int(g * factor))
-        b = min(255, int(b * factor))
-        
-        return f"#{r:02x}{g:02x}{b:02x}"
+        return ColorEngine.scale_color(color, factor)
+
+    def _adjust_color_opacity(self, color, opacity, background=None):
+        """
+        Returns the opaque color of ``color`` drawn with ``opacity`` over
+        ``background`` (the current theme's background by default).
+        """
+        if background is None:
+            background = self.get_theme_colors()["background"]
+        return ColorEngine.blend_color(color, background, opacity)
 
-    def _adjust_color_opacity(self, color, opacity):
-        """Add opacity to a color"""
-        return f"{color}{int(opacity * 255):02x}"
+    def ttk_theme_definition(self, theme_name):
+        """
+        Returns the arguments of a ttkbootstrap ``ThemeDefinition(name, colors, mode)``
+        for one of our themes.
+
+        Args:
+            theme_name (str): Name of one of our themes.
+
+        Returns:
+            dict: ``{"mode": "dark"|"light", "colors": {...}}``, our palette
+            mapped onto the 16 color slots of ttkbootstrap's ``Colors``.
+        """
+        colors = self.themes[theme_name]
+        background = colors["background"]
+        foreground = colors["foreground"]
+        rgb = ColorEngine.parse(background)
+        r, g, b = (rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF
+        dark = 0.2126 * r + 0.7152 * g + 0.0722 * b < 128
+        return {
+            "mode": "dark" if dark else "light",
+            "colors": {
+                **{role: colors[role] for role in
+                   ("primary", "secondary", "success", "info", "warning", "danger", "light", "dark")},
+                "bg": background,
+                "fg": foreground,
+                "selectbg": colors["primary"],
+                "selectfg": background,
+                "border": colors["secondary"],
+                "inputfg": foreground,
+                "inputbg": background,
+                "active": self._adjust_color_brightness(background, 1.25 if dark else 0.92),
+            },
+        }
+
+    def register_ttk_theme(self, theme_name):
+        """
+        Registers one of our themes as a ttkbootstrap theme.
+
+        The ``ThemeDefinition`` is handed to ``Style.register_theme`` through
+        ttkbootstrap's deferred config: at once if the ``Style`` exists,
+        otherwise when the Tk root creates it, before it builds its first
+        theme. ``MainWindow`` passes the result as ``themename``, so stock
+        bootstyle widgets match the palette and no stock theme is built.
+
+        Args:
+            theme_name (str): Name of one of our themes.
+
+        Returns:
+            str: The ttkbootstrap theme name, or None if it could not be registered.
+        """
+        name = self._ttk_themes.get(theme_name)
+        if name is not None:
+            return name
+        try:
+            from ttkbootstrap.style import Style, ThemeDefinition
+            from ttkbootstrap.utils import config
+            # Prefixed, as the name has to be chosen before the Style can be asked
+            name = f"gui_lib_{theme_name}"
+            definition = self.ttk_theme_definition(theme_name)
+            theme = ThemeDefinition(name, definition["colors"], definition["mode"])
+        except (ImportError, KeyError, TypeError, ValueError) as e:
+            print(f"Error registering ttk theme '{theme_name}': {e}")
+            return None
+        config.defer(f"gui_lib_theme:{name}", lambda: Style.get_instance().register_theme(theme))
+        self._ttk_themes[theme_name] = name
+        return name
 
     def load_theme(self):
-        """Loads the theme from settings file."""
-        settings_file = "app_settings.json"
-        if os.path.exists(settings_file):
-            with open(settings_file, "r") as file:
+        """Loads the theme from the settings store."""
+        return self.settings.get("theme")
+
+    def save_theme(self):
+        """Saves the current theme to the settings store (written in the background)."""
+        self.settings.set("theme", self.current_theme)
+
+    def get_style_sheet(self, theme_name):
+        """
+        Returns the compiled style sheet for a theme, compiling it on first use.
+
+        Args:
+            theme_name (str): Name of the theme.
+
+        Returns:
+            StyleSheet: The frozen style sheet for the theme.
+        """
+        sheet = self._style_sheets.get(theme_name)
+        if sheet is not None:
+            self._style_sheets.move_to_end(theme_name)
+            return sheet
+
+        sheet = self._compile_style_sheet(theme_name)
+        self._style_sheets[theme_name] = sheet
+        while len(self._style_sheets) > self.style_sheet_cache_size:
+            self._style_sheets.popitem(last=False)
+        return sheet
+
+    def invalidate_style_sheets(self, theme_name=None):
+        """
+        Drops cached style sheets so they are recompiled on next use.
+
+        Call this after editing an entry of ``themes`` at runtime.
+
+        Args:
+            theme_name (str, optional): Theme to drop. Drops every theme if omitted.
+        """
+        if theme_name is None:
+            self._style_sheets.clear()
+        else:
+            self._style_sheets.pop(theme_name, None)
+        # Force a full replay, the applied sheet may no longer match its theme
+        self._applied_sheet = None
+
+    def _compile_style_sheet(self, theme_name):
+        """Resolves every color, state map and font of a theme into a StyleSheet."""
+        theme_colors = self.themes[theme_name]
+        font = (theme_colors["font"], 10)
+        roles = ["primary", "secondary", "success", "info", "warning", "danger"]
+
+        # Each variant is derived for the whole palette at once and memoized
+        hover = ColorEngine.scale(theme_colors, 1.1)
+        active = ColorEngine.scale(theme_colors, 0.9)
+        faded = ColorEngine.blend(theme_colors, 0.5)
+        state_colors = {
+            "hover": {role: hover[role] for role in roles},
+            "active": {role: active[role] for role in roles},
+            "disabled": {role: faded[role] for role in roles + ["background", "foreground"]},
+        }
+        state_colors["hover"]["foreground"] = theme_colors["foreground"]
+        state_colors["active"]["foreground"] = theme_colors["foreground"]
+
+        component_fonts = {name: font for name in self.component_styles}
+        button = self.component_styles["button"]
+        entry = self.component_styles["entry"]
+        label = self.component_styles["label"]
+        combobox = self.component_styles["combobox"]
+        disabled = state_colors["disabled"]
+
+        rules = []
+
+        # Configure fonts for all widgets
+        rules.append(("configure", ".", {"font": font}))
+
+        # Button styles (primary uses the bare TButton style)
+        for _style in roles:
+            name = "TButton" if _style == "primary" else f"{_style}.TButton"
+            rules.append(("configure", name, {
+                "background": theme_colors[_style],
+                "foreground": theme_colors["foreground"],
+                "bordercolor": theme_colors[_style],
+                "darkcolor": theme_colors["background"],
+                "lightcolor": theme_colors["background"],
+                "padding": button["padding"],
+                "borderwidth": button["borderwidth"],
+                "relief": button["relief"],
+                "focusthickness": 0,
+                "focuscolor": theme_colors[_style]
+            }))
+            rules.append(("map", name, {
+                "foreground": [
+                    ('disabled', disabled["foreground"]),
+                    ('pressed', theme_colors["foreground"]),
+                    ('active', theme_colors["foreground"])
+                ],
+                "background": [
+                    ('disabled', disabled[_style]),
+                    ('pressed', state_colors["active"][_style]),
+                    ('active', state_colors["hover"][_style])
+                ],
+                "bordercolor": [
+                    ('disabled', disabled[_style]),
+                    ('pressed', state_colors["active"][_style]),
+                    ('active', state_colors["hover"][_style])
+                ]
+            }))
+
+        # Entry styles
+        rules.append(("configure", "TEntry", {
+            "foreground": theme_colors["foreground"],
+            "fieldbackground": theme_colors["background"],
+            "bordercolor": theme_colors["secondary"],
+            "lightcolor": theme_colors["background"],
+            "darkcolor": theme_colors["background"],
+            "padding": entry["padding"],
+            "borderwidth": entry["borderwidth"],
+            "relief": entry["relief"],
+            "insertcolor": theme_colors["primary"]
+        }))
+        rules.append(("map", "TEntry", {
+            "foreground": [('disabled', disabled["foreground"])],
+            "fieldbackground": [('disabled', disabled["background"])],
+            "bordercolor": [
+                ('focus', theme_colors["primary"]),
+                ('disabled', theme_colors["secondary"])
+            ]
+        }))
+
+        # Label styles
+        rules.append(("configure", "TLabel", {
+            "foreground": theme_colors["foreground"],
+            "background": theme_colors["background"],
+            "padding": label["padding"],
+            "wraplength": label["wraplength"]
+        }))
+        rules.append(("configure", "info.TLabel", {
+            "foreground": theme_colors["info"],
+            "background": theme_colors["background"]
+        }))
+
+        # Combobox styles
+        rules.append(("configure", "TCombobox", {
+            "foreground": theme_colors["foreground"],
+            "fieldbackground": theme_colors["background"],
+            "bordercolor": theme_colors["secondary"],
+            "darkcolor": theme_colors["background"],
+            "lightcolor": theme_colors["background"],
+            "arrowcolor": theme_colors["foreground"],
+            "padding": combobox["padding"],
+            "arrowsize": combobox["arrowsize"]
+        }))
+        rules.append(("map", "TCombobox", {
+            "foreground": [
+                ('disabled', disabled["foreground"]),
+                ('readonly', theme_colors["foreground"])
+            ],
+            "fieldbackground": [
+                ('disabled', disabled["background"]),
+                ('readonly', theme_colors["background"])
+            ],
+            "bordercolor": [
+                ('focus', theme_colors["primary"]),
+                ('disabled', theme_colors["secondary"]),
+                ('readonly', theme_colors["secondary"])
+            ],
+            "arrowcolor": [
+                ('disabled', disabled["foreground"]),
+                ('readonly', theme_colors["foreground"])
+            ]
+        }))
+
+        # Checkbutton styles
+        rules.append(("configure", "TCheckbutton", {
+            "foreground": theme_colors["foreground"],
+            "background": theme_colors["background"],
+            "indicatorcolor": theme_colors["background"],
+            "padding": label["padding"]
+        }))
+        rules.append(("map", "TCheckbutton", {
+            "foreground": [('disabled', disabled["foreground"])],
+            "background": [('disabled', disabled["background"])],
+            "indicatorcolor": [
+                ('selected', theme_colors["primary"]),
+                ('pressed', theme_colors["primary"]),
+                ('disabled', disabled["background"])
+            ]
+        }))
+
+        # Frame styles
+        rules.append(("configure", "TFrame", {"background": theme_colors["background"]}))
+        rules.append(("configure", "secondary.TFrame", {"background": theme_colors["secondary"]}))
+        rules.append(("configure", "light.TFrame", {"background": theme_colors["light"]}))
+
+        # Scrollbar styles
+        rules.append(("configure", "Vertical.TScrollbar", {
+            "background": theme_colors["secondary"],
+            "troughcolor": theme_colors["background"],
+            "bordercolor": theme_colors["background"],
+            "arrowcolor": theme_colors["foreground"],
+            "gripcount": 0,
+            "relief": "flat",
+            "borderwidth": 0
+        }))
+        rules.append(("map", "Vertical.TScrollbar", {
+            "background": [
+                ('pressed', state_colors["active"]["secondary"]),
+                ('active', state_colors["hover"]["secondary"])
+            ],
+            "arrowcolor": [
+                ('pressed', state_colors["active"]["foreground"]),
+                ('active', state_colors["hover"]["foreground"])
+            ]
+        }))
+
+        # Syntax highlighting colors
+        syntax_colors = {
+            "keyword": theme_colors["primary"],
+            "definition": theme_colors["info"],
+            "builtin": theme_colors["info"],
+            "string": theme_colors["success"],
+            "number": theme_colors["warning"],
+            "comment": theme_colors["secondary"],
+        }
+
+        return StyleSheet(theme_name, theme_colors, state_colors, component_fonts, syntax_colors, rules)
+
+    def _sync_theme_state(self, sheet):
+        """Copies the resolved fonts and state colors of a sheet onto the manager."""
+        for name, font in sheet.component_fonts.items():
+            self.component_styles[name]["font"] = font
+        self.component_styles["checkbutton"]["indicatorcolor"] = sheet.colors["background"]
+        for state, colors in sheet.state_colors.items():
+            self.state_colors[state].clear()
+            self.state_colors[state].update(colors)
+
+    @profiled("ThemeManager.apply_theme")
+    def apply_theme(self):
+        """
+        Applies the current theme to the application.
+
+        Replays the cached style sheet of the current theme. Only options that
+        differ from the previously applied sheet are sent to Tk, except for
+        styles changed through ``configure_style`` since then, which are
+        replayed in full.
+        """
+        sheet = self.get_style_sheet(self.current_theme)
+        style = ttk.Style()
+
+        target = (style.tk, style.theme_use())
+        previous = self._applied_sheet if self._applied_to == target else None
+        touched = self._touched_styles
+
+        for key, options in sheet.rules.items():
+            if previous is not None and key not in touched:
+                applied = previous.rules.get(key, {})
+                options = {option: value for option, value in options.items()
+                           if applied.get(option) != value}
+            if not options:
+                continue
+            method, style_name = key
+            if method == "map":
+                style.map(style_name, **options)
+            else:
+                style.configure(style_name, **options)
+
+        self._applied_sheet = sheet
+        self._applied_to = target
+        touched.clear()
+
+    def configure_style(self, method, style_name, **options):
+        """
+        Changes a ttk style outside the theme's style sheet.
+
+        Use this instead of calling ``ttk.Style`` directly, so the next
+        ``apply_theme`` does not assume the style still matches the sheet.
+
+        Args:
+            method (str): ``"configure"`` or ``"map"``.
+            style_name (str): ttk style, e.g. ``"TEntry"``.
+            **options: Options passed to ``ttk.Style.configure``/``map``.
+        """
+        style = ttk.Style()
+        if method == "map":
+            style.map(style_name, **options)
+        else:
+            style.configure(style_name, **options)
+        self._touched_styles.add((method, style_name))
+
+    def invalidate_applied_styles(self):
+        """
+        Makes the next ``apply_theme`` replay every option of the sheet.
+
+        Call this after changing ttk styles directly instead of through
+        ``configure_style``.
+        """
+        self._applied_sheet = None
+
+    @profiled("ThemeManager.set_theme")
+    def set_theme(self, theme_name):
+        """Sets the current theme and applies it."""
+        if theme_name in self.themes:
+            self.current_theme = theme_name
+
+            # Update component styles and state colors based on the new theme
+            self._sync_theme_state(self.get_style_sheet(theme_name))
+
+            self.apply_theme()
+            self.save_theme()
+        else:
+            print(f"Theme '{theme_name}' not found.")
+
+    def get_theme_colors(self):
+        """Returns colors based on the current theme"""
+        return self.themes.get(self.current_theme, self.themes["nordic_frost"])
+
+    def get_syntax_colors(self):
+        """Returns the syntax highlighting color of each token type for the current theme."""
+        return self.get_style_sheet(self.current_theme).syntax_colors
+
+    def get_current_theme(self):
+        return self.current_theme
+
+    def get_available_themes(self):
+        """Returns a list of available theme names."""
+        return list(self.themes.keys())
+
+class WidgetRegistry:
+    """
+    Tracks live CustomElement wrappers through weak references.
+
+    Wrappers are grouped by element type and bootstyle so a theme refresh can
+    resolve styles once per group and visit exactly the live wrappers, without
+    walking the Tk widget tree.
+    """
+    _instance = None
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(WidgetRegistry, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """Initializes the widget registry."""
+        if hasattr(self, '_initialized'):
+            return
+        self._initialized = True
+        self._groups = {}
+        self._keys = weakref.WeakKeyDictionary()
+
+    def register(self, element):
+        """
+        Adds an element to the registry, or moves it to its current group.
+
+        Args:
+            element (CustomElement): The wrapper to track.
+        """
+        key = (type(element), element.config.get('bootstyle'))
+        previous = self._keys.get(element)
+        if previous == key:
+            return
+        if previous is not None:
+            self._discard(previous, element)
+        self._groups.setdefault(key, weakref.WeakSet()).add(element)
+        self._keys[element] = key
+
+    def unregister(self, element):
+        """
+        Removes an element from the registry.
+
+        Args:
+            element (CustomElement): The wrapper to forget.
+        """
+        key = self._keys.pop(element, None)
+        if key is not None:
+            self._discard(key, element)
+
+    def _discard(self, key, element):
+        """Removes an element from a group and drops the group once empty."""
+        group = self._groups.get(key)
+        if group is None:
+            return
+        group.discard(element)
+        if not group:
+            del self._groups[key]
+
+    def groups(self):
+        """Returns a list of ``((element_type, bootstyle), [elements])`` pairs."""
+        return [(key, list(group)) for key, group in list(self._groups.items()) if group]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def refresh(self):
+        """Re-applies theme styles to every live element, one batch per group."""
+        theme_colors = ThemeManager().get_theme_colors()
+        for (element_type, _bootstyle), elements in self.groups():
+            # Subclasses with their own update_styles are refreshed one by one
+            if element_type.update_styles is not CustomElement.update_styles:
+                for element in elements:
+                    element.update_styles()
+                continue
+
+            # Resolved once per group, filtered once per wrapped widget class
+            resolved = None
+            styles_by_class = {}
+            for element in elements:
+                widget = element.element
+                if widget is None:
+                    continue
+                if resolved is None:
+                    resolved = element._resolve_styles(theme_colors)
+                styles = styles_by_class.get(type(widget))
+                if styles is None:
+                    supported = set(widget.keys())
+                    styles = {option: value for option, value in resolved.items() if option in supported}
+                    styles_by_class[type(widget)] = styles
+                overrides = {option: value for option, value in styles.items() if option not in element.config}
+                if overrides:
+                    element._apply_styles(overrides)
+
+
+class WidgetBatch:
+    """
+    Collects widget configuration and geometry calls and applies them in one pass.
+
+    Use it through ``MainWindow.batch()``::
+
+        with window.batch():
+            for i in range(1000):
+                CustomButton(frame, text=str(i), command=None).pack(fill=X)
+
+    While a batch is open, CustomElement configs and ``pack``/``grid``/
+    ``place`` calls are queued. Widgets are not managed by a geometry
+    manager until the batch commits, so Tk does not lay out or draw
+    partial screens. On commit, every element is configured once (however
+    many times ``set_config`` was called), and runs of ``pack`` calls with
+    the same options are sent to Tk as a single command. Nested batches join
+    the outermost one. Plain ttk widgets can be queued with ``pack``,
+    ``grid`` and ``place``.
+    """
+    _active = None
+
+    def __init__(self):
+        """Initializes an empty batch."""
+        self._depth = 0
+        self._configs = {}
+        self._geometry = []
+
+    @classmethod
+    def current(cls):
+        """Returns the open batch, or None."""
+        return cls._active
+
+    @classmethod
+    def geometry(cls, widget, manager, options):
+        """Runs a geometry manager call now, or queues it if a batch is open."""
+        batch = cls._active
+        if batch is None:
+            getattr(widget, manager)(**options)
+        else:
+            batch._geometry.append((manager, widget, options))
+
+    def __enter__(self):
+        WidgetBatch._active = self
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth == 0:
+            WidgetBatch._active = None
+            self.commit()
+        return False
+
+    def configure(self, element):
+        """Queues ``element._apply_config``; repeated requests collapse into one."""
+        self._configs[element] = None
+
+    def pack(self, widget, **kwargs):
+        """Queues ``widget.pack(**kwargs)``."""
+        self._geometry.append(("pack", widget, kwargs))
+
+    def grid(self, widget, **kwargs):
+        """Queues ``widget.grid(**kwargs)``."""
+        self._geometry.append(("grid", widget, kwargs))
+
+    def place(self, widget, **kwargs):
+        """Queues ``widget.place(**kwargs)``."""
+        self._geometry.append(("place", widget, kwargs))
+
+    def commit(self):
+        """Applies the queued configs, then the queued geometry calls in order."""
+        configs, self._configs = self._configs, {}
+        geometry, self._geometry = self._geometry, []
+        for element in configs:
+            element._apply_config()
+
+        index = 0
+        while index < len(geometry):
+            manager, widget, options = geometry[index]
+            if manager != "pack":
                 try:
-                    settings = json.load(file)
-                    return settings.get("theme", None)
-                except json.JSONDecodeError:
-                   return None
-        return None
+                    getattr(widget, manager)(**options)
+                except Exception as e:
+                    print(f"Error applying {manager}: {e}")
+                index += 1
+                continue
+            # Consecutive packs with the same master and options share one Tk command
+            end = index + 1
+            while (end < len(geometry) and geometry[end][0] == "pack" and geometry[end][2] == options
+                   and geometry[end][1].master is widget.master):
+                end += 1
+            try:
+                paths = [str(entry[1]) for entry in geometry[index:end]]
+                widget.tk.call("pack", "configure", *paths, *widget._options(options))
+            except Exception as e:
+                print(f"Error applying pack: {e}")
+            index = end
+
+
+class BackgroundTask:
+    """
+    Handle for work started with ``MainWindow.run_in_background``.
+
+    Attributes:
+        future (concurrent.futures.Future): The underlying future.
+        cancelled (bool): True once ``cancel`` was called; the callbacks will not run.
+    """
+    def __init__(self, future, on_done, on_error):
+        self.future = future
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Cancels the task.
+
+        A task that has not started yet never runs. A running task cannot be
+        interrupted, but its result is dropped and ``on_done`` is not called.
+        Long-running functions can poll ``cancelled`` to stop early.
+        """
+        self.cancelled = True
+        self.future.cancel()
+
+    def done(self):
+        """Returns True once the function finished or was cancelled."""
+        return self.future.done()
+
+    def _finish(self):
+        """Runs the callbacks on the Tk thread."""
+        if self.cancelled or self.future.cancelled():
+            return
+        error = self.future.exception()
+        if error is not None:
+            if self.on_error:
+                self.on_error(error)
+            else:
+                print(f"Error in background task: {error}")
+        elif self.on_done:
+            self.on_done(self.future.result())
+
+
+class UIDispatcher:
+    """
+    Runs background work in worker pools and hands results back to the Tk thread.
+
+    Any thread may ``post`` a callable; the Tk thread drains the queue in time
+    slices of ``slice_budget`` seconds, once per frame until it is empty, so a
+    flood of results never freezes the window. When more than ``max_pending``
+    callables are waiting, ``post`` blocks the posting (non-Tk) thread until
+    the UI catches up. Pools are created on first use.
+
+    The dispatcher only wakes the event loop when there is something to run.
+    A post that makes the queue non-empty schedules a drain. Other threads
+    can do that through Tcl only while Tk's own main loop is running, which
+    ``MainWindow.run`` announces with ``set_thread_wakeups(True)``. Outside
+    it (before ``run``, or under ``run_async``) the queue is checked every
+    ``idle_interval`` ms instead, and every frame while tasks are running.
+    """
+    # Seconds of queued callbacks run per drain
+    slice_budget = 0.008
+    # Queued callbacks above which posting threads wait
+    max_pending = 1000
+    # Milliseconds between queue checks while other threads cannot wake Tk
+    idle_interval = 100
+
+    def __init__(self, widget, max_workers=None, max_processes=None):
+        """
+        Initializes the dispatcher.
+
+        Args:
+            widget (tk.Misc): Widget whose event loop runs the callbacks.
+            max_workers (int, optional): Thread pool size. Defaults to the executor's default.
+            max_processes (int, optional): Process pool size. Defaults to the CPU count.
+        """
+        self.widget = widget
+        self.max_workers = max_workers
+        self.max_processes = max_processes
+        self._queue = deque()
+        self._not_full = threading.Condition()
+        self._tk_thread = threading.get_ident()
+        self._thread_pool = None
+        self._process_pool = None
+        self._tasks = set()
+        self._after_id = None
+        # True while a drain is scheduled or running that will see new posts
+        self._drain_pending = False
+        self._thread_wakeups = False
+        self._closed = False
+        self._schedule(self.idle_interval)
+
+    def set_thread_wakeups(self, enabled):
+        """
+        Tells the dispatcher whether other threads may schedule Tk callbacks.
+
+        Only enable this while Tk's own main loop runs on a threaded Tcl
+        build; otherwise cross-thread Tcl calls fail. While enabled, the
+        idle checks stop.
+        """
+        self._thread_wakeups = enabled
+        if enabled:
+            if self._after_id is not None and not self._drain_pending:
+                # Drop the idle check; posts wake the loop from now on
+                self.widget.after_cancel(self._after_id)
+                self._after_id = None
+            with self._not_full:
+                has_work = bool(self._queue)
+            if has_work:
+                self._wake()
+        else:
+            self._schedule(self.idle_interval)
+
+    def post(self, func, *args):
+        """
+        Queues ``func(*args)`` to run on the Tk thread.
+
+        Safe to call from any thread. Blocks a non-Tk thread while more than
+        ``max_pending`` callables are waiting.
+        """
+        with self._not_full:
+            if threading.get_ident() != self._tk_thread:
+                while len(self._queue) >= self.max_pending and not self._closed:
+                    self._not_full.wait(0.1)
+            self._queue.append((func, args))
+            if self._drain_pending:
+                return
+            self._drain_pending = True
+        self._wake()
+
+    def _wake(self):
+        """Schedules a drain as soon as possible from any thread."""
+        if threading.get_ident() == self._tk_thread:
+            if self._after_id is not None:
+                self.widget.after_cancel(self._after_id)
+                self._after_id = None
+            self._schedule(0)
+        elif self._thread_wakeups and not self._closed:
+            try:
+                # Tcl forwards the call to the Tk thread and returns once it is queued
+                self.widget.after(0, self._drain)
+            except (RuntimeError, tk.TclError):
+                # The main loop just stopped; the idle checks take over again
+                pass
+
+    def pending(self):
+        """Returns the number of callables waiting for the Tk thread."""
+        return len(self._queue)
+
+    def submit(self, func, *args, on_done=None, on_error=None, process=False, **kwargs):
+        """
+        Runs ``func(*args, **kwargs)`` in a worker pool.
+
+        Args:
+            func (function): Work to run; with ``process=True`` it and its
+                arguments must be picklable.
+            on_done (function, optional): Called on the Tk thread with the result.
+            on_error (function, optional): Called on the Tk thread with the exception.
+            process (bool): Use the process pool instead of the thread pool.
+
+        Returns:
+            BackgroundTask: Handle for cancelling the task.
+        """
+        pool = self._get_pool(process)
+        task = BackgroundTask(pool.submit(func, *args, **kwargs), on_done, on_error)
+        self._tasks.add(task)
+        task.future.add_done_callback(lambda future: self.post(self._finish, task))
+        if not self._thread_wakeups and not self._drain_pending:
+            # Results cannot wake the loop, so switch from the idle rate to per-frame checks
+            if self._after_id is not None:
+                self.widget.after_cancel(self._after_id)
+                self._after_id = None
+            self._schedule(int(1000 / FrameClock.fps))
+        return task
+
+    def _get_pool(self, process):
+        import concurrent.futures
+        if self._closed:
+            raise RuntimeError("dispatcher is shut down")
+        if process:
+            if self._process_pool is None:
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(self.max_processes)
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="easy-gui-worker")
+        return self._thread_pool
+
+    def _finish(self, task):
+        self._tasks.discard(task)
+        task._finish()
+
+    def _schedule(self, delay):
+        if self._after_id is None and not self._closed:
+            self._after_id = self.widget.after(delay, self._drain)
+
+    def _drain(self):
+        """Runs queued callables until the time slice is used up."""
+        self._after_id = None
+        if self._closed:
+            return
+        deadline = time.perf_counter() + self.slice_budget
+        queue = self._queue
+        while queue:
+            func, args = queue.popleft()
+            try:
+                LoopWatchdog.call("dispatch", func, *args)
+            except Exception:
+                self.widget.report_callback_exception(*sys.exc_info())
+            if time.perf_counter() >= deadline:
+                break
+        with self._not_full:
+            self._not_full.notify_all()
+            # Posts made from here on schedule their own drain
+            self._drain_pending = bool(queue)
+        if queue:
+            self._schedule(int(1000 / FrameClock.fps))
+        elif not self._thread_wakeups:
+            # Other threads cannot schedule a drain themselves
+            self._schedule(int(1000 / FrameClock.fps) if self._tasks else self.idle_interval)
+
+    def shutdown(self):
+        """Cancels pending tasks and stops the pools without waiting for running ones."""
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        with self._not_full:
+            self._not_full.notify_all()
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in milliseconds with power-of-two buckets.
+
+    Bucket ``i`` counts durations up to ``bounds[i]`` ms; the last bucket
+    holds everything slower.
+    """
+    bounds = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+    def __init__(self):
+        """Initializes an empty histogram."""
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, milliseconds):
+        """Records one duration."""
+        self.counts[bisect.bisect_left(self.bounds, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Returns the upper bound of the bucket holding the given percentile (the max for the last one)."""
+        if not self.count:
+            return 0.0
+        target = self.count * percent / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def buckets(self):
+        """Returns ``[(upper_bound_ms, count), ...]``; the last bound is ``float("inf")``."""
+        return list(zip(self.bounds + (float("inf"),), self.counts))
+
+    def summary(self):
+        """Returns count, mean, p50, p99 and max as a dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class LoopWatchdog:
+    """
+    Measures how responsive the Tk event loop is.
+
+    A heartbeat timer fires every ``interval`` ms; how late it fires is the
+    loop lag, recorded in ``lag``. Commands, coalesced ``after`` calls,
+    frame-clock ticks, dispatched callbacks and ``bind`` handlers installed by
+    gui_lib are timed into ``callbacks`` (one histogram per handler name).
+    A monitor thread notices when no heartbeat arrived for longer than
+    ``stall_threshold`` seconds and samples the Tk thread's stack every
+    ``sample_interval`` seconds until the loop recovers; each stall is
+    printed and kept in ``stalls``.
 
-    def save_theme(self):
-        """Saves the current theme to settings file."""
-        settings_file = "app_settings.json"
-        with open(settings_file, "w") as file:
-            json.dump({"theme": self.current_theme}, file)
+    Only one watchdog is active at a time; see ``MainWindow.enable_watchdog``.
 
-    def apply_theme(self):
-        """Applies the current theme to the application."""
-        theme_colors = self.themes.get(self.current_theme)
-        style = ttk.Style()
+    Attributes:
+        lag (LatencyHistogram): Heartbeat lag.
+        callbacks (dict): Handler name -> LatencyHistogram of run times.
+        stalls (deque): Recent stalls as dicts with ``duration`` (ms) and ``stacks``.
+    """
+    active = None
+    # Stalls kept in ``stalls``
+    max_stalls = 50
+    # Stack samples kept per stall
+    max_samples = 10
 
-        # Configure fonts for all widgets
-        style.configure('.', font=(theme_colors["font"], 10))
-        
-        # Add hover effects first
-        self._add_hover_effects()
-
-        # Button styles
-        style.configure('TButton',
-            foreground=theme_colors["foreground"],
-            background=theme_colors["primary"],
-            bordercolor=theme_colors["primary"],
-            darkcolor=theme_colors["background"],
-            lightcolor=theme_colors["background"],
-            padding=self.component_styles["button"]["padding"],
-            borderwidth=self.component_styles["button"]["borderwidth"],
-            relief=self.component_styles["button"]["relief"],
-            focusthickness=0,
-            focuscolor=theme_colors["primary"]
-        )
-        style.map('TButton',
-            foreground=[
-                ('disabled', self.state_colors["disabled"]["foreground"]),
-                ('pressed', theme_colors["foreground"]),
-                ('active', theme_colors["foreground"])
-            ],
-            background=[
-                ('disabled', self.state_colors["disabled"]["background"]),
-                ('pressed', self.state_colors["active"]["primary"]),
-                ('active', self.state_colors["hover"]["primary"])
-            ],
-            bordercolor=[
-                ('disabled', self.state_colors["disabled"]["background"]),
-                ('pressed', self.state_colors["active"]["primary"]),
-                ('active', self.state_colors["hover"]["primary"])
-            ]
-        )
+    def __init__(self, widget, interval=50, stall_threshold=0.2, sample_interval=0.1):
+        """
+        Initializes the watchdog (call ``start`` to begin measuring).
 
-        # Configure other button styles (secondary, success, info, warning, danger)
-        for _style in ["secondary", "success", "info", "warning", "danger"]:
-            style.configure(f"{_style}.TButton",
-                background=theme_colors[_style],
-                foreground=theme_colors["foreground"],
-                bordercolor=theme_colors[_style],
-                darkcolor=theme_colors["background"],
-                lightcolor=theme_colors["background"],
-                padding=self.component_styles["button"]["padding"],
-                borderwidth=self.component_styles["button"]["borderwidth"],
-                relief=self.component_styles["button"]["relief"],
-                focusthickness=0,
-                focuscolor=theme_colors[_style]
-            )
-            style.map(f'{_style}.TButton',
-                foreground=[
-                    ('disabled', self.state_colors["disabled"]["foreground"]),
-                    ('pressed', theme_colors["foreground"]),
-                    ('active', theme_colors["foreground"])
-                ],
-                background=[
-                    ('disabled', self.state_colors["disabled"]["background"]),
-                    ('pressed', self.state_colors["active"][_style]),
-                    ('active', self.state_colors["hover"][_style])
-                ],
-                bordercolor=[
-                    ('disabled', self.state_colors["disabled"]["background"]),
-                    ('pressed', self.state_colors["active"][_style]),
-                    ('active', self.state_colors["hover"][_style])
-                ]
-            )
+        Args:
+            widget (tk.Misc): Widget whose event loop is watched.
+            interval (int): Heartbeat period in milliseconds.
+            stall_threshold (float): Seconds without a heartbeat that count as a stall.
+            sample_interval (float): Seconds between stack samples during a stall.
+        """
+        self.widget = widget
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.sample_interval = sample_interval
+        self.lag = LatencyHistogram()
+        self.callbacks = {}
+        self.stalls = deque(maxlen=self.max_stalls)
+        self._tk_thread = threading.get_ident()
+        self._expected = None
+        self._last_beat = time.perf_counter()
+        self._after_id = None
+        self._monitor = None
+        self._stopped = threading.Event()
+        self._overlay = None
+        self._overlay_id = None
 
-        # Entry styles
-        style.configure('TEntry',
-            foreground=theme_colors["foreground"],
-            fieldbackground=theme_colors["background"],
-            bordercolor=theme_colors["secondary"],
-            lightcolor=theme_colors["background"],
-            darkcolor=theme_colors["background"],
-            padding=self.component_styles["entry"]["padding"],
-            borderwidth=self.component_styles["entry"]["borderwidth"],
-            relief=self.component_styles["entry"]["relief"],
-            insertcolor=theme_colors["primary"]
-        )
-        style.map('TEntry',
-            foreground=[('disabled', self.state_colors["disabled"]["foreground"])],
-            fieldbackground=[('disabled', self.state_colors["disabled"]["background"])],
-            bordercolor=[
-                ('focus', theme_colors["primary"]),
-                ('disabled', theme_colors["secondary"])
-            ]
-        )
+    @classmethod
+    def call(cls, name, func, *args, **kwargs):
+        """Runs ``func`` and records its duration under ``name`` if a watchdog is active."""
+        watchdog = cls.active
+        if watchdog is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            watchdog.record(name, time.perf_counter() - start)
 
-        # Label styles
-        style.configure('TLabel',
-            foreground=theme_colors["foreground"],
-            background=theme_colors["background"],
-            padding=self.component_styles["label"]["padding"],
-            wraplength=self.component_styles["label"]["wraplength"]
-        )
-        style.configure('info.TLabel',
-            foreground=theme_colors["info"],
-            background=theme_colors["background"]
-        )
+    @classmethod
+    def wrap(cls, name, func):
+        """Returns ``func`` wrapped so its calls are timed under ``name``."""
+        def timed(*args, **kwargs):
+            return cls.call(name, func, *args, **kwargs)
+        return timed
 
-        # Combobox styles
-        style.configure('TCombobox',
-            foreground=theme_colors["foreground"],
-            fieldbackground=theme_colors["background"],
-            bordercolor=theme_colors["secondary"],
-            darkcolor=theme_colors["background"],
-            lightcolor=theme_colors["background"],
-            arrowcolor=theme_colors["foreground"],
-            padding=self.component_styles["combobox"]["padding"],
-            arrowsize=self.component_styles["combobox"]["arrowsize"]
-        )
-        style.map('TCombobox',
-            foreground=[
-                ('disabled', self.state_colors["disabled"]["foreground"]),
-                ('readonly', theme_colors["foreground"])
-            ],
-            fieldbackground=[
-                ('disabled', self.state_colors["disabled"]["background"]),
-                ('readonly', theme_colors["background"])
-            ],
-            bordercolor=[
-                ('focus', theme_colors["primary"]),
-                ('disabled', theme_colors["secondary"]),
-                ('readonly', theme_colors["secondary"])
-            ],
-            arrowcolor=[
-                ('disabled', self.state_colors["disabled"]["foreground"]),
-                ('readonly', theme_colors["foreground"])
-            ]
-        )
+    def record(self, name, seconds):
+        """Adds one handler run time."""
+        histogram = self.callbacks.get(name)
+        if histogram is None:
+            histogram = self.callbacks[name] = LatencyHistogram()
+        histogram.add(seconds * 1000.0)
 
-        # Checkbutton styles
-        style.configure('TCheckbutton',
-            foreground=theme_colors["foreground"],
-            background=theme_colors["background"],
-            indicatorcolor=self.component_styles["checkbutton"]["indicatorcolor"],
-            padding=self.component_styles["label"]["padding"]
-        )
-        style.map('TCheckbutton',
-            foreground=[('disabled', self.state_colors["disabled"]["foreground"])],
-            background=[('disabled', self.state_colors["disabled"]["background"])],
-            indicatorcolor=[
-                ('selected', theme_colors["primary"]),
-                ('pressed', theme_colors["primary"]),
-                ('disabled', self.state_colors["disabled"]["background"])
-            ]
-        )
+    def start(self):
+        """Starts the heartbeat and the stall monitor, making this the active watchdog."""
+        if LoopWatchdog.active is not None and LoopWatchdog.active is not self:
+            LoopWatchdog.active.stop()
+        LoopWatchdog.active = self
+        self._stopped.clear()
+        self._last_beat = time.perf_counter()
+        self._schedule()
+        self._monitor = threading.Thread(target=self._watch, name="easy-gui-watchdog", daemon=True)
+        self._monitor.start()
 
-        # Frame styles
-        style.configure('TFrame', background=theme_colors["background"])
-        style.configure('secondary.TFrame', background=theme_colors["secondary"])
-        style.configure('light.TFrame', background=theme_colors["light"])
+    def stop(self):
+        """Stops measuring; the collected data is kept."""
+        if LoopWatchdog.active is self:
+            LoopWatchdog.active = None
+        self._stopped.set()
+        self.hide_overlay()
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
 
-        # Scrollbar styles
-        style.configure('Vertical.TScrollbar',
-            background=theme_colors["secondary"],
-            troughcolor=theme_colors["background"],
-            bordercolor=theme_colors["background"],
-            arrowcolor=theme_colors["foreground"],
-            gripcount=0,
-            relief="flat",
-            borderwidth=0
-        )
-        style.map('Vertical.TScrollbar',
-            background=[
-                ('pressed', self.state_colors["active"]["secondary"]),
-                ('active', self.state_colors["hover"]["secondary"])
-            ],
-            arrowcolor=[
-                ('pressed', self.state_colors["active"]["foreground"]),
-                ('active', self.state_colors["hover"]["foreground"])
-            ]
-        )
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.interval / 1000.0
+        self._after_id = self.widget.after(self.interval, self._beat)
 
-        # Add hover effects
-        self._add_hover_effects()
+    def _beat(self):
+        now = time.perf_counter()
+        self._last_beat = now
+        self.lag.add(max(0.0, now - self._expected) * 1000.0)
+        self._schedule()
 
-    def _add_hover_effects(self):
-        """Add hover effects using ttk style configuration"""
-        style = ttk.Style()
-        theme_colors = self.themes[self.current_theme]
-        
-        # Configure hover effects for buttons
-        style.map('TButton',
-            background=[('active', self.state_colors["hover"]["primary"])]
-        )
-        
-        # Configure hover effects for entries
-        style.map('TEntry',
-            bordercolor=[('focus', theme_colors["primary"])]
-        )
-        
-        # Configure hover effects for comboboxes
-        style.map('TCombobox',
-            bordercolor=[('focus', theme_colors["primary"])]
-        )
+    def _watch(self):
+        """Monitor thread: samples the Tk thread's stack while the loop is stalled."""
+        threshold = self.stall_threshold + self.interval / 1000.0
+        while not self._stopped.wait(self.sample_interval):
+            beat = self._last_beat
+            if time.perf_counter() - beat < threshold:
+                continue
+            stall = {"started": beat, "duration": 0.0, "stacks": []}
+            while not self._stopped.is_set() and self._last_beat == beat:
+                if len(stall["stacks"]) < self.max_samples:
+                    frame = sys._current_frames().get(self._tk_thread)
+                    if frame is not None:
+                        stall["stacks"].append("".join(traceback.format_stack(frame)))
+                self._stopped.wait(self.sample_interval)
+            end = self._last_beat if self._last_beat != beat else time.perf_counter()
+            stall["duration"] = (end - beat) * 1000.0
+            self.stalls.append(stall)
+            print(f"Warning: event loop blocked for {stall['duration']:.0f} ms")
+            if stall["stacks"]:
+                print(stall["stacks"][0], end="")
 
+    def report(self):
+        """
+        Returns the measurements as plain data.
 
-    def set_theme(self, theme_name):
-        """Sets the current theme and applies it."""
-        if theme_name in self.themes:
-            self.current_theme = theme_name
-            
-            # Update component styles and state colors based on the new theme
-            self.component_styles["button"]["font"] = (self.themes[self.current_theme]["font"], 10)
-            self.component_styles["entry"]["font"] = (self.themes[self.current_theme]["font"], 10)
-            self.component_styles["label"]["font"] = (self.themes[self.current_theme]["font"], 10)
-            self.component_styles["combobox"]["font"] = (self.themes[self.current_theme]["font"], 10)
-            self.component_styles["checkbutton"]["indicatorcolor"] = self.themes[self.current_theme]["background"]
-            self.component_styles["checkbutton"]["font"] = (self.themes[self.current_theme]["font"], 10)
-            
-            self.state_colors["hover"]["primary"] = self._adjust_color_brightness(self.themes[self.current_theme]["primary"], 1.1)
-            self.state_colors["hover"]["secondary"] = self._adjust_color_brightness(self.themes[self.current_theme]["secondary"], 1.1)
-            self.state_colors["hover"]["success"] = self._adjust_color_brightness(self.themes[self.current_theme]["success"], 1.1)
-            self.state_colors["hover"]["info"] = self._adjust_color_brightness(self.themes[self.current_theme]["info"], 1.1)
-            self.state_colors["hover"]["warning"] = self._adjust_color_brightness(self.themes[self.current_theme]["warning"], 1.1)
-            self.state_colors["hover"]["danger"] = self._adjust_color_brightness(self.themes[self.current_theme]["danger"], 1.1)
-            
-            self.state_colors["active"]["primary"] = self._adjust_color_brightness(self.themes[self.current_theme]["primary"], 0.9)
-            self.state_colors["active"]["secondary"] = self._adjust_color_brightness(self.themes[self.current_theme]["secondary"], 0.9)
-            self.state_colors["active"]["success"] = self._adjust_color_brightness(self.themes[self.current_theme]["success"], 0.9)
-            self.state_colors["active"]["info"] = self._adjust_color_brightness(self.themes[self.current_theme]["info"], 0.9)
-            self.state_colors["active"]["warning"] = self._adjust_color_brightness(self.themes[self.current_theme]["warning"], 0.9)
-            self.state_colors["active"]["danger"] = self._adjust_color_brightness(self.themes[self.current_theme]["danger"], 0.9)
-            
-            # Update foreground colors
-            self.state_colors["hover"]["foreground"] = self.themes[self.current_theme]["foreground"]
-            self.state_colors["active"]["foreground"] = self.themes[self.current_theme]["foreground"]
-            self.state_colors["disabled"]["background"] = self._adjust_color_opacity(self.themes[self.current_theme]["background"], 0.5)
-            self.state_colors["disabled"]["foreground"] = self._adjust_color_opacity(self.themes[self.current_theme]["foreground"], 0.5)
+        Returns:
+            dict: ``lag`` and per-handler ``callbacks`` summaries (ms), and the number of ``stalls``.
+        """
+        return {
+            "lag": self.lag.summary(),
+            "callbacks": {name: histogram.summary() for name, histogram in self.callbacks.items()},
+            "stalls": len(self.stalls),
+        }
 
-            self.apply_theme()
-            self.save_theme()
-        else:
-            print(f"Theme '{theme_name}' not found.")
+    def slowest(self, count=5):
+        """Returns the ``count`` handler names with the highest maximum run time."""
+        return sorted(self.callbacks, key=lambda name: self.callbacks[name].max, reverse=True)[:count]
 
-    def get_theme_colors(self):
-        """Returns colors based on the current theme"""
-        return self.themes.get(self.current_theme, self.themes["nordic_frost"])
+    def show_overlay(self, refresh=500):
+        """
+        Shows lag statistics in the window's top-right corner.
 
-    def get_current_theme(self):
-        return self.current_theme
+        Args:
+            refresh (int): Milliseconds between updates.
+        """
+        if self._overlay is None:
+            theme_colors = ThemeManager().get_theme_colors()
+            self._overlay = tk.Label(self.widget, justify=LEFT, anchor="ne", font=("TkFixedFont", 8),
+                                     background=theme_colors["dark"], foreground=theme_colors["light"])
+            self._overlay.place(relx=1.0, rely=0.0, anchor="ne")
+        self._update_overlay(refresh)
+
+    def hide_overlay(self):
+        """Removes the overlay."""
+        if self._overlay_id is not None:
+            self.widget.after_cancel(self._overlay_id)
+            self._overlay_id = None
+        if self._overlay is not None:
+            self._overlay.destroy()
+            self._overlay = None
+
+    def _update_overlay(self, refresh):
+        lag = self.lag.summary()
+        lines = [f"lag p50 {lag['p50']:.0f}  p99 {lag['p99']:.0f}  max {lag['max']:.0f} ms",
+                 f"stalls {len(self.stalls)}"]
+        for name in self.slowest(3):
+            lines.append(f"{name[:32]}  max {self.callbacks[name].max:.1f} ms")
+        self._overlay.config(text="\n".join(lines))
+        self._overlay.lift()
+        self._overlay_id = self.widget.after(refresh, self._update_overlay, refresh)
 
-    def get_available_themes(self):
-        """Returns a list of available theme names."""
-        return list(self.themes.keys())
 
 class MainWindow(ttk.Window):
     """
@@ -503,6 +1992,11 @@ class MainWindow(ttk.Window):
         menu_frame (ttk.Frame): Frame for the left-side menu.
         content_frame (ttk.Frame): Frame for the main content.
     """
+    # Bounds in seconds of the pause between Tk polls in run_async(); the upper
+    # bound is also the asyncio poll interval of run(async_mode=True) on Windows
+    async_min_interval = 0.004
+    async_max_interval = 0.032
+
     def __init__(self, title="GUI Library", theme="nordic_frost", **kwargs):
         """
         Initializes the main window.
@@ -514,21 +2008,102 @@ class MainWindow(ttk.Window):
         """
         # Store custom theme name
         self._custom_theme = theme
-        
-        # Initialize with a valid ttkbootstrap theme
-        super().__init__(title=title, themename="darkly", **kwargs)
+        # Seconds spent in each startup phase, in order (see startup_report)
+        self.startup_phases = {}
+        phase_start = time.perf_counter()
+
+        # ThemeManager is created before the Tk root and styles it later
+        theme_manager = ThemeManager(apply=False)
+        # The custom palette is registered before the root exists and becomes
+        # the first ttk theme the root builds, so widgets are only ever built
+        # under it
+        ttk_theme = None
+        if self._custom_theme in theme_manager.themes:
+            ttk_theme = theme_manager.register_ttk_theme(self._custom_theme)
+        if ttk_theme is not None:
+            kwargs.setdefault("themename", ttk_theme)
+        phase_start = self._startup_phase("base_theme", phase_start)
+
+        super().__init__(title=title, **kwargs)
+        phase_start = self._startup_phase("window", phase_start)
+        # ttk themes built by startup; only the custom one unless a stock theme was asked for
+        self.startup_ttk_themes = [
+            name for name in self.tk.splitlist(self.tk.call("ttk::style", "theme", "names"))
+            if name in self.style.theme_names()
+        ]
+
         self.title(title)
-        self.geometry("800x600")
+        self.settings = SettingsStore()
+        self.settings_key = title
+        self.geometry(self.settings.get("geometry", "800x600", app=self.settings_key))
         self.resizable(True, True)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        phase_start = self._startup_phase("settings", phase_start)
+
         self.menu_frame = None
         self.content_frame = None
-        self.theme_manager = ThemeManager()
+        self.theme_manager = theme_manager
+        self.widget_registry = WidgetRegistry()
+        self.dispatcher = UIDispatcher(self)
+        self.settings.on_error = self._report_settings_error
+        self.watchdog = None
+        # Lets deployed apps turn on stall reports without code changes
+        if os.environ.get("EASY_GUI_WATCHDOG"):
+            self.enable_watchdog(overlay=os.environ["EASY_GUI_WATCHDOG"] == "overlay")
+        phase_start = self._startup_phase("services", phase_start)
         
         # Apply our custom theme
         if self._custom_theme:
             self.theme_manager.set_theme(self._custom_theme)
+        else:
+            self.theme_manager.apply_theme()
+        phase_start = self._startup_phase("theme_apply", phase_start)
             
         self._setup_layout()
+        self._startup_phase("layout", phase_start)
+        # The first idle callback runs once the app's own setup has returned
+        # and the window has been drawn
+        self.after_idle(self._on_first_idle)
+
+    def _startup_phase(self, name, start):
+        """Records the startup phase that began at ``start`` and returns its end time."""
+        end = time.perf_counter()
+        self.startup_phases[name] = end - start
+        self._startup_mark = end
+        if Profiler.enabled:
+            Profiler.record(f"MainWindow.startup.{name}", start, end)
+        return end
+
+    def _on_first_idle(self):
+        """Closes the startup breakdown when the event loop first goes idle."""
+        self.update_idletasks()
+        self._startup_phase("first_idle", self._startup_mark)
+        if os.environ.get("EASY_GUI_STARTUP_REPORT"):
+            print(self.startup_report())
+
+    def startup_report(self):
+        """
+        Returns the startup-phase timing breakdown as text.
+
+        Phases: ``base_theme`` (registering the custom palette as ttk theme),
+        ``window`` (Tk root and building that ttk theme), ``settings``,
+        ``services``, ``theme_apply`` (custom style sheet), ``layout`` and ``first_idle``
+        (application setup after the constructor until the first drawn frame).
+        The ttk themes built during startup are listed after the total.
+        Module import time is not included; ``benchmarks/run.py`` measures it
+        in a fresh interpreter (``cold_import``). Set
+        ``EASY_GUI_STARTUP_REPORT`` to print the report automatically.
+
+        Returns:
+            str: One line per phase in milliseconds, followed by the total.
+        """
+        lines = [f"Startup of '{self.settings_key}':"]
+        for name, seconds in self.startup_phases.items():
+            lines.append(f"  {name:<12} {seconds * 1000.0:8.1f} ms")
+        total = sum(self.startup_phases.values())
+        lines.append(f"  {'total':<12} {total * 1000.0:8.1f} ms")
+        lines.append(f"  ttk themes built: {', '.join(self.startup_ttk_themes) or 'none'}")
+        return "\n".join(lines)
 
     def _setup_layout(self):
         """Sets up the layout of the main window."""
@@ -551,11 +2126,66 @@ class MainWindow(ttk.Window):
         self.theme_manager.set_theme(selected_theme)
         self.update_ui()
 
+    def batch(self):
+        """
+        Returns a context manager that builds widgets in one pass.
+
+        Returns:
+            WidgetBatch: The open batch if there is one (nested batches commit
+            together), otherwise a new one. See WidgetBatch for what is deferred.
+        """
+        return WidgetBatch.current() or WidgetBatch()
+
+    def run_in_background(self, func, *args, on_done=None, on_error=None, process=False, **kwargs):
+        """
+        Runs ``func`` off the Tk thread and delivers its result back on it.
+
+        Args:
+            func (function): Work to run in the worker pool.
+            *args: Positional arguments for ``func``.
+            on_done (function, optional): Called with the result on the Tk thread.
+            on_error (function, optional): Called with the exception on the Tk thread.
+            process (bool): Run in a process pool (for CPU-bound work).
+            **kwargs: Keyword arguments for ``func``.
+
+        Returns:
+            BackgroundTask: Handle that can cancel the task.
+        """
+        return self.dispatcher.submit(func, *args, on_done=on_done, on_error=on_error, process=process, **kwargs)
+
+    def enable_watchdog(self, stall_threshold=0.2, interval=50, overlay=False):
+        """
+        Starts measuring event-loop lag and handler run times.
+
+        Args:
+            stall_threshold (float): Seconds the loop may be blocked before the
+                Tk thread's stack is sampled and the stall is reported.
+            interval (int): Heartbeat period in milliseconds.
+            overlay (bool): Show live statistics in the window corner.
+
+        Returns:
+            LoopWatchdog: The watchdog; see ``report`` and ``lag``.
+        """
+        self.disable_watchdog()
+        self.watchdog = LoopWatchdog(self, interval=interval, stall_threshold=stall_threshold)
+        self.watchdog.start()
+        if overlay:
+            self.watchdog.show_overlay()
+        return self.watchdog
+
+    def disable_watchdog(self):
+        """Stops the watchdog, if one is running."""
+        if self.watchdog is not None:
+            self.watchdog.stop()
+
+    def call_in_ui(self, func, *args):
+        """Queues ``func(*args)`` to run on the Tk thread; safe to call from any thread."""
+        self.dispatcher.post(func, *args)
+
+    @profiled("MainWindow.update_ui")
     def update_ui(self):
-        """Updates the UI elements after a theme change."""
-        for child in self.content_frame.winfo_children():
-            if isinstance(child, CustomElement):
-                child.update_styles()
+        """Updates every live CustomElement after a theme change."""
+        self.widget_registry.refresh()
 
     def get_menu_frame(self):
         """Returns the menu frame."""
@@ -565,9 +2195,100 @@ class MainWindow(ttk.Window):
         """Returns the content frame."""
         return self.content_frame
 
-    def run(self):
-        """Runs the main loop of the application."""
-        self.mainloop()
+    def _report_settings_error(self, error):
+        """Reports a failed settings write, from any thread, through Tk's callback error handler."""
+        self.dispatcher.post(self.report_callback_exception, type(error), error, error.__traceback__)
+
+    def _on_close(self):
+        """Remembers the window geometry, flushes settings and closes the window."""
+        try:
+            self.settings.set("geometry", self.geometry(), app=self.settings_key)
+        except tk.TclError:
+            pass
+        # The dispatcher stops below; later write errors are printed instead
+        if self.settings.on_error == self._report_settings_error:
+            self.settings.on_error = None
+        self.settings.flush()
+        self.dispatcher.shutdown()
+        self.disable_watchdog()
+        self.destroy()
+
+    def run(self, async_mode=False):
+        """
+        Runs the main loop of the application.
+
+        Args:
+            async_mode (bool): Also run an asyncio event loop, so button and
+                menu commands may be coroutine functions. Tk's own main loop
+                stays in charge and runs asyncio only when it has work:
+                ready callbacks, due timers, or I/O that Tk sees on the
+                loop's selector (on Windows the loop is also stepped every
+                ``async_max_interval`` seconds). An idle window never wakes
+                up. Plain (non-coroutine) Tk callbacks that schedule asyncio
+                work must use ``loop.call_soon_threadsafe``, as any code
+                outside the loop must, so the loop is woken. To share an
+                asyncio loop that is already running, await ``run_async``
+                instead.
+        """
+        if not async_mode:
+            self._mainloop()
+            self.settings.flush()
+            return
+        import asyncio
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        driver = _AsyncioDriver.current = _AsyncioDriver(self, loop, self.async_max_interval)
+        try:
+            self._mainloop()
+        finally:
+            _AsyncioDriver.current = None
+            driver.close()
+            asyncio.set_event_loop(None)
+        self.settings.flush()
+
+    async def run_async(self):
+        """
+        Runs the window as a coroutine on the current asyncio loop.
+
+        Use this when the app already runs an asyncio loop, for example an
+        ``asyncio.run`` entry point shared with other services. Here asyncio
+        is in charge and Tk is polled with ``update()``. The pause between
+        polls doubles from ``async_min_interval`` up to ``async_max_interval``
+        and drops back to the minimum after user input (as reported by
+        ``tk inactive``). That bounds input latency to one max interval after
+        a quiet spell and costs up to about 30 wakeups per second while idle.
+        ``run(async_mode=True)`` has no idle wakeups. Returns once the window
+        is destroyed.
+        """
+        import asyncio
+        closed = []
+        self.bind("<Destroy>", lambda event: closed.append(True) if event.widget is self else None, add="+")
+        interval = self.async_min_interval
+        while not closed:
+            self.update()
+            if closed:
+                break
+            # Milliseconds since the last key or mouse event, -1 where Tk cannot tell
+            inactive = self.tk.getint(self.tk.call("tk", "inactive"))
+            if 0 <= inactive < self.async_max_interval * 2000:
+                interval = self.async_min_interval
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.async_max_interval)
+        self.settings.flush()
+
+    def _mainloop(self):
+        """Runs Tk's main loop; while it runs, other threads may wake the dispatcher."""
+        # Cross-thread Tcl calls need a threaded Tcl build
+        threaded = self.tk.getboolean(self.tk.eval("info exists tcl_platform(threaded)"))
+        self.dispatcher.set_thread_wakeups(threaded)
+        try:
+            self.mainloop()
+        finally:
+            try:
+                self.dispatcher.set_thread_wakeups(False)
+            except tk.TclError:
+                # The window was destroyed without _on_close
+                pass
 
 
 class LeftMenu:
@@ -597,7 +2318,8 @@ class LeftMenu:
 
         Args:
             text (str): Text of the menu item.
-            command (function): Command to execute when the item is clicked.
+            command (function): Command to execute when the item is clicked
+                (may be a coroutine function when running in async mode).
             bootstyle (str): ttkbootstrap style for the button.
         """
         try:
@@ -613,6 +2335,323 @@ class LeftMenu:
 
 
 
+class CoalescedCall:
+    """
+    Collapses bursts of calls into a single call on the Tk event loop.
+
+    In ``"throttle"`` mode the first call schedules the function ``delay``
+    ms later and further calls until then are absorbed, so it runs at most
+    once per window. In ``"debounce"`` mode every call pushes the run back,
+    so it only runs once calls stop for ``delay`` ms. A delay of 0 runs the
+    function when the event loop next goes idle. The arguments of the most
+    recent call are used.
+    """
+    def __init__(self, widget, func, delay=0, mode="throttle"):
+        """
+        Initializes the coalesced call.
+
+        Args:
+            widget (tk.Misc): Widget whose event loop schedules the call.
+            func (function): Function to run.
+            delay (int): Window in milliseconds.
+            mode (str): ``"throttle"`` or ``"debounce"``.
+        """
+        if mode not in ("throttle", "debounce"):
+            raise ValueError(f"Unknown coalescing mode: {mode}")
+        self.widget = widget
+        self.func = func
+        self.delay = delay
+        self.mode = mode
+        # Handler name used by LoopWatchdog
+        self.name = f"after:{getattr(func, '__qualname__', type(func).__name__)}"
+        self._after_id = None
+        self._args = ()
+        self._kwargs = {}
+
+    def __call__(self, *args, **kwargs):
+        self._args = args
+        self._kwargs = kwargs
+        if self._after_id is not None:
+            if self.mode == "throttle":
+                return
+            self.widget.after_cancel(self._after_id)
+        if self.delay:
+            self._after_id = self.widget.after(self.delay, self._run)
+        else:
+            self._after_id = self.widget.after_idle(self._run)
+
+    def pending(self):
+        """Returns True while a call is scheduled."""
+        return self._after_id is not None
+
+    def cancel(self):
+        """Drops the scheduled call, if any."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def flush(self):
+        """Runs the scheduled call right away, if any."""
+        if self._after_id is not None:
+            self.cancel()
+            self._run()
+
+    def _run(self):
+        self._after_id = None
+        args, kwargs = self._args, self._kwargs
+        self._args, self._kwargs = (), {}
+        try:
+            LoopWatchdog.call(self.name, self.func, *args, **kwargs)
+        except Exception as e:
+            print(f"Error in coalesced call: {e}")
+
+
+class Tween:
+    """
+    A time-based animation driven by a FrameClock.
+
+    Progress is derived from elapsed time rather than from a frame counter, so
+    a tween finishes on time even when the clock has to skip frames.
+    """
+    def __init__(self, duration, on_frame, on_done=None):
+        """
+        Initializes the tween.
+
+        Args:
+            duration (float): Length of the animation in seconds.
+            on_frame (function): Called with the progress (0.0 to 1.0) on every frame.
+            on_done (function, optional): Called once after the last frame or on cancel.
+        """
+        self.duration = max(duration, 1e-6)
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.start_time = None
+        self.finished = False
+
+    def step(self, now):
+        """Advances the tween to ``now``. Returns False once it has finished."""
+        if self.finished:
+            return False
+        if self.start_time is None:
+            self.start_time = now
+        progress = min(1.0, (now - self.start_time) / self.duration)
+        try:
+            self.on_frame(progress)
+        except Exception as e:
+            print(f"Error in animation frame: {e}")
+            progress = 1.0
+        if progress >= 1.0:
+            self._finish()
+            return False
+        return True
+
+    def cancel(self):
+        """Stops the tween; ``on_done`` still runs so it can clean up."""
+        self._finish()
+
+    def _finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        if self.on_done:
+            try:
+                self.on_done()
+            except Exception as e:
+                print(f"Error finishing animation: {e}")
+
+
+class FrameClock:
+    """
+    Shared animation clock for one Tk interpreter.
+
+    All registered tweens advance from a single ``after()`` timer running at a
+    fixed frame rate. The timer only runs while tweens are active. When the
+    event loop falls behind, the missed frames are skipped instead of queued.
+
+    Attributes:
+        fps (int): Target frame rate.
+        frames (int): Number of frames rendered so far.
+        skipped_frames (int): Number of frames dropped because the loop lagged.
+    """
+    fps = 60
+    _clocks = weakref.WeakKeyDictionary()
+
+    def __init__(self, root, fps=None):
+        """
+        Initializes the frame clock.
+
+        Args:
+            root (tk.Misc): Widget whose interpreter runs the timer.
+            fps (int, optional): Target frame rate. Defaults to ``FrameClock.fps``.
+        """
+        self.root = root
+        if fps:
+            self.fps = fps
+        self.frames = 0
+        self.skipped_frames = 0
+        self._tweens = []
+        self._after_id = None
+        self._last_frame = None
+
+    @classmethod
+    def for_widget(cls, widget):
+        """Returns the clock shared by every widget of ``widget``'s toplevel root."""
+        root = widget._root()
+        clock = cls._clocks.get(root)
+        if clock is None:
+            clock = cls._clocks[root] = cls(root)
+        return clock
+
+    @property
+    def interval(self):
+        """Frame interval in seconds."""
+        return 1.0 / self.fps
+
+    def animate(self, duration, on_frame, on_done=None):
+        """
+        Creates a tween and starts it on this clock.
+
+        Args:
+            duration (float): Length of the animation in seconds.
+            on_frame (function): Called with the progress (0.0 to 1.0) on every frame.
+            on_done (function, optional): Called once the animation ends.
+
+        Returns:
+            Tween: The running tween, which can be cancelled.
+        """
+        tween = Tween(duration, on_frame, on_done)
+        self.add(tween)
+        return tween
+
+    def add(self, tween):
+        """Registers a tween; it receives its first frame on the next tick."""
+        self._tweens.append(tween)
+        self._schedule(self.interval)
+
+    def remove(self, tween):
+        """Cancels and unregisters a tween."""
+        if tween in self._tweens:
+            self._tweens.remove(tween)
+        tween.cancel()
+
+    def active_count(self):
+        """Returns the number of running tweens."""
+        return len(self._tweens)
+
+    def _schedule(self, delay):
+        if self._after_id is None and self._tweens:
+            self._after_id = self.root.after(max(1, int(delay * 1000)), self._tick)
+
+    def _step_tweens(self, now):
+        return [tween for tween in self._tweens if tween.step(now)]
+
+    def _tick(self):
+        """Advances every tween by one frame and reschedules the timer."""
+        self._after_id = None
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            missed = int((now - self._last_frame) / self.interval) - 1
+            if missed > 0:
+                self.skipped_frames += missed
+        self._last_frame = now
+
+        self._tweens = LoopWatchdog.call("after:FrameClock._tick", self._step_tweens, now)
+        self.frames += 1
+
+        if self._tweens:
+            # Aim for the next frame boundary, accounting for this frame's work
+            self._schedule(self.interval - (time.perf_counter() - now))
+        else:
+            self._last_frame = None
+
+
+class RippleOverlayPool:
+    """
+    Pool of ripple canvases owned by one parent container.
+
+    Canvases are only created when a button in the container first ripples,
+    are shared by every button of that container, and are destroyed after
+    staying idle for ``idle_timeout`` seconds.
+    """
+    # Seconds an unused canvas is kept before it is destroyed
+    idle_timeout = 5.0
+    _pools = weakref.WeakKeyDictionary()
+
+    def __init__(self, parent):
+        """
+        Initializes the pool.
+
+        Args:
+            parent (tk.Misc): Container the overlay canvases are placed in.
+        """
+        self.parent = parent
+        self._busy = []
+        self._idle = []
+        self._collect_id = None
+
+    @classmethod
+    def for_parent(cls, parent):
+        """Returns the pool owned by ``parent``, creating it if needed."""
+        pool = cls._pools.get(parent)
+        if pool is None:
+            pool = cls._pools[parent] = cls(parent)
+        return pool
+
+    @classmethod
+    def total_canvas_count(cls):
+        """Returns the number of ripple canvases held by all pools."""
+        return sum(pool.canvas_count() for pool in list(cls._pools.values()))
+
+    def canvas_count(self):
+        """Returns the number of canvases this pool holds."""
+        return len(self._busy) + len(self._idle)
+
+    def acquire(self):
+        """
+        Returns a canvas for exclusive use until it is released.
+
+        The canvas holds a single oval tagged ``"ripple"``.
+        """
+        if self._idle:
+            canvas, _released = self._idle.pop()
+        else:
+            canvas = tk.Canvas(self.parent, width=0, height=0, highlightthickness=0)
+            canvas.create_oval(0, 0, 0, 0, outline="", stipple="gray50", state="hidden", tags="ripple")
+        self._busy.append(canvas)
+        return canvas
+
+    def release(self, canvas):
+        """Hides a canvas and returns it to the pool."""
+        if canvas not in self._busy:
+            return
+        self._busy.remove(canvas)
+        try:
+            canvas.itemconfigure("ripple", state="hidden")
+            canvas.place_forget()
+        except tk.TclError:
+            return  # Parent was destroyed along with the canvas
+        self._idle.append((canvas, time.monotonic()))
+        if self._collect_id is None:
+            self._collect_id = self.parent.after(int(self.idle_timeout * 1000), self._collect)
+
+    def _collect(self):
+        """Destroys canvases that stayed idle for longer than ``idle_timeout``."""
+        self._collect_id = None
+        cutoff = time.monotonic() - self.idle_timeout
+        keep = []
+        for canvas, released in self._idle:
+            if released <= cutoff:
+                try:
+                    canvas.destroy()
+                except tk.TclError:
+                    pass
+            else:
+                keep.append((canvas, released))
+        self._idle = keep
+        if self._idle:
+            self._collect_id = self.parent.after(int(self.idle_timeout * 1000), self._collect)
+
+
 class CustomElement:
     """
     Base class for customizable GUI elements.
@@ -621,6 +2660,7 @@ class CustomElement:
         element (ttk.Widget): The actual GUI element.
         config (dict): Configuration settings for the element.
     """
+    @profiled("CustomElement.__init__")
     def __init__(self, parent, **kwargs):
         """
         Initializes the custom element.
@@ -630,9 +2670,35 @@ class CustomElement:
             **kwargs: Initial configuration settings for the element.
         """
         self.parent = parent
-        self.element = None
+        self._element = None
         self.config = kwargs
+        # Configuration the widget already has, so unchanged configs are not re-sent to Tk
+        self._applied_config = None
         self.theme_manager = ThemeManager()
+        WidgetRegistry().register(self)
+
+    @property
+    def element(self):
+        """The wrapped ttk widget."""
+        return self._element
+
+    @element.setter
+    def element(self, widget):
+        self._element = widget
+        if widget is not None:
+            self._track_destroy(widget)
+
+    def _track_destroy(self, widget):
+        """Removes the element from the registry when its widget is destroyed."""
+        registry = WidgetRegistry()
+        ref = weakref.ref(self)
+
+        def _on_destroy(event):
+            element = ref()
+            if element is not None:
+                registry.unregister(element)
+
+        widget.bind("<Destroy>", _on_destroy, add="+")
 
     def set_config(self, **kwargs):
         """
@@ -642,13 +2708,23 @@ class CustomElement:
             **kwargs: Configuration settings to update.
         """
         self.config.update(kwargs)
+        if 'bootstyle' in kwargs:
+            WidgetRegistry().register(self)
         if self.element:
             self._apply_config()
 
+    @profiled("CustomElement._apply_config")
     def _apply_config(self):
-        """Applies the configuration to the element."""
+        """Applies the configuration to the element (deferred inside a WidgetBatch)."""
+        batch = WidgetBatch.current()
+        if batch is not None:
+            batch.configure(self)
+            return
+        if self.element is not None and self.config == self._applied_config:
+            return
         try:
             self.element.config(**self.config)
+            self._applied_config = dict(self.config)
         except Exception as e:
             print(f"Error applying config: {e}")
 
@@ -659,22 +2735,44 @@ class CustomElement:
         except Exception as e:
             print(f"Error applying styles: {e}")
 
+    def _resolve_styles(self, theme_colors):
+        """Returns the widget options implied by the theme for this element."""
+        return {
+            "background": theme_colors.get("background"),
+            "foreground": theme_colors.get("foreground")
+        }
+
     def update_styles(self):
         """Updates the styles of the element based on the current theme."""
+        if not self.element:
+            return
         theme_colors = self.theme_manager.get_theme_colors()
-        button_style = self.config.get('bootstyle', 'primary')
-        
-        # Correct mapping of bootstyle to theme colors
-        if button_style in ["primary", "secondary", "success", "info", "warning", "danger"]:
-            bg_color = theme_colors.get(button_style)
-        else:
-            bg_color = theme_colors.get("primary")
+        supported = set(self.element.keys())
+        self._apply_styles({option: value for option, value in self._resolve_styles(theme_colors).items()
+                            if option in supported and option not in self.config})
 
-        self._apply_styles({
-            "background": bg_color,
-            "foreground": theme_colors.get("foreground")
-        })
 
+    def throttle(self, func, delay=None):
+        """
+        Returns a wrapper that runs ``func`` at most once per ``delay`` ms.
+
+        Args:
+            func (function): Function to run.
+            delay (int, optional): Window in milliseconds. Defaults to one animation frame.
+        """
+        if delay is None:
+            delay = int(1000 / FrameClock.fps)
+        return CoalescedCall(self.element, func, delay, mode="throttle")
+
+    def debounce(self, func, delay):
+        """
+        Returns a wrapper that runs ``func`` once calls stop for ``delay`` ms.
+
+        Args:
+            func (function): Function to run.
+            delay (int): Quiet period in milliseconds.
+        """
+        return CoalescedCall(self.element, func, delay, mode="debounce")
 
     def get_element(self):
         """Returns the GUI element."""
@@ -683,17 +2781,17 @@ class CustomElement:
     def pack(self, **kwargs):
         """Packs the element into the parent frame."""
         if self.element:
-            self.element.pack(**kwargs)
+            WidgetBatch.geometry(self.element, "pack", kwargs)
 
     def place(self, **kwargs):
         """Places the element into the parent frame."""
         if self.element:
-            self.element.place(**kwargs)
+            WidgetBatch.geometry(self.element, "place", kwargs)
 
     def grid(self, **kwargs):
         """Grids the element into the parent frame."""
         if self.element:
-            self.element.grid(**kwargs)
+            WidgetBatch.geometry(self.element, "grid", kwargs)
 
 
 class CustomButton(CustomElement):
@@ -702,6 +2800,10 @@ class CustomButton(CustomElement):
 
     Inherits from CustomElement.
     """
+    # Length of the ripple animation in seconds
+    ripple_duration = 0.4
+
+    @profiled("CustomButton.__init__")
     def __init__(self, parent, text, command, **kwargs):
         """
         Initializes the custom button.
@@ -709,68 +2811,90 @@ class CustomButton(CustomElement):
         Args:
             parent (ttk.Frame): Parent frame for the button.
             text (str): Text of the button.
-            command (function): Command to execute when the button is clicked.
+            command (function): Command to execute when the button is clicked
+                (may be a coroutine function when running in async mode).
             **kwargs: Additional configuration settings for the button.
         """
+        # Resolved before registering, so the button joins its real style group
+        kwargs.setdefault('bootstyle', 'primary')
         super().__init__(parent, **kwargs)
-        self.config.setdefault('bootstyle', 'primary')
 
-        # Add ripple effect canvas
-        self.ripple_canvas = tk.Canvas(self.parent, width=0, height=0, highlightthickness=0)
-        self.ripple_canvas.place(x=0, y=0)  # Initial position doesn't matter
+        # Ripple canvases are borrowed from the parent's pool on first click
+        self.ripple_canvas = None
+        self._ripple_tween = None
 
         try:
             self.element = ttk.Button(self.parent, text=text, command=lambda: self._on_click(command), **self.config)
+            self._applied_config = dict(self.config)
             self._bind_hover_events()
         except Exception as e:
             print(f"Error creating button: {e}")
 
         self._apply_config()
 
+    @profiled("CustomButton._on_click")
     def _on_click(self, command):
-        """Handles button click, creates ripple, and executes command."""
-        self._create_ripple()
+        """Handles button click and executes command (the ripple starts on press)."""
         if command:
-            command()
+            if LoopWatchdog.active is None:
+                _run_command(command)
+            else:
+                LoopWatchdog.call(f"command:{self.element.cget('text')}", _run_command, command)
 
     def _create_ripple(self):
-        """Creates a ripple effect on the button."""
+        """Starts the ripple animation on the shared frame clock."""
+        if not self.element:
+            return
         theme_colors = self.theme_manager.get_theme_colors()
-        x = self.element.winfo_width() // 2
-        y = self.element.winfo_height() // 2
+        width = self.element.winfo_width()
+        height = self.element.winfo_height()
+        x = width // 2
+        y = height // 2
         max_radius = max(x, y)
-        
-        ripple_color = self._adjust_color_opacity(theme_colors.get("foreground"), 0.3)
 
-        for i in range(max_radius):
-            self.ripple_canvas.after(i * 20, lambda radius=i: self._draw_ripple(x, y, radius, ripple_color))
+        ripple_color = self._adjust_color_opacity(theme_colors.get("foreground"), 0.3, theme_colors.get("background"))
+
+        if self._ripple_tween:
+            self._ripple_tween.cancel()
 
-    def _draw_ripple(self, x, y, radius, color):
-        """Draws a single frame of the ripple animation."""
         try:
-            # Update canvas size and position
-            self.ripple_canvas.config(width=self.element.winfo_width(), height=self.element.winfo_height())
+            self.ripple_canvas = RippleOverlayPool.for_parent(self.parent).acquire()
+
+            # Update canvas size and position, keeping it stacked below the button
+            self.ripple_canvas.config(width=width, height=height)
             self.ripple_canvas.place(x=self.element.winfo_x(), y=self.element.winfo_y())
-            
-            # Create ripple circle with transparency
-            oval_id = self.ripple_canvas.create_oval(
-                x - radius, y - radius, 
-                x + radius, y + radius, 
-                outline="", 
-                fill=color,
-                stipple="gray50"  # This creates a transparency effect
-            )
-            
-            # Schedule cleanup of the ripple
-            self.ripple_canvas.after(500, lambda: self.ripple_canvas.delete(oval_id))
+            tk.Misc.lower(self.ripple_canvas, self.element)
+
+            # The pooled canvas holds a single oval that is resized on every frame
+            self.ripple_canvas.coords("ripple", x, y, x, y)
+            self.ripple_canvas.itemconfigure("ripple", fill=ripple_color, state="normal")
         except Exception as e:
             print(f"Error in ripple effect: {e}")
+            self._end_ripple()
+            return
+
+        self._ripple_tween = FrameClock.for_widget(self.element).animate(
+            self.ripple_duration,
+            lambda progress: self._draw_ripple(x, y, max_radius * progress),
+            self._end_ripple
+        )
+
+    def _draw_ripple(self, x, y, radius):
+        """Draws a single frame of the ripple animation."""
+        self.ripple_canvas.coords("ripple", x - radius, y - radius, x + radius, y + radius)
+
+    def _end_ripple(self):
+        """Returns the ripple canvas to the pool once the animation is over."""
+        if self.ripple_canvas is not None:
+            RippleOverlayPool.for_parent(self.parent).release(self.ripple_canvas)
+            self.ripple_canvas = None
 
     def _bind_hover_events(self):
         """Add hover state handling"""
         self.element.bind('<Enter>', lambda e: self._on_hover(True))
         self.element.bind('<Leave>', lambda e: self._on_hover(False))
-        self.element.bind("<ButtonPress-1>", lambda event: self._on_button_press())
+        self.element.bind("<ButtonPress-1>", LoopWatchdog.wrap("bind:CustomButton._on_button_press",
+                                                               lambda event: self._on_button_press()))
 
     def _on_hover(self, is_hovering):
         """Handles hover events."""
@@ -782,37 +2906,9 @@ class CustomButton(CustomElement):
     def _on_button_press(self):
         self._create_ripple()
 
-    def update_styles(self):
-        """Updates the styles of the label based on the current theme."""
-        super().update_styles()
-        theme_colors = self.theme_manager.get_theme_colors()
-        
-        label_style = self.config.get('bootstyle', None) # Get bootstyle if specified, otherwise none
-
-        if label_style and "." in label_style:
-             label_style = label_style.split(".")[0]
-        
-        if label_style in ["primary", "secondary", "success", "info", "warning", "danger"]:
-            fg_color = theme_colors.get(label_style)
-        elif label_style == "info":
-            fg_color = theme_colors.get("info")
-        else:
-           fg_color = theme_colors.get("foreground")
-
-        self._apply_styles({
-            "background": theme_colors.get("background"),
-             "foreground": fg_color
-        })
-
-    def _adjust_color_opacity(self, color, opacity):
-        """Add opacity to a color (used for ripple effect)."""
-        # Convert hex to RGB
-        r = int(color[1:3], 16)
-        g = int(color[3:5], 16)
-        b = int(color[5:7], 16)
-        
-        # Return color with opacity as a valid Tkinter color
-        return f'#{r:02x}{g:02x}{b:02x}'
+    def _adjust_color_opacity(self, color, opacity, background):
+        """Returns the opaque color of ``color`` drawn with ``opacity`` over ``background`` (used for ripple effect)."""
+        return ColorEngine.blend_color(color, background, opacity)
 
 
 class CustomLabel(CustomElement):
@@ -821,6 +2917,7 @@ class CustomLabel(CustomElement):
 
     Inherits from CustomElement.
     """
+    @profiled("CustomLabel.__init__")
     def __init__(self, parent, text="", **kwargs):
         """
         Initializes the custom label.
@@ -833,10 +2930,28 @@ class CustomLabel(CustomElement):
         super().__init__(parent, **kwargs)
         try:
             self.element = ttk.Label(self.parent, text=text, **self.config)
+            self._applied_config = dict(self.config)
         except Exception as e:
             print(f"Error creating label: {e}")
         self._apply_config()
 
+    def _resolve_styles(self, theme_colors):
+        """Returns the label colors implied by the theme and bootstyle."""
+        label_style = self.config.get('bootstyle', None) # Get bootstyle if specified, otherwise none
+
+        if label_style and "." in label_style:
+            label_style = label_style.split(".")[0]
+
+        if label_style in ["primary", "secondary", "success", "info", "warning", "danger"]:
+            fg_color = theme_colors.get(label_style)
+        else:
+            fg_color = theme_colors.get("foreground")
+
+        return {
+            "background": theme_colors.get("background"),
+            "foreground": fg_color
+        }
+
 
 
 
@@ -846,6 +2961,7 @@ class CustomEntry(CustomElement):
 
     Inherits from CustomElement.
     """
+    @profiled("CustomEntry.__init__")
     def __init__(self, parent, **kwargs):
         """
         Initializes the custom entry.
@@ -875,16 +2991,14 @@ class CustomEntry(CustomElement):
         """Handles focus in event."""
         theme_colors = self.theme_manager.get_theme_colors()
         self.element.config(insertcolor=theme_colors["primary"])  # Cursor color
-        style = ttk.Style()
-        style.map('TEntry',
+        self.theme_manager.configure_style('map', 'TEntry',
             bordercolor=[('focus', theme_colors["primary"])]
         )
 
     def _on_focus_out(self, event):
         """Handles focus out event."""
         theme_colors = self.theme_manager.get_theme_colors()
-        style = ttk.Style()
-        style.map('TEntry',
+        self.theme_manager.configure_style('map', 'TEntry',
             bordercolor=[('focus', theme_colors["primary"])]
         )
 
@@ -897,29 +3011,188 @@ class CustomEntry(CustomElement):
             return ""
 
 
+class ValueIndex:
+    """
+    Prefix and substring index over a list of values, built once.
+
+    Values are case-folded once. Prefix lookups bisect a sorted copy, and
+    substring lookups run ``str.find`` over all values joined into one string,
+    mapping hits back to values by bisecting their start offsets. When a
+    query extends the previous one, the previous (complete) result is narrowed
+    instead of searching again.
+    """
+    def __init__(self, values):
+        """
+        Builds the index.
+
+        Args:
+            values (list): Values to search; converted with ``str`` for matching.
+        """
+        self.values = list(values)
+        self._keys = [str(value).casefold() for value in self.values]
+        self._order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        self._sorted_keys = [self._keys[i] for i in self._order]
+        self._text = "\0".join(self._keys)
+        self._starts = array('q')
+        offset = 0
+        for key in self._keys:
+            self._starts.append(offset)
+            offset += len(key) + 1
+        self._last = None
+
+    def search(self, query, limit):
+        """
+        Returns up to ``limit`` values matching ``query``, prefix matches first.
+
+        Args:
+            query (str): Text typed by the user (case-insensitive).
+            limit (int): Maximum number of values returned.
+
+        Returns:
+            tuple: ``(values, complete)``, where ``complete`` is False if more matches exist.
+        """
+        query = query.casefold()
+        if not query:
+            return self.values[:limit], len(self.values) <= limit
+        last = self._last
+        if last and last[2] and query.startswith(last[0]):
+            candidates = [i for i in last[1] if query in self._keys[i]]
+            prefix = [i for i in candidates if self._keys[i].startswith(query)]
+            if len(prefix) < len(candidates):
+                prefix_set = set(prefix)
+                prefix.extend(i for i in candidates if i not in prefix_set)
+            indices, complete = prefix, True
+        else:
+            indices, complete = self._search(query, limit)
+        self._last = (query, indices, complete)
+        return [self.values[i] for i in indices[:limit]], complete and len(indices) <= limit
+
+    def _search(self, query, limit):
+        indices = []
+        seen = set()
+        position = bisect.bisect_left(self._sorted_keys, query)
+        while position < len(self._sorted_keys) and self._sorted_keys[position].startswith(query):
+            if len(indices) >= limit:
+                return indices, False
+            indices.append(self._order[position])
+            seen.add(self._order[position])
+            position += 1
+        text = self._text
+        starts = self._starts
+        found = text.find(query)
+        while found != -1:
+            value = bisect.bisect_right(starts, found) - 1
+            if value not in seen:
+                if len(indices) >= limit:
+                    return indices, False
+                indices.append(value)
+            # Continue after this value; one hit per value is enough
+            if value + 1 >= len(starts):
+                break
+            found = text.find(query, starts[value + 1])
+        return indices, True
+
+
 class CustomCombobox(CustomElement):
     """
     Customizable combobox element.
 
+    With ``filterable=True`` the user can type into the combobox; the
+    dropdown is narrowed to matching values (prefix matches first) through a
+    ValueIndex built on the first keystroke, and never holds more than
+    ``popup_limit`` entries, so lists with tens of thousands of values stay
+    responsive. ``values`` may also be a callable, which is called the first
+    time the values are needed (the dropdown opens or the user types).
+
     Inherits from CustomElement.
     """
-    def __init__(self, parent, values, **kwargs):
+    # Most values handed to the dropdown in filterable mode
+    popup_limit = 200
+    # Keys that move through the dropdown instead of changing the filter
+    _navigation_keys = {"Up", "Down", "Return", "KP_Enter", "Escape", "Tab", "ISO_Left_Tab",
+                        "Left", "Right", "Home", "End", "Shift_L", "Shift_R", "Control_L", "Control_R"}
+
+    @profiled("CustomCombobox.__init__")
+    def __init__(self, parent, values, filterable=False, **kwargs):
         """
         Initializes the custom combobox.
 
         Args:
             parent (ttk.Frame): Parent frame for the combobox.
-            values (list): List of values for the combobox.
+            values (list or function): List of values for the combobox, or a
+                function returning it, called when the values are first needed.
+            filterable (bool): Lets the user type to filter the values.
             **kwargs: Additional configuration settings for the combobox.
         """
         super().__init__(parent, **kwargs)
+        self.filterable = filterable
+        self._values_source = values if callable(values) else None
+        self._values = None if callable(values) else list(values)
+        self._index = None
+        self._filter = None
         try:
-            self.element = ttk.Combobox(self.parent, values=values, state="readonly", **self.config)
-            self.element.set(values[0])
+            initial = self._values or []
+            if filterable:
+                initial = initial[:self.popup_limit]
+            self.element = ttk.Combobox(self.parent, values=initial, state="normal" if filterable else "readonly",
+                                        postcommand=self._on_post, **self.config)
+            self._applied_config = dict(self.config)
+            if initial and not filterable:
+                self.element.set(initial[0])
+            if filterable:
+                self._filter = self.throttle(self._apply_filter, 0)
+                self.element.bind("<KeyRelease>", self._on_key_release, add="+")
         except Exception as e:
             print(f"Error creating combobox: {e}")
         self._apply_config()
 
+    def get_values(self):
+        """Returns every value, loading them first if they come from a function."""
+        if self._values is None:
+            try:
+                self._values = list(self._values_source())
+            except Exception as e:
+                print(f"Error loading combobox values: {e}")
+                self._values = []
+        return self._values
+
+    def set_values(self, values):
+        """
+        Replaces the values of the combobox.
+
+        Args:
+            values (list or function): New values, or a function returning them.
+        """
+        self._values_source = values if callable(values) else None
+        self._values = None if callable(values) else list(values)
+        self._index = None
+        if self.element and self._values is not None:
+            self._show(self._values[:self.popup_limit] if self.filterable else self._values)
+
+    def _show(self, values):
+        try:
+            self.element.configure(values=values)
+        except Exception as e:
+            print(f"Error setting values: {e}")
+
+    def _on_post(self):
+        """Fills the dropdown right before it opens."""
+        if self.filterable:
+            self._apply_filter()
+        elif self._values is None:
+            self._show(self.get_values())
+
+    def _on_key_release(self, event):
+        if event.keysym not in self._navigation_keys:
+            self._filter()
+
+    def _apply_filter(self):
+        """Narrows the dropdown to the values matching the typed text."""
+        if self._index is None:
+            self._index = ValueIndex(self.get_values())
+        matches, _complete = self._index.search(self.element.get(), self.popup_limit)
+        self._show(matches)
+
     def get_value(self):
         """Returns the current value of the combobox."""
         try:
@@ -937,6 +3210,8 @@ class CustomCombobox(CustomElement):
 
     def bind(self, sequence=None, func=None, add=None):
         """Binds an event to the combobox."""
+        if func is not None:
+            func = LoopWatchdog.wrap(f"bind:{sequence}:{getattr(func, '__qualname__', '')}", func)
         self.element.bind(sequence, func, add)
 
 
@@ -944,6 +3219,7 @@ class CustomCombobox(CustomElement):
 class CustomCheckbutton(CustomElement):
     """Customizable checkbutton element."""
 
+    @profiled("CustomCheckbutton.__init__")
     def __init__(self, parent, text, **kwargs):
         """
         Initializes the custom checkbutton.
@@ -957,6 +3233,7 @@ class CustomCheckbutton(CustomElement):
         self.var = tk.BooleanVar()
         try:
             self.element = ttk.Checkbutton(self.parent, text=text, variable=self.var, **self.config)
+            self._applied_config = dict(self.config)
         except Exception as e:
             print(f"Error creating checkbutton: {e}")
         self._apply_config()
@@ -966,10 +3243,877 @@ class CustomCheckbutton(CustomElement):
         return self.var.get()
 
 
+class RingBuffer:
+    """
+    Fixed-size, array-backed buffer of floats.
+
+    Once full, every append overwrites the oldest value. Iteration goes from
+    the oldest to the newest value.
+    """
+    def __init__(self, capacity):
+        """
+        Initializes the ring buffer.
+
+        Args:
+            capacity (int): Maximum number of values kept.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def append(self, value):
+        """Adds a value, overwriting the oldest one when the buffer is full."""
+        end = (self._start + self._size) % self.capacity
+        self._data[end] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def clear(self):
+        """Removes every value."""
+        self._start = 0
+        self._size = 0
+
+    def latest(self):
+        """Returns the newest value, or None when empty."""
+        if not self._size:
+            return None
+        return self._data[(self._start + self._size - 1) % self.capacity]
+
+    def values(self):
+        """Returns the values as a list, oldest first."""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[self._start:end].tolist()
+        return self._data[self._start:].tolist() + self._data[:end - self.capacity].tolist()
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self.values())
+
+
+class CustomSparkline(CustomElement):
+    """
+    Theme-aware line chart of one or more live series.
+
+    Each series keeps its samples in a RingBuffer. New points are drawn
+    incrementally: the series is shifted left with a single canvas move and
+    the segment that scrolled off is reused for the newest point, so the
+    number of canvas items never grows. When the history holds more samples
+    than the chart has pixels, consecutive samples are merged into one point
+    (keeping the peak).
+
+    Inherits from CustomElement.
+    """
+    @profiled("CustomSparkline.__init__")
+    def __init__(self, parent, capacity=120, minimum=0.0, maximum=100.0, **kwargs):
+        """
+        Initializes the sparkline.
+
+        Args:
+            parent (ttk.Frame): Parent frame for the chart.
+            capacity (int): Number of samples kept per series.
+            minimum (float): Value drawn at the bottom edge.
+            maximum (float): Value drawn at the top edge.
+            **kwargs: Additional configuration settings for the canvas (width, height...).
+        """
+        super().__init__(parent, **kwargs)
+        self.config.setdefault('width', 200)
+        self.config.setdefault('height', 40)
+        self.config.setdefault('highlightthickness', 0)
+        self.capacity = capacity
+        self.minimum = minimum
+        self.maximum = maximum
+        self.series = {}
+        self._plot_width = 0
+        self._plot_height = 0
+        self._samples_per_point = 1
+        self._dx = 1.0
+        try:
+            self.element = tk.Canvas(self.parent, **self.config)
+            self._applied_config = dict(self.config)
+            self.element.bind("<Configure>", self._on_resize, add="+")
+        except Exception as e:
+            print(f"Error creating sparkline: {e}")
+        self._apply_config()
+        self._update_geometry(int(self.config['width']), int(self.config['height']))
+        self.update_styles()
+
+    def add_series(self, name, bootstyle="primary"):
+        """
+        Adds a series to the chart.
+
+        Args:
+            name (str): Series name used by ``append``.
+            bootstyle (str): Theme color role of the line.
+        """
+        self.series[name] = {
+            "buffer": RingBuffer(self.capacity),
+            "bootstyle": bootstyle,
+            "tag": f"series{len(self.series)}",
+            "segments": deque(),
+            "last_y": None,
+            "bucket_count": 0,
+            "bucket_max": 0.0,
+        }
+
+    def append(self, name, value):
+        """
+        Adds a sample to a series and draws it.
+
+        Args:
+            name (str): Series name.
+            value (float): New sample.
+        """
+        series = self.series[name]
+        series["buffer"].append(value)
+        # Merge samples until a full point's worth has arrived
+        if series["bucket_count"] == 0 or value > series["bucket_max"]:
+            series["bucket_max"] = value
+        series["bucket_count"] += 1
+        if series["bucket_count"] >= self._samples_per_point:
+            self._push_point(series, series["bucket_max"])
+            series["bucket_count"] = 0
+
+    def _to_y(self, value):
+        span = (self.maximum - self.minimum) or 1.0
+        ratio = min(1.0, max(0.0, (value - self.minimum) / span))
+        return 1 + (1.0 - ratio) * (self._plot_height - 2)
+
+    def _push_point(self, series, value):
+        """Shifts a series left by one point and draws its newest segment."""
+        y = self._to_y(value)
+        last_y = series["last_y"]
+        series["last_y"] = y
+        if last_y is None or not self.element:
+            return
+        canvas = self.element
+        right = self._plot_width - 1
+        canvas.move(series["tag"], -self._dx, 0)
+        segments = series["segments"]
+        if len(segments) >= self._max_segments():
+            item = segments.popleft()
+            canvas.coords(item, right - self._dx, last_y, right, y)
+        else:
+            item = canvas.create_line(right - self._dx, last_y, right, y,
+                                      fill=self._series_color(series), tags=series["tag"])
+        segments.append(item)
+
+    def _max_segments(self):
+        return max(1, -(-self.capacity // self._samples_per_point) - 1)
+
+    def _update_geometry(self, width, height):
+        self._plot_width = max(2, width)
+        self._plot_height = max(2, height)
+        # Never draw more points than there are pixels
+        self._samples_per_point = max(1, -(-self.capacity // self._plot_width))
+        self._dx = (self._plot_width - 1) / self._max_segments()
+
+    def _on_resize(self, event):
+        if (event.width, event.height) != (self._plot_width, self._plot_height):
+            self._update_geometry(event.width, event.height)
+            self.redraw()
+
+    def redraw(self):
+        """Rebuilds every series from its buffer."""
+        if not self.element:
+            return
+        step = self._samples_per_point
+        for series in self.series.values():
+            self.element.delete(series["tag"])
+            series["segments"].clear()
+            series["last_y"] = None
+            values = series["buffer"].values()
+            full = len(values) - len(values) % step
+            for start in range(0, full, step):
+                self._push_point(series, max(values[start:start + step]))
+            pending = values[full:]
+            series["bucket_count"] = len(pending)
+            series["bucket_max"] = max(pending) if pending else 0.0
+
+    def _series_color(self, series):
+        theme_colors = self.theme_manager.get_theme_colors()
+        return theme_colors.get(series["bootstyle"], theme_colors.get("primary"))
+
+    def update_styles(self):
+        """Updates the chart colors based on the current theme."""
+        if not self.element:
+            return
+        theme_colors = self.theme_manager.get_theme_colors()
+        self._apply_styles({"background": theme_colors.get("background")})
+        for series in self.series.values():
+            self.element.itemconfigure(series["tag"], fill=self._series_color(series))
+
+class TableDataProvider:
+    """
+    Lazy row source for CustomTable.
+
+    Subclasses implement ``row_count`` and ``get_row``; the table only asks
+    for the rows it is about to show. ``sort_keys`` may be overridden to
+    return precomputed keys (for example from a database index) instead of
+    reading every row.
+    """
+    def row_count(self):
+        """Returns the number of rows."""
+        raise NotImplementedError
+
+    def get_row(self, index):
+        """Returns the cell values of a row as a sequence."""
+        raise NotImplementedError
+
+    def sort_keys(self, column):
+        """
+        Returns one sort key per row for a column, in row order.
+
+        Rows too short to have the column get None.
+
+        Args:
+            column (int): Column index.
+        """
+        keys = []
+        for index in range(self.row_count()):
+            row = self.get_row(index)
+            keys.append(row[column] if column < len(row) else None)
+        return keys
+
+
+class ListTableProvider(TableDataProvider):
+    """TableDataProvider over an in-memory sequence of rows."""
+    def __init__(self, rows):
+        """
+        Initializes the provider.
+
+        Args:
+            rows (list): Sequence of row sequences.
+        """
+        self.rows = rows
+
+    def row_count(self):
+        return len(self.rows)
+
+    def get_row(self, index):
+        return self.rows[index]
+
+
+class CustomTable(CustomElement):
+    """
+    Theme-aware virtual table for very large row counts.
+
+    Only the visible rows exist as canvas items: a pool of row slots sized
+    to the viewport is reused as the view scrolls, and a slot is only
+    rewritten when a different row moves into it. Rows are fetched lazily
+    from a TableDataProvider. Sorting uses the provider's sort keys once per
+    column and keeps the resulting order, so re-sorting or flipping the
+    direction never touches the data again. Scrolling is pixel-smooth and
+    uses the themed ``Vertical.TScrollbar``.
+
+    Inherits from CustomElement.
+    """
+    # Pixels added to the font's line height
+    row_padding = 6
+    # Rows scrolled per mouse wheel notch
+    wheel_rows = 3
+
+    @profiled("CustomTable.__init__")
+    def __init__(self, parent, columns, data=(), on_select=None, **kwargs):
+        """
+        Initializes the table.
+
+        Args:
+            parent (ttk.Frame): Parent frame for the table.
+            columns (list): Column titles, or ``(title, width)`` pairs.
+            data (TableDataProvider or list): Row source; sequences are wrapped in a ListTableProvider.
+            on_select (function, optional): Called with ``(row_index, row)`` when a row is selected.
+            **kwargs: Additional configuration settings for the container frame.
+        """
+        super().__init__(parent, **kwargs)
+        self.columns = []
+        for column in columns:
+            title, width = (column, 120) if isinstance(column, str) else column
+            self.columns.append({"title": title, "width": width})
+        self.on_select = on_select
+        self.provider = None
+        self.selected = None
+        self._slots = []
+        self._sort_column = None
+        self._sort_reverse = False
+        self._orders = {}
+        self._row_count = 0
+        self._colors = {}
+        self._total_width = sum(column["width"] for column in self.columns)
+
+        theme_colors = self.theme_manager.get_theme_colors()
+        self.font = tkfont.Font(family=theme_colors["font"], size=10)
+        self.row_height = self.font.metrics("linespace") + self.row_padding
+        self._char_width = max(1, self.font.measure("0"))
+        try:
+            self.element = ttk.Frame(self.parent)
+            self.header = tk.Canvas(self.element, height=self.row_height, highlightthickness=0)
+            self.body = tk.Canvas(self.element, highlightthickness=0, yscrollincrement=1, takefocus=1)
+            self.scrollbar = ttk.Scrollbar(self.element, orient=VERTICAL, style="Vertical.TScrollbar", command=self.yview)
+            self.header.grid(row=0, column=0, sticky="ew")
+            self.body.grid(row=1, column=0, sticky="nsew")
+            self.scrollbar.grid(row=0, column=1, rowspan=2, sticky="ns")
+            self.element.rowconfigure(1, weight=1)
+            self.element.columnconfigure(0, weight=1)
+            self.body.config(yscrollcommand=self.scrollbar.set)
+            self._bind_events()
+        except Exception as e:
+            print(f"Error creating table: {e}")
+        self._apply_config()
+        self.provider = data if isinstance(data, TableDataProvider) else ListTableProvider(data)
+        self.update_styles()
+        self.refresh()
+
+    def _bind_events(self):
+        self.body.bind("<Configure>", lambda event: self.render(), add="+")
+        self.body.bind("<Button-1>", self._on_click)
+        self.body.bind("<MouseWheel>", lambda event: self._scroll_rows(-self.wheel_rows if event.delta > 0 else self.wheel_rows))
+        self.body.bind("<Button-4>", lambda event: self._scroll_rows(-self.wheel_rows))
+        self.body.bind("<Button-5>", lambda event: self._scroll_rows(self.wheel_rows))
+        for key, delta in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"),
+                           ("<Home>", "home"), ("<End>", "end")):
+            self.body.bind(key, lambda event, delta=delta: self._on_key(delta))
+        self.header.bind("<Button-1>", self._on_header_click)
+
+    def set_data(self, data):
+        """
+        Replaces the row source.
+
+        Args:
+            data (TableDataProvider or list): New row source.
+        """
+        self.provider = data if isinstance(data, TableDataProvider) else ListTableProvider(data)
+        self.selected = None
+        self.refresh()
+
+    def refresh(self):
+        """Re-reads the row count and the visible rows after the data changed."""
+        self._orders.clear()
+        if self._sort_column is not None:
+            self._orders[self._sort_column] = self._sort_order(self._sort_column)
+        self._row_count = self.provider.row_count()
+        if not self.element:
+            return
+        self.body.config(scrollregion=(0, 0, self._total_width, self._row_count * self.row_height))
+        self._draw_header()
+        for slot in self._slots:
+            slot["position"] = None
+        self.render()
+
+    @staticmethod
+    def _sort_key(value):
+        """Orders mixed cell values: None first, then numbers, then strings, then other types by name."""
+        if value is None:
+            return (0, 0)
+        if isinstance(value, (int, float)):
+            return (1, value)
+        if isinstance(value, str):
+            return (2, value)
+        return (3, type(value).__name__, str(value))
+
+    def _sort_order(self, column):
+        keys = [self._sort_key(key) for key in self.provider.sort_keys(column)]
+        return array('q', sorted(range(len(keys)), key=keys.__getitem__))
+
+    def sort_by(self, column, reverse=None):
+        """
+        Sorts the rows by a column.
+
+        Args:
+            column (int): Column index.
+            reverse (bool, optional): Descending order. Defaults to flipping
+                the direction when the column is already sorted.
+        """
+        if reverse is None:
+            reverse = not self._sort_reverse if column == self._sort_column else False
+        if column not in self._orders:
+            self._orders[column] = self._sort_order(column)
+        self._sort_column = column
+        self._sort_reverse = reverse
+        self._draw_header()
+        for slot in self._slots:
+            slot["position"] = None
+        self.render()
+
+    def row_index(self, position):
+        """Returns the data row shown at a view position."""
+        if self._sort_column is None:
+            return position
+        order = self._orders[self._sort_column]
+        return order[len(order) - 1 - position] if self._sort_reverse else order[position]
+
+    def yview(self, *args):
+        """Scrollbar command; scrolls the body and renders the rows that came into view."""
+        if len(args) == 3 and args[0] == "scroll" and args[2] == "units":
+            self._scroll_rows(int(args[1]))
+            return
+        self.body.yview(*args)
+        self.render()
+
+    def _scroll_rows(self, rows):
+        self.body.yview_scroll(rows * self.row_height, "units")
+        self.render()
+        return "break"
+
+    def see(self, position):
+        """Scrolls a view position into view."""
+        top = int(self.body.canvasy(0))
+        height = self.body.winfo_height()
+        y = position * self.row_height
+        if y < top:
+            self.body.yview_scroll(y - top, "units")
+        elif y + self.row_height > top + height:
+            self.body.yview_scroll(y + self.row_height - top - height, "units")
+        self.render()
+
+    def render(self):
+        """Points the slot pool at the rows in view, rewriting only rows that changed."""
+        if not self.element:
+            return
+        height = max(self.body.winfo_height(), self.row_height)
+        needed = min(self._row_count, -(-height // self.row_height) + 1)
+        self._resize_pool(needed)
+        if not needed:
+            return
+        first = max(0, min(int(self.body.canvasy(0)) // self.row_height, self._row_count - needed))
+        for position in range(first, first + needed):
+            slot = self._slots[position % needed]
+            if slot["position"] != position:
+                self._fill_slot(slot, position)
+
+    def _resize_pool(self, size):
+        if len(self._slots) == size:
+            return
+        while len(self._slots) > size:
+            slot = self._slots.pop()
+            self.body.delete(slot["background"], *slot["cells"])
+        while len(self._slots) < size:
+            background = self.body.create_rectangle(0, 0, self._total_width, 0, width=0, tags="row")
+            cells = [self.body.create_text(0, 0, anchor="w", font=self.font, tags="cell") for _ in self.columns]
+            self._slots.append({"background": background, "cells": cells, "position": None, "index": None})
+        # Slots are addressed by position modulo the pool size, which just changed
+        for slot in self._slots:
+            slot["position"] = None
+
+    def _fill_slot(self, slot, position):
+        body = self.body
+        index = self.row_index(position)
+        row = self.provider.get_row(index)
+        top = position * self.row_height
+        slot["position"] = position
+        slot["index"] = index
+        colors = self._colors
+        if index == self.selected:
+            background, foreground = colors["selected"], colors["selected_text"]
+        else:
+            background, foreground = colors["stripe" if position % 2 else "background"], colors["foreground"]
+        body.coords(slot["background"], 0, top, self._total_width, top + self.row_height)
+        body.itemconfigure(slot["background"], fill=background)
+        x = 0
+        middle = top + self.row_height / 2
+        # Rows shorter than the header blank their remaining cells, which may
+        # still hold text from the row this slot showed before
+        length = len(row)
+        for column_index, (item, column) in enumerate(zip(slot["cells"], self.columns)):
+            text = self._clip(row[column_index], column["width"]) if column_index < length else ""
+            body.coords(item, x + 4, middle)
+            body.itemconfigure(item, text=text, fill=foreground)
+            x += column["width"]
+
+    def _clip(self, value, width):
+        text = str(value)
+        limit = max(1, (width - 8) // self._char_width)
+        return text if len(text) <= limit else text[:limit - 1] + "…"
+
+    def _draw_header(self):
+        self.header.delete("all")
+        x = 0
+        for column_index, column in enumerate(self.columns):
+            title = column["title"]
+            if column_index == self._sort_column:
+                title += " ▼" if self._sort_reverse else " ▲"
+            self.header.create_text(x + 4, self.row_height / 2, anchor="w", font=self.font,
+                                    text=self._clip(title, column["width"]), fill=self._colors["foreground"])
+            x += column["width"]
+
+    def _column_at(self, x):
+        for column_index, column in enumerate(self.columns):
+            x -= column["width"]
+            if x < 0:
+                return column_index
+        return None
+
+    def _on_header_click(self, event):
+        column = self._column_at(self.header.canvasx(event.x))
+        if column is not None:
+            self.sort_by(column)
+
+    def _on_click(self, event):
+        self.body.focus_set()
+        position = int(self.body.canvasy(event.y)) // self.row_height
+        if 0 <= position < self._row_count:
+            self.select(position)
+
+    def _on_key(self, delta):
+        if not self._row_count:
+            return "break"
+        page = max(1, self.body.winfo_height() // self.row_height - 1)
+        current = self.selected_position()
+        if delta == "home":
+            position = 0
+        elif delta == "end":
+            position = self._row_count - 1
+        else:
+            step = {"page": page, "-page": -page}.get(delta, delta)
+            position = 0 if current is None else current + step
+        self.select(max(0, min(self._row_count - 1, position)))
+        return "break"
+
+    def selected_position(self):
+        """Returns the view position of the selected row, or None."""
+        if self.selected is None:
+            return None
+        for slot in self._slots:
+            if slot["index"] == self.selected and slot["position"] is not None:
+                return slot["position"]
+        if self._sort_column is None:
+            return self.selected
+        order = self._orders[self._sort_column]
+        # Only reached when the selection scrolled out of view
+        position = order.index(self.selected)
+        return len(order) - 1 - position if self._sort_reverse else position
+
+    def select(self, position):
+        """
+        Selects the row at a view position and scrolls it into view.
+
+        Args:
+            position (int): View position (after sorting).
+        """
+        previous = self.selected
+        self.selected = self.row_index(position)
+        for slot in self._slots:
+            if slot["index"] in (previous, self.selected) and slot["position"] is not None:
+                self._fill_slot(slot, slot["position"])
+        self.see(position)
+        if self.on_select:
+            self.on_select(self.selected, self.provider.get_row(self.selected))
+
+    def update_styles(self):
+        """Updates the table colors based on the current theme."""
+        if not self.element:
+            return
+        theme_colors = self.theme_manager.get_theme_colors()
+        # Resolved once per theme change instead of once per drawn row
+        self._colors = {
+            "background": theme_colors["background"],
+            "stripe": self.theme_manager._adjust_color_brightness(theme_colors["background"], 1.25),
+            "foreground": theme_colors["foreground"],
+            "selected": theme_colors["primary"],
+            "selected_text": theme_colors["background"],
+        }
+        self.body.config(background=theme_colors["background"])
+        self.header.config(background=theme_colors["secondary"])
+        self._draw_header()
+        for slot in self._slots:
+            slot["position"] = None
+        self.render()
+
+
+class Layout:
+    """
+    Declarative screen layout compiled into a flat build plan.
+
+    A spec is a tree of dicts (or a JSON file holding one). Each node names
+    a widget ``type`` and may give a ``name``, one geometry manager
+    (``pack``, ``grid`` or ``place``) with its options, ``children``,
+    ``rowconfigure``/``columnconfigure`` for frames, and a ``command``
+    (a name looked up in the ``commands`` passed to ``build``, or a list of
+    a name followed by its arguments). Every other key is a widget option::
+
+        {"type": "frame", "pack": {"fill": "both", "expand": True},
+         "columnconfigure": {"0": {"weight": 1}},
+         "children": [
+             {"type": "button", "name": "ok", "text": "OK", "bootstyle": "success",
+              "command": "accept", "grid": {"row": 0, "column": 0}}]}
+
+    Compiling validates the spec and flattens it into a list of steps in
+    creation order. Plans are cached in memory and on disk under a hash of
+    the spec, so later launches load the plan directly; for spec files the
+    raw bytes are hashed, so a cached file is never parsed.
+    """
+    # Bumped whenever the plan format changes, which invalidates cached plans
+    plan_version = 1
+    # Directory of cached plans; defaults to "layouts" next to the settings file
+    cache_dir = None
+    _plans = {}
+    geometry_managers = ("pack", "grid", "place")
+    _reserved = ("type", "name", "children", "command", "rowconfigure", "columnconfigure") + geometry_managers
+
+    def __init__(self, digest, steps):
+        """
+        Initializes a compiled layout. Use ``from_spec`` or ``from_file``.
+
+        Args:
+            digest (str): Hash of the spec the plan was compiled from.
+            steps (list): Build steps in creation order.
+        """
+        self.digest = digest
+        self.steps = steps
+
+    @classmethod
+    def widget_types(cls):
+        """Returns the mapping of spec ``type`` names to widget classes."""
+        return {
+            "frame": ttk.Frame,
+            "button": CustomButton,
+            "label": CustomLabel,
+            "entry": CustomEntry,
+            "combobox": CustomCombobox,
+            "checkbutton": CustomCheckbutton,
+            "sparkline": CustomSparkline,
+            "table": CustomTable,
+        }
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Returns the compiled layout for a spec dict.
 
+        Raises:
+            ValueError: If the spec is invalid.
+        """
+        source = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+        return cls._load(cls._digest(source.encode("utf-8")), lambda: spec)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Returns the compiled layout for a JSON spec file.
+
+        Raises:
+            ValueError: If the spec is invalid.
+        """
+        with open(path, "rb") as file:
+            source = file.read()
+        return cls._load(cls._digest(source), lambda: json.loads(source))
+
+    @classmethod
+    def _digest(cls, source):
+        return hashlib.blake2b(source, digest_size=16, person=b"layout-v%d" % cls.plan_version).hexdigest()
+
+    @classmethod
+    def _cache_path(cls, digest):
+        directory = cls.cache_dir or os.path.join(os.path.dirname(SettingsStore.default_path()), "layouts")
+        return os.path.join(directory, f"{digest}.json")
+
+    @classmethod
+    def _load(cls, digest, get_spec):
+        """Returns the plan for ``digest`` from memory, disk, or by compiling ``get_spec()``."""
+        layout = cls._plans.get(digest)
+        if layout is not None:
+            return layout
+        path = cls._cache_path(digest)
+        steps = None
+        try:
+            with open(path, "r") as file:
+                cached = json.load(file)
+            if cached.get("version") == cls.plan_version and cls._valid_steps(cached["steps"]):
+                steps = cached["steps"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        # A missing, stale, truncated or hand-edited cache file is recompiled
+        if steps is None:
+            steps = cls.compile(get_spec())
+            cls._save(path, steps)
+        layout = cls._plans[digest] = cls(digest, steps)
+        return layout
+
+    @classmethod
+    def _valid_steps(cls, steps):
+        """Returns whether ``steps`` (read from the disk cache) has the shape ``compile`` produces."""
+        if not isinstance(steps, list):
+            return False
+        types = cls.widget_types()
+        keys = {"type", "parent", "name", "options", "command", "geometry"}
+        for index, step in enumerate(steps):
+            if not isinstance(step, dict) or not keys <= step.keys():
+                return False
+            parent, command, geometry = step["parent"], step["command"], step["geometry"]
+            if (step["type"] not in types
+                    or type(parent) is not int or not -1 <= parent < index
+                    or (parent == -1) != (index == 0)
+                    or (parent >= 0 and steps[parent].get("type") != "frame")
+                    or not (step["name"] is None or isinstance(step["name"], str))
+                    or not isinstance(step["options"], dict)):
+                return False
+            if command is not None and not (isinstance(command, list) and command and isinstance(command[0], str)):
+                return False
+            if geometry is not None and not (isinstance(geometry, list) and len(geometry) == 2
+                                             and geometry[0] in cls.geometry_managers
+                                             and isinstance(geometry[1], dict)):
+                return False
+            if step["type"] == "frame":
+                for field in ("rows", "columns"):
+                    pairs = step.get(field)
+                    if not isinstance(pairs, list) or not all(
+                            isinstance(pair, list) and len(pair) == 2 and type(pair[0]) is int
+                            and isinstance(pair[1], dict) for pair in pairs):
+                        return False
+        return bool(steps)
+
+    @classmethod
+    def _save(cls, path, steps):
+        """Atomically writes a plan to the disk cache."""
+        try:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".layout-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w") as file:
+                    json.dump({"version": cls.plan_version, "steps": steps}, file, separators=(",", ":"))
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            print(f"Error caching layout: {e}")
+
+    @classmethod
+    def compile(cls, spec):
+        """
+        Validates a spec and flattens it into build steps.
+
+        Each step is a dict with ``type``, ``parent`` (index of an earlier
+        step, or -1 for the build parent), ``name``, ``options``,
+        ``command``, ``geometry`` (``[manager, options]`` or None) and, for
+        frames, ``rows``/``columns`` (lists of ``[index, options]``).
+
+        Raises:
+            ValueError: If the spec is invalid.
+        """
+        types = cls.widget_types()
+        steps = []
+        names = set()
+        # Iterative walk, children in order, so deep specs cannot hit the recursion limit
+        pending = [(spec, -1, "layout")]
+        while pending:
+            node, parent, where = pending.pop()
+            if not isinstance(node, dict):
+                raise ValueError(f"{where}: expected a dict, got {type(node).__name__}")
+            widget_type = node.get("type")
+            if widget_type not in types:
+                raise ValueError(f"{where}: unknown type {widget_type!r}")
+            name = node.get("name")
+            if name is not None:
+                if not isinstance(name, str) or name in names:
+                    raise ValueError(f"{where}: name {name!r} is not a unique string")
+                names.add(name)
+                where = name
+
+            managers = [manager for manager in cls.geometry_managers if manager in node]
+            if len(managers) > 1:
+                raise ValueError(f"{where}: more than one geometry manager ({', '.join(managers)})")
+            geometry = None
+            if managers:
+                options = node[managers[0]]
+                if not isinstance(options, dict):
+                    raise ValueError(f"{where}: {managers[0]} options must be a dict")
+                geometry = [managers[0], options]
+
+            command = node.get("command")
+            if command is not None:
+                if isinstance(command, str):
+                    command = [command]
+                if not isinstance(command, list) or not command or not isinstance(command[0], str):
+                    raise ValueError(f"{where}: command must be a name or [name, *args]")
+
+            step = {
+                "type": widget_type,
+                "parent": parent,
+                "name": name,
+                "options": {key: value for key, value in node.items() if key not in cls._reserved},
+                "command": command,
+                "geometry": geometry,
+            }
+            children = node.get("children", [])
+            if widget_type == "frame":
+                for key, field in (("rowconfigure", "rows"), ("columnconfigure", "columns")):
+                    try:
+                        step[field] = sorted(([int(index), dict(options)] for index, options in node.get(key, {}).items()),
+                                             key=lambda pair: pair[0])
+                    except (AttributeError, TypeError, ValueError):
+                        raise ValueError(f"{where}: {key} must map indexes to option dicts")
+            elif children or "rowconfigure" in node or "columnconfigure" in node:
+                raise ValueError(f"{where}: only frames can have children or row/column configs")
+            if not isinstance(children, list):
+                raise ValueError(f"{where}: children must be a list")
+
+            steps.append(step)
+            index = len(steps) - 1
+            for position in range(len(children) - 1, -1, -1):
+                pending.append((children[position], index, f"{where}.children[{position}]"))
+        return steps
+
+    def build(self, parent, commands=None, options=None):
+        """
+        Creates the widgets of the layout inside ``parent`` in one batch.
 
+        Args:
+            parent (tk.Misc): Widget the top-level node is created in.
+            commands (dict, optional): Callables referenced by ``command``.
+            options (dict, optional): Extra options per node name, for values
+                that cannot be written in a spec (variables, images).
+
+        Returns:
+            dict: Named nodes mapped to their widget (frames) or CustomElement.
+
+        Raises:
+            KeyError: If a step references a command that was not given.
+        """
+        types = self.widget_types()
+        commands = commands or {}
+        extra_options = options or {}
+        created = []
+        named = {}
+        with WidgetBatch.current() or WidgetBatch() as batch:
+            for step in self.steps:
+                master = parent if step["parent"] < 0 else created[step["parent"]]
+                if isinstance(master, CustomElement):
+                    master = master.element
+                options = dict(step["options"])
+                options.update(extra_options.get(step["name"], {}))
+                if step["command"] is not None:
+                    func = commands[step["command"][0]]
+                    args = step["command"][1:]
+                    options["command"] = (lambda func=func, args=args: func(*args)) if args else func
+                elif step["type"] == "button":
+                    options["command"] = None
 
+                item = types[step["type"]](master, **options)
+                created.append(item)
+                if step["name"] is not None:
+                    named[step["name"]] = item
 
+                if step["type"] == "frame":
+                    for index, row_options in step["rows"]:
+                        item.rowconfigure(index, **row_options)
+                    for index, column_options in step["columns"]:
+                        item.columnconfigure(index, **column_options)
+                if step["geometry"] is not None:
+                    manager, geometry = step["geometry"]
+                    if isinstance(item, CustomElement):
+                        getattr(item, manager)(**geometry)
+                    else:
+                        getattr(batch, manager)(item, **geometry)
+        return named
 
 
 if __name__ == '__main__':
@@ -1009,6 +4153,11 @@ if __name__ == '__main__':
     get_combo_button = CustomButton(content_frame, text="Get Combo Value", command=get_combo_value, bootstyle=SUCCESS)
     get_combo_button.pack()
 
+    # Filterable Combobox Example (values are generated when first needed)
+    search_combo = CustomCombobox(content_frame, values=lambda: [f"Item {i:05d}" for i in range(50000)],
+                                  filterable=True, width=20)
+    search_combo.pack(pady=20)
+
     # Checkbutton Example
     checkbutton = CustomCheckbutton(content_frame, text="Check me")
     checkbutton.pack(pady=20)
@@ -1019,4 +4168,18 @@ if __name__ == '__main__':
     get_checkbutton = CustomButton(content_frame, text="Get Check Value", command=get_checkbutton_value, bootstyle=SUCCESS)
     get_checkbutton.pack()
 
+    # Background Task Example
+    task_label = CustomLabel(content_frame, text="")
+    task_label.pack(pady=(20, 0))
+
+    def slow_sum(count):
+        return sum(i * i for i in range(count))
+
+    run_task_button = CustomButton(
+        content_frame, text="Run Background Task", bootstyle=SUCCESS,
+        command=lambda: app.run_in_background(
+            slow_sum, 10_000_000, on_done=lambda total: task_label.set_config(text=f"Result: {total}"))
+    )
+    run_task_button.pack()
+
     app.run()
\ No newline at end of file
@@ -3,16 +3,257 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import sys
 import os
+from decimal import Decimal, localcontext
+from fractions import Fraction
 
 # Add parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from gui_lib import MainWindow, CustomButton, CustomLabel, ThemeManager, CustomCombobox
+from gui_lib import MainWindow, CustomLabel, ThemeManager, CustomCombobox, Layout
+
+
+class ExpressionError(ValueError):
+    """Raised for input that is not a valid arithmetic expression."""
+
+
+class _ExactValue(str):
+    """Number token shown rounded on the display but evaluated as its exact ``value``."""
+
+    def __new__(cls, text, value):
+        token = super().__new__(cls, text)
+        token.value = value
+        return token
+
+
+class ExpressionEngine:
+    """
+    Safe arithmetic evaluator for the calculator display.
+
+    Keys are tokenized as they are pressed, so evaluating never re-scans the
+    display string. Expressions are compiled into a table of shared nodes:
+    a repeated sub-expression maps to the same node and its value is only
+    computed once. Arithmetic is exact (``Fraction``), and only numbers,
+    ``+ - * /`` and parentheses are accepted - nothing is ever passed to
+    ``eval``.
+
+    Attributes:
+        tokens (list): Tokens of the current expression (numbers as strings).
+    """
+    operators = "+-*/"
+    # Nodes kept before the table is reset
+    max_nodes = 50000
+    # Deepest parenthesis nesting accepted
+    max_depth = 200
+    # Significant digits shown for non-terminating results
+    precision = 28
+
+    def __init__(self):
+        """Initializes an empty expression."""
+        self.tokens = []
+        self._node_ids = {}
+        self._values = []
+
+    @property
+    def text(self):
+        """The expression as shown on the display."""
+        return "".join(self.tokens)
+
+    def clear(self):
+        """Clears the current expression (compiled nodes are kept)."""
+        self.tokens = []
+
+    def set_text(self, text):
+        """Replaces the current expression with ``text``, one key at a time."""
+        self.clear()
+        for char in text:
+            self.push(char)
+
+    def set_value(self, value):
+        """
+        Replaces the current expression with an exact value, such as the last result.
+
+        The display shows ``format(value)``, but operations that follow use
+        the exact value, so ``1/3``, ``=``, ``*3`` gives 1. Typing a digit or
+        ``.`` right after it edits the shown digits instead.
+        """
+        self.tokens = [_ExactValue(self.format(value), value)]
+
+    def push(self, char):
+        """
+        Adds one key to the expression.
+
+        Args:
+            char (str): A digit, ``.``, an operator or a parenthesis.
+
+        Raises:
+            ExpressionError: If the key is not part of the arithmetic grammar.
+        """
+        if char.isdigit() or char == ".":
+            if self.tokens and isinstance(self.tokens[-1], _ExactValue):
+                # Editing a shown result continues from its rounded digits
+                self.set_text(self.text)
+            last = self.tokens[-1] if self.tokens else None
+            if last is not None and last[0] in "0123456789.":
+                if char == "." and "." in last:
+                    raise ExpressionError("Number already has a decimal point")
+                self.tokens[-1] = last + char
+            else:
+                self.tokens.append(char)
+        elif char in self.operators or char in "()":
+            self.tokens.append(char)
+        elif not char.isspace():
+            raise ExpressionError(f"Unsupported character: {char!r}")
+
+    def evaluate(self):
+        """
+        Evaluates the current expression.
+
+        Returns:
+            Fraction: The exact result.
+
+        Raises:
+            ExpressionError: If the expression is incomplete or divides by zero.
+        """
+        if len(self._values) > self.max_nodes:
+            self._node_ids.clear()
+            self._values.clear()
+        self._position = 0
+        node = self._parse_sum(0)
+        if self._position != len(self.tokens):
+            raise ExpressionError(f"Unexpected {self.tokens[self._position]!r}")
+        return self._values[node]
+
+    def format(self, value):
+        """Formats a result for the display."""
+        if value.denominator == 1:
+            return str(value.numerator)
+        with localcontext() as context:
+            context.prec = self.precision
+            result = Decimal(value.numerator) / Decimal(value.denominator)
+        text = format(result, "f")
+        return text.rstrip("0").rstrip(".") if "." in text else text
+
+    def _node(self, key, compute):
+        """Returns the id of the node for ``key``, computing its value only the first time."""
+        node = self._node_ids.get(key)
+        if node is None:
+            node = len(self._values)
+            self._values.append(compute())
+            self._node_ids[key] = node
+        return node
+
+    def _peek(self):
+        if self._position < len(self.tokens):
+            return self.tokens[self._position]
+        return None
+
+    def _parse_sum(self, depth):
+        node = self._parse_product(depth)
+        # Loop instead of recursing, so long chains do not hit the recursion limit
+        while self._peek() in ("+", "-"):
+            op = self.tokens[self._position]
+            self._position += 1
+            right = self._parse_product(depth)
+            node = self._binary(op, node, right)
+        return node
+
+    def _parse_product(self, depth):
+        node = self._parse_factor(depth)
+        while self._peek() in ("*", "/"):
+            op = self.tokens[self._position]
+            self._position += 1
+            right = self._parse_factor(depth)
+            node = self._binary(op, node, right)
+        return node
+
+    def _parse_factor(self, depth):
+        if depth > self.max_depth:
+            raise ExpressionError("Expression is nested too deeply")
+        token = self._peek()
+        if token is None:
+            raise ExpressionError("Incomplete expression")
+        self._position += 1
+        if isinstance(token, _ExactValue):
+            return self._node(("value", token.value), lambda: token.value)
+        if token in ("+", "-"):
+            operand = self._parse_factor(depth + 1)
+            if token == "+":
+                return operand
+            return self._node(("neg", operand), lambda: -self._values[operand])
+        if token == "(":
+            node = self._parse_sum(depth + 1)
+            if self._peek() != ")":
+                raise ExpressionError("Missing ')'")
+            self._position += 1
+            return node
+        if token[0] in "0123456789.":
+            if token == ".":
+                raise ExpressionError("Invalid number")
+            return self._node(token, lambda: Fraction(token))
+        raise ExpressionError(f"Unexpected {token!r}")
+
+    def _binary(self, op, left, right):
+        def compute():
+            a, b = self._values[left], self._values[right]
+            if op == "+":
+                return a + b
+            if op == "-":
+                return a - b
+            if op == "*":
+                return a * b
+            if b == 0:
+                raise ExpressionError("Division by zero")
+            return a / b
+        return self._node((op, left, right), compute)
+
+
+KEYPAD = (
+    ("7", "8", "9", "/"),
+    ("4", "5", "6", "*"),
+    ("1", "2", "3", "-"),
+    ("0", "C", "=", "+")
+)
+
+KEY_STYLES = {
+    "/": PRIMARY,
+    "*": PRIMARY,
+    "-": PRIMARY,
+    "+": PRIMARY,
+    "=": SUCCESS,
+    "C": WARNING
+}
+
+# Compiled on first use (Layout caches the plan), so importing this module touches no files
+CALCULATOR_LAYOUT_SPEC = {
+    "type": "frame",
+    "bootstyle": LIGHT,
+    "pack": {"fill": BOTH, "expand": True},
+    "children": [
+        {"type": "label", "name": "display", "font": ["Arial", 24], "anchor": "e", "padding": 10,
+         "pack": {"fill": X}},
+        {
+            "type": "frame",
+            "pack": {"fill": BOTH, "expand": True},
+            # Make the buttons expand with the window
+            "rowconfigure": {str(row): {"weight": 1} for row in range(len(KEYPAD))},
+            "columnconfigure": {str(column): {"weight": 1} for column in range(len(KEYPAD[0]))},
+            "children": [
+                {"type": "button", "text": key, "command": ["press", key],
+                 "bootstyle": KEY_STYLES.get(key, SECONDARY), "width": 5,
+                 "grid": {"row": row, "column": column, "padx": 5, "pady": 5, "sticky": "nsew"}}
+                for row, keys in enumerate(KEYPAD)
+                for column, key in enumerate(keys)
+            ]
+        }
+    ]
+}
+
 
 class CalculatorApp(MainWindow):
     def __init__(self):
         super().__init__(title="Calculator", theme="nordic_frost")
         self.theme_manager = ThemeManager()
         self.result_string = tk.StringVar(value="0")
+        self.engine = ExpressionEngine()
         self._create_widgets()
 
     def _create_widgets(self):
@@ -32,68 +273,41 @@ class CalculatorApp(MainWindow):
         self.theme_combobox.bind("<<ComboboxSelected>>", self._on_theme_selected)
         self.theme_combobox.pack(side=LEFT, padx=(5, 0))
 
-        # Display Label
-        display_label = CustomLabel(self.content_frame, textvariable=self.result_string, font=("Arial", 24), anchor="e", padding=10)
-        display_label.pack(fill=X)
-
-        # Button Frame
-        button_frame = ttk.Frame(self.content_frame)
-        button_frame.pack(fill=BOTH, expand=True)
-
-        button_layout = [
-            ("7", "8", "9", "/"),
-            ("4", "5", "6", "*"),
-            ("1", "2", "3", "-"),
-            ("0", "C", "=", "+")
-        ]
-        
-        button_styles = {
-            "/": PRIMARY,
-            "*": PRIMARY,
-            "-": PRIMARY,
-            "+": PRIMARY,
-            "=": SUCCESS,
-            "C": WARNING
-        }
-
-        for row_index, row in enumerate(button_layout):
-            for col_index, text in enumerate(row):
-                style = button_styles.get(text, SECONDARY)
-                button = CustomButton(
-                    button_frame,
-                    text=text,
-                    command=lambda t=text: self._button_click(t),
-                    bootstyle=style,
-                    width=5 # Set a fixed width for each button
-                )
-                button.grid(row=row_index, column=col_index, padx=5, pady=5, sticky="nsew")
-
-        # Configure grid weights to make buttons expand
-        for i in range(4):
-            button_frame.rowconfigure(i, weight=1)
-            button_frame.columnconfigure(i, weight=1)
+        # Display and keypad
+        Layout.from_spec(CALCULATOR_LAYOUT_SPEC).build(
+            self.content_frame,
+            commands={"press": self._button_click},
+            options={"display": {"textvariable": self.result_string}}
+        )
 
     def _button_click(self, char):
         if char == "=":
             try:
-                # Evaluate the expression and update the result
-                result = str(eval(self.result_string.get()))
-                self.result_string.set(result)
-            except:
+                # The exact result stays the operand of the next operation
+                self.engine.set_value(self.engine.evaluate())
+                self.result_string.set(self.engine.text)
+            except ExpressionError:
+                self.engine.clear()
                 self.result_string.set("Error")
         elif char == "C":
+            self.engine.clear()
             self.result_string.set("0")
         else:
-            if self.result_string.get() == "0" or self.result_string.get() == "Error":
-                self.result_string.set(char)
-            else:
-                self.result_string.set(self.result_string.get() + char)
+            if self.result_string.get() in ("0", "Error"):
+                self.engine.clear()
+            try:
+                self.engine.push(char)
+            except ExpressionError:
+                return
+            self.result_string.set(self.engine.text)
+
+    def _on_theme_selected(self, event):
+        """Handles theme selection."""
+        selected_theme = self.theme_combobox.get_value()
+        self.theme_manager.set_theme(selected_theme)
+        self.update_ui()
 
-def _on_theme_selected(self, event):
-    """Handles theme selection."""
-    selected_theme = self.theme_combobox.get_value()
-    self.theme_manager.set_theme(selected_theme)
-    self.update_ui()
 
-app = CalculatorApp()
-app.run()
\ No newline at end of file
+if __name__ == "__main__":
+    app = CalculatorApp()
+    app.run()
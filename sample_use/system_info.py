@@ -1,17 +1,118 @@
-import platform
+import queue
+import threading
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import psutil
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from gui_lib import MainWindow, CustomCombobox, CustomLabel, ThemeManager
+from gui_lib import MainWindow, CustomCombobox, CustomLabel, CustomSparkline, ThemeManager
+
+
+def platform_info():
+    """Returns the OS name, release, processor and architecture."""
+    import platform
+    return {
+        "system": platform.system(),
+        "release": platform.release(),
+        "processor": platform.processor(),
+        "machine": platform.machine(),
+    }
+
+
+class MetricsSampler:
+    """
+    Samples CPU, RAM and disk usage on a worker thread.
+
+    Each snapshot is a dict with ``cpu`` (per-core percentages), ``ram`` and
+    ``disk`` (used GB, total GB, percent). If sampling fails the snapshot
+    is ``{"error": message}`` instead and sampling carries on. Snapshots are
+    published to a bounded, thread-safe queue; only when the UI falls more
+    than ``backlog`` samples behind is the oldest snapshot dropped.
+    """
+    def __init__(self, interval=1.0, disk_path='/', backlog=64):
+        """
+        Initializes the sampler.
+
+        Args:
+            interval (float): Seconds between samples.
+            disk_path (str): Mount point whose usage is reported.
+            backlog (int): Snapshots kept while the UI is not draining them.
+        """
+        self.interval = interval
+        self.disk_path = disk_path
+        self.snapshots = queue.Queue(maxsize=backlog)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts the worker thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Asks the worker thread to exit after its current sample."""
+        self._stop.set()
+
+    def _run(self):
+        # Imported here so loading psutil does not delay the first window
+        import psutil
+        while not self._stop.is_set():
+            try:
+                # Blocks the worker, not the UI, for one interval
+                cpu = psutil.cpu_percent(interval=self.interval, percpu=True)
+                if self._stop.is_set():
+                    break
+                mem = psutil.virtual_memory()
+                disk = psutil.disk_usage(self.disk_path)
+            except Exception as e:
+                print(f"Error sampling system metrics: {e}")
+                self._publish({"error": str(e)})
+                # Keep the retry rate at one attempt per interval
+                self._stop.wait(self.interval)
+                continue
+            self._publish({
+                "cpu": cpu,
+                "ram": (round(mem.used / (1024.0 ** 3), 2), round(mem.total / (1024.0 ** 3), 2), mem.percent),
+                "disk": (round(disk.used / (1024.0 ** 3), 2), round(disk.total / (1024.0 ** 3), 2), disk.percent),
+            })
+
+    def _publish(self, snapshot):
+        while True:
+            try:
+                self.snapshots.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self.snapshots.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def drain(self):
+        """Returns every queued snapshot, oldest first (an empty list if there are none)."""
+        snapshots = []
+        while True:
+            try:
+                snapshots.append(self.snapshots.get_nowait())
+            except queue.Empty:
+                return snapshots
+
 
 class SystemInfoApp(MainWindow):
-    def __init__(self):
+    # Milliseconds between checks of the sampler queue
+    poll_interval = 100
+    # Samples of CPU history kept per core
+    history_size = 300
+
+    def __init__(self, sample_interval=1.0):
         super().__init__(title="System Information", theme="nordic_frost")
         self.theme_manager = ThemeManager()
+        self.sampler = MetricsSampler(interval=sample_interval)
+        self._rendered = {}
+        self._poll_id = None
         self._create_widgets()
+        self.sampler.start()
+        self._poll_metrics()
 
     def _create_widgets(self):
         # Theme Switcher
@@ -34,63 +135,97 @@ class SystemInfoApp(MainWindow):
         info_frame = ttk.Frame(self.content_frame)
         info_frame.pack(fill=BOTH, expand=True, padx=10, pady=10)
 
-        # OS
-        os_label = CustomLabel(info_frame, text=f"OS: {platform.system()} {platform.release()}")
-        os_label.pack(fill=X)
-
-        # Processor
-        processor_label = CustomLabel(info_frame, text=f"Processor: {platform.processor()}")
-        processor_label.pack(fill=X)
-
-        # Architecture
-        arch_label = CustomLabel(info_frame, text=f"Architecture: {platform.machine()}")
-        arch_label.pack(fill=X)
-
-        # RAM
-        mem = psutil.virtual_memory()
-        mem_total = round(mem.total / (1024.0 ** 3), 2)
-        mem_available = round(mem.available / (1024.0 ** 3), 2)
-        mem_used = round(mem.used / (1024.0 ** 3), 2)
-        mem_percent = mem.percent
-        ram_label = CustomLabel(info_frame, text=f"RAM: {mem_used} GB / {mem_total} GB ({mem_percent}%)")
-        ram_label.pack(fill=X)
-
-        # Disk Usage
-        disk = psutil.disk_usage('/')
-        disk_total = round(disk.total / (1024.0 ** 3), 2)
-        disk_used = round(disk.used / (1024.0 ** 3), 2)
-        disk_free = round(disk.free / (1024.0 ** 3), 2)
-        disk_percent = disk.percent
-        disk_label = CustomLabel(info_frame, text=f"Disk: {disk_used} GB / {disk_total} GB ({disk_percent}%)")
-        disk_label.pack(fill=X)
+        # OS, Processor and Architecture are looked up in the background
+        # (platform.processor() may run a subprocess)
+        self.os_label = CustomLabel(info_frame, text="OS: ...")
+        self.os_label.pack(fill=X)
+
+        self.processor_label = CustomLabel(info_frame, text="Processor: ...")
+        self.processor_label.pack(fill=X)
+
+        self.arch_label = CustomLabel(info_frame, text="Architecture: ...")
+        self.arch_label.pack(fill=X)
+        self.run_in_background(platform_info, on_done=self._show_platform_info)
+
+        # RAM and Disk Usage are filled in by the first sample
+        self.ram_label = CustomLabel(info_frame, text="RAM: ...")
+        self.ram_label.pack(fill=X)
+
+        self.disk_label = CustomLabel(info_frame, text="Disk: ...")
+        self.disk_label.pack(fill=X)
 
         # CPU Usage
-        cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
         cpu_label = CustomLabel(info_frame, text="CPU Usage:")
         cpu_label.pack(fill=X)
 
+        core_count = os.cpu_count() or 1
+        core_styles = [PRIMARY, SUCCESS, INFO, WARNING, DANGER, SECONDARY]
+
+        # CPU history, one line per core
+        self.cpu_chart = CustomSparkline(info_frame, capacity=self.history_size, height=80)
+        for i in range(core_count):
+            self.cpu_chart.add_series(i, bootstyle=core_styles[i % len(core_styles)])
+        self.cpu_chart.pack(fill=X, pady=5)
+
         # Initialize as a list
         self.cpu_labels = []
-        for i, percent in enumerate(cpu_percent):
-            label = CustomLabel(info_frame, text=f"  Core {i+1}: {percent}%")
+        for i in range(core_count):
+            label = CustomLabel(info_frame, text=f"  Core {i+1}: ...")
             label.pack(fill=X)
             self.cpu_labels.append(label)  # Append to list
 
-        self.update_cpu_usage()  # Start updating CPU usage
+    def _show_platform_info(self, info):
+        self._set_text(self.os_label, f"OS: {info['system']} {info['release']}")
+        self._set_text(self.processor_label, f"Processor: {info['processor']}")
+        self._set_text(self.arch_label, f"Architecture: {info['machine']}")
 
     def _on_theme_selected(self, event):
         selected_theme = self.theme_combobox.get_value()
         self.theme_manager.set_theme(selected_theme)
         self.update_ui()
 
-    def update_cpu_usage(self):
-        """Updates CPU usage information."""
-        cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
-        for i, percent in enumerate(cpu_percent):
-            # Use configure instead of config
-            self.cpu_labels[i].element.configure(text=f"  Core {i+1}: {percent}%")
-        self.after(1000, self.update_cpu_usage)
+    def _poll_metrics(self):
+        """Applies the queued sampler snapshots, if any, and polls again."""
+        snapshots = self.sampler.drain()
+        if snapshots:
+            # Every sample feeds the history; the labels only need the newest
+            for snapshot in snapshots[:-1]:
+                self.record_history(snapshot)
+            self.update_metrics(snapshots[-1])
+        self._poll_id = self.after(self.poll_interval, self._poll_metrics)
+
+    def _set_text(self, label, text):
+        """Configures a label only when its text actually changed."""
+        if self._rendered.get(label) != text:
+            label.element.configure(text=text)
+            self._rendered[label] = text
+
+    def update_metrics(self, snapshot):
+        """Updates RAM, disk and CPU usage labels from a sampler snapshot."""
+        if "error" in snapshot:
+            self._set_text(self.ram_label, f"RAM: unavailable ({snapshot['error']})")
+            self._set_text(self.disk_label, f"Disk: unavailable ({snapshot['error']})")
+            return
+        used, total, percent = snapshot["ram"]
+        self._set_text(self.ram_label, f"RAM: {used} GB / {total} GB ({percent}%)")
+        used, total, percent = snapshot["disk"]
+        self._set_text(self.disk_label, f"Disk: {used} GB / {total} GB ({percent}%)")
+        for i, percent in enumerate(snapshot["cpu"][:len(self.cpu_labels)]):
+            self._set_text(self.cpu_labels[i], f"  Core {i+1}: {percent}%")
+        self.record_history(snapshot)
+
+    def record_history(self, snapshot):
+        """Appends a snapshot's per-core CPU usage to the history chart."""
+        for i, percent in enumerate(snapshot.get("cpu", ())[:len(self.cpu_labels)]):
+            self.cpu_chart.append(i, percent)
+
+    def _on_close(self):
+        self.sampler.stop()
+        if self._poll_id:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        super()._on_close()
 
 if __name__ == "__main__":
     app = SystemInfoApp()
-    app.run()
\ No newline at end of file
+    app.run()
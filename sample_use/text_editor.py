@@ -1,24 +1,1177 @@
 import tkinter as tk
+import tkinter.font as tkfont
+import bisect
+import builtins
+import codecs
+import hashlib
+import keyword
+import locale
+import mmap
+import queue
+import re
+import shutil
 import sys
 import os
+import tempfile
+import threading
+import time
+from array import array
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from gui_lib import MainWindow, CustomCombobox, CustomLabel, CustomButton, ThemeManager
-import tkinter.filedialog as fd
-import tkinter.messagebox as mb
-import platform
-import psutil
+from gui_lib import (MainWindow, CustomCombobox, CustomLabel, CustomButton, CustomEntry, CustomCheckbutton,
+                     ThemeManager, CoalescedCall, FrameClock)
+
+
+def _dialogs():
+    """
+    Returns the ``tkinter.messagebox`` and ``tkinter.filedialog`` modules.
+
+    They are only needed once the user opens, saves or closes a file, so they
+    are imported on first use instead of at startup.
+    """
+    import tkinter.filedialog
+    import tkinter.messagebox
+    return tkinter.messagebox, tkinter.filedialog
+
+
+class ChunkedFileLoader:
+    """
+    Streams a file into a tk.Text widget in chunks.
+
+    Each chunk is read (optionally through mmap), decoded incrementally and
+    inserted from its own event-loop callback. The first screen shows up after
+    the first chunk, and the window stays responsive for the rest of the load.
+    """
+    # Bytes read per chunk
+    chunk_size = 256 * 1024
+    # Seconds spent inserting before yielding back to the event loop
+    slice_budget = 0.015
+
+    def __init__(self, text_widget, path, on_progress=None, on_done=None, use_mmap=False, encoding=None):
+        """
+        Initializes the loader.
+
+        Args:
+            text_widget (tk.Text): Widget the file is loaded into.
+            path (str): File to load.
+            on_progress (function, optional): Called with the fraction loaded (0.0 to 1.0).
+            on_done (function, optional): Called with None on success, or with the
+                exception that stopped the load. Not called after ``cancel``.
+            use_mmap (bool): Read through a memory map instead of file reads.
+            encoding (str, optional): Text encoding. Defaults to the locale encoding.
+        """
+        self.text_widget = text_widget
+        self.path = path
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.use_mmap = use_mmap
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        self.cancelled = False
+        self._after_id = None
+        self._chunks = None
+
+    def start(self):
+        """Clears the widget and starts loading."""
+        self._chunks = self._iter_chunks()
+        self.text_widget.config(state=NORMAL, undo=False)
+        self.text_widget.delete("1.0", END)
+        self._step()
+
+    def cancel(self):
+        """Stops loading and leaves what was loaded so far editable."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self._after_id:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+        if self._chunks:
+            self._chunks.close()
+        self._restore_widget()
+
+    def _restore_widget(self):
+        self.text_widget.config(state=NORMAL, undo=True)
+        self.text_widget.edit_reset()
+        self.text_widget.edit_modified(False)
+
+    def _iter_chunks(self):
+        """Yields ``(text, fraction_done)`` with newlines normalized to ``\n``."""
+        total = os.path.getsize(self.path)
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        pending_cr = ""
+        with open(self.path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self.use_mmap and total else None
+            try:
+                position = 0
+                while position < total:
+                    if mapped is not None:
+                        data = mapped[position:position + self.chunk_size]
+                    else:
+                        data = file.read(self.chunk_size)
+                    if not data:
+                        break
+                    position += len(data)
+                    text = pending_cr + decoder.decode(data, final=position >= total)
+                    # A \r\n pair may be split across two chunks
+                    pending_cr = ""
+                    if text.endswith("\r") and position < total:
+                        text, pending_cr = text[:-1], "\r"
+                    yield text.replace("\r\n", "\n").replace("\r", "\n"), position / total
+            finally:
+                if mapped is not None:
+                    mapped.close()
+        if pending_cr:
+            yield "\n", 1.0
+
+    def _step(self):
+        """Inserts chunks until the time slice is used up, then yields."""
+        self._after_id = None
+        deadline = time.perf_counter() + self.slice_budget
+        try:
+            while True:
+                try:
+                    text, progress = next(self._chunks)
+                except StopIteration:
+                    self._finish(None)
+                    return
+                self.text_widget.insert(END, text)
+                if self.on_progress:
+                    self.on_progress(progress)
+                if time.perf_counter() >= deadline:
+                    break
+        except Exception as e:
+            self._finish(e)
+            return
+        self._after_id = self.text_widget.after(1, self._step)
+
+    def _finish(self, error):
+        # Text always ends with a newline of its own; drop the file's final one
+        if error is None and self.text_widget.get("end-2c", "end-1c") == "\n":
+            self.text_widget.delete("end-2c", "end-1c")
+        self._restore_widget()
+        self.text_widget.mark_set(INSERT, "1.0")
+        if self.on_done:
+            self.on_done(error)
+
+
+class LineIndex:
+    """
+    Memory-mapped, read-only view of a file with a line-offset index.
+
+    The index of line start offsets is built on a worker thread; lines that
+    have already been indexed can be read while the scan is still running.
+    Only the requested lines are ever decoded.
+    """
+    # Bytes scanned between index updates
+    scan_size = 4 * 1024 * 1024
+
+    def __init__(self, path, encoding=None):
+        """
+        Initializes the line index.
+
+        Args:
+            path (str): File to index.
+            encoding (str, optional): Text encoding. Defaults to the locale encoding.
+        """
+        self.path = path
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        self.size = os.path.getsize(path)
+        self.indexed_bytes = 0
+        self.done = threading.Event()
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self._offsets = array('Q', [0])
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._build, name="line-index", daemon=True)
+
+    def start(self):
+        """Starts building the index in the background."""
+        self._thread.start()
+
+    def _build(self):
+        position = 0
+        while position < self.size and not self._closed:
+            end = min(self.size, position + self.scan_size)
+            chunk = self._map[position:end]
+            found = []
+            newline = chunk.find(b"\n")
+            while newline != -1:
+                found.append(position + newline + 1)
+                newline = chunk.find(b"\n", newline + 1)
+            with self._lock:
+                self._offsets.extend(found)
+                self.indexed_bytes = end
+            position = end
+        with self._lock:
+            # A trailing newline does not start another line
+            if len(self._offsets) > 1 and self._offsets[-1] >= self.size:
+                self._offsets.pop()
+        self.done.set()
+
+    @property
+    def progress(self):
+        """Fraction of the file indexed so far."""
+        return self.indexed_bytes / self.size if self.size else 1.0
+
+    @property
+    def line_count(self):
+        """Number of lines indexed so far."""
+        with self._lock:
+            if not self.size:
+                return 0
+            if self.done.is_set():
+                return len(self._offsets)
+            return len(self._offsets) - 1
+
+    def get_lines(self, start, count):
+        """
+        Returns ``count`` lines starting at line ``start`` as one string.
+
+        Args:
+            start (int): First line, zero-based.
+            count (int): Maximum number of lines.
+        """
+        with self._lock:
+            total = len(self._offsets) if self.done.is_set() else len(self._offsets) - 1
+            if not self.size or start >= total:
+                return ""
+            end = min(start + count, total)
+            begin_offset = self._offsets[start]
+            end_offset = self._offsets[end] if end < len(self._offsets) else self.size
+        text = self._map[begin_offset:end_offset].decode(self.encoding, errors="replace")
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text[:-1] if text.endswith("\n") else text
+
+    def close(self):
+        """Stops indexing and releases the memory map."""
+        self._closed = True
+        if self._thread.is_alive():
+            self._thread.join()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class LargeFileViewer:
+    """
+    Read-only, virtualized view of a LineIndex in a tk.Text widget.
+
+    The widget only ever holds the lines of the current viewport, so memory
+    use depends on the window size rather than on the file size. Scrolling
+    re-renders the viewport from the index.
+    """
+    # Milliseconds between checks of the background index
+    poll_interval = 200
+
+    def __init__(self, text_widget, scrollbar, index, on_status=None):
+        """
+        Initializes the viewer.
+
+        Args:
+            text_widget (tk.Text): Widget the viewport is rendered into.
+            scrollbar (ttk.Scrollbar): Vertical scrollbar driven by the viewer.
+            index (LineIndex): The indexed file.
+            on_status (function, optional): Called with a status message after each render.
+        """
+        self.text_widget = text_widget
+        self.scrollbar = scrollbar
+        self.index = index
+        self.on_status = on_status
+        self.top_line = 0
+        self._rows = 1
+        self._bindings = []
+        self._poll_id = None
+
+    def start(self):
+        """Takes over the text widget and renders the first screen."""
+        self.index.start()
+        widget = self.text_widget
+        widget.config(state=NORMAL, wrap=NONE, undo=False)
+        widget.delete("1.0", END)
+        self.scrollbar.config(command=self._on_scrollbar)
+        for sequence, handler in (
+            ("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3)),
+            ("<Button-4>", lambda e: self.scroll(-3)),
+            ("<Button-5>", lambda e: self.scroll(3)),
+            ("<Up>", lambda e: self.scroll(-1)),
+            ("<Down>", lambda e: self.scroll(1)),
+            ("<Prior>", lambda e: self.scroll(-self._rows)),
+            ("<Next>", lambda e: self.scroll(self._rows)),
+            ("<Control-Home>", lambda e: self.scroll_to(0)),
+            ("<Control-End>", lambda e: self.scroll_to(self.index.line_count)),
+            ("<Configure>", lambda e: self._on_resize()),
+        ):
+            funcid = widget.bind(sequence, lambda e, handler=handler: handler(e) or "break", add="+")
+            self._bindings.append((sequence, funcid))
+        self._on_resize()
+        self._poll()
+
+    def close(self):
+        """Gives the text widget back in an editable, empty state."""
+        if self._poll_id:
+            self.text_widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        for sequence, funcid in self._bindings:
+            self.text_widget.unbind(sequence, funcid)
+        self._bindings = []
+        self.scrollbar.config(command="")
+        self.text_widget.config(state=NORMAL, wrap=WORD, undo=True)
+        self.text_widget.delete("1.0", END)
+        self.text_widget.edit_reset()
+        self.text_widget.edit_modified(False)
+        self.index.close()
+
+    def scroll(self, lines):
+        """Scrolls by a number of lines."""
+        self.scroll_to(self.top_line + lines)
+
+    def scroll_to(self, line):
+        """Makes ``line`` the first visible line."""
+        line = max(0, min(int(line), self.index.line_count - self._rows))
+        if line != self.top_line:
+            self.top_line = line
+            self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(value) * self.index.line_count)
+        elif action == "scroll":
+            step = self._rows if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def _on_resize(self):
+        line_height = tkfont.Font(font=self.text_widget.cget("font")).metrics("linespace") or 1
+        rows = max(1, self.text_widget.winfo_height() // line_height)
+        if rows != self._rows:
+            self._rows = rows
+            self.render()
+
+    def _poll(self):
+        """Re-renders while indexing, so the viewport fills and the scrollbar grows."""
+        self._poll_id = None
+        self.render()
+        if not self.index.done.is_set():
+            self._poll_id = self.text_widget.after(self.poll_interval, self._poll)
+
+    def render(self):
+        """Replaces the widget content with the visible lines."""
+        widget = self.text_widget
+        total = self.index.line_count
+        widget.config(state=NORMAL)
+        widget.delete("1.0", END)
+        widget.insert("1.0", self.index.get_lines(self.top_line, self._rows))
+        widget.config(state=DISABLED)
+        widget.edit_modified(False)
+
+        if total:
+            self.scrollbar.set(self.top_line / total, min(1.0, (self.top_line + self._rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if self.on_status:
+            last = min(total, self.top_line + self._rows)
+            message = f"lines {self.top_line + 1 if total else 0}-{last} of {total}"
+            if not self.index.done.is_set():
+                message += f" (indexing {int(self.index.progress * 100)}%)"
+            self.on_status(message)
+
+
+class BackgroundSaver:
+    """
+    Writes text snapshots to disk on a worker thread.
+
+    Each write goes to a temporary file that atomically replaces the target.
+    A write is skipped when the content hash matches what was last written
+    to the same path. Results are posted to ``results`` for the UI to drain.
+    """
+    def __init__(self, encoding=None):
+        """
+        Initializes the saver.
+
+        Args:
+            encoding (str, optional): Text encoding. Defaults to the locale encoding.
+        """
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        self.results = queue.Queue()
+        self._jobs = queue.Queue()
+        self._digests = {}
+        self._thread = threading.Thread(target=self._run, name="background-saver", daemon=True)
+        self._thread.start()
+
+    def save(self, path, text, wait=False, remove=None, tag=None):
+        """
+        Queues a snapshot to be written.
+
+        Args:
+            path (str): Target file.
+            text (str): Snapshot of the buffer.
+            wait (bool): Block until written and return the result instead of
+                posting it to ``results``.
+            remove (str, optional): File to delete once the write succeeded.
+            tag (optional): Returned unchanged as the result's ``tag``.
+
+        Returns:
+            dict: The result when ``wait`` is True, otherwise None.
+        """
+        job = {
+            "path": path,
+            "text": text,
+            "remove": remove,
+            "tag": tag,
+            "submitted": time.perf_counter(),
+            "done": threading.Event() if wait else None,
+            "result": None,
+        }
+        self._jobs.put(job)
+        if wait:
+            job["done"].wait()
+            return job["result"]
+        return None
+
+    def stop(self):
+        """Finishes queued writes, then stops the worker."""
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            result = self._write(job)
+            if job["done"]:
+                job["result"] = result
+                job["done"].set()
+            else:
+                self.results.put(result)
+
+    def _write(self, job):
+        path = job["path"]
+        result = {"path": path, "skipped": False, "error": None, "tag": job["tag"]}
+        try:
+            text = job["text"]
+            if os.linesep != "\n":
+                text = text.replace("\n", os.linesep)
+            data = text.encode(self.encoding)
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if self._digests.get(path) == digest and os.path.exists(path):
+                result["skipped"] = True
+            else:
+                directory = os.path.dirname(os.path.abspath(path))
+                os.makedirs(directory, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(prefix=".save-", suffix=".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, "wb") as file:
+                        file.write(data)
+                        file.flush()
+                        os.fsync(file.fileno())
+                    if os.path.exists(path):
+                        shutil.copymode(path, temp_path)
+                    os.replace(temp_path, path)
+                except BaseException:
+                    os.unlink(temp_path)
+                    raise
+                self._digests[path] = digest
+            if job["remove"] and os.path.exists(job["remove"]):
+                os.remove(job["remove"])
+        except Exception as e:
+            result["error"] = e
+        result["elapsed"] = time.perf_counter() - job["submitted"]
+        return result
+
+
+class PythonLexer:
+    """
+    Line-at-a-time lexer for Python source.
+
+    The state carried from one line to the next is None, or the delimiter of
+    a triple-quoted string that is still open.
+    """
+    token_types = ("keyword", "definition", "builtin", "string", "number", "comment")
+    keywords = frozenset(keyword.kwlist)
+    builtins = frozenset(dir(builtins))
+    _token = re.compile(r"""
+        (?P<comment>\#.*)
+      | (?P<triple>[rRbBuUfF]{0,2}(?:\"\"\"|'''))
+      | (?P<string>[rRbBuUfF]{0,2}(?:"(?:\\.|[^"\\])*"?|'(?:\\.|[^'\\])*'?))
+      | (?P<number>\b(?:0[xXoObB][0-9a-fA-F_]+|\d[\d_]*\.?[\d_]*(?:[eE][+-]?\d+)?[jJ]?))
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    """, re.VERBOSE)
+
+    def lex_line(self, line, state):
+        """
+        Tokenizes one line.
+
+        Args:
+            line (str): Line text without its newline.
+            state: State at the end of the previous line.
+
+        Returns:
+            tuple: ``(tokens, state)`` where tokens are ``(type, start, end)``
+            column ranges and state is the state at the end of this line.
+        """
+        tokens = []
+        position = 0
+        if state:
+            close = line.find(state)
+            if close == -1:
+                return [("string", 0, len(line))], state
+            position = close + 3
+            tokens.append(("string", 0, position))
+
+        previous = None
+        while True:
+            match = self._token.search(line, position)
+            if not match:
+                return tokens, None
+            kind = match.lastgroup
+            start, end = match.span()
+            if kind == "triple":
+                delimiter = match.group()[-3:]
+                close = line.find(delimiter, end)
+                if close == -1:
+                    tokens.append(("string", start, len(line)))
+                    return tokens, delimiter
+                end = close + 3
+                tokens.append(("string", start, end))
+            elif kind == "name":
+                word = match.group()
+                if previous in ("def", "class"):
+                    tokens.append(("definition", start, end))
+                elif word in self.keywords:
+                    tokens.append(("keyword", start, end))
+                elif word in self.builtins:
+                    tokens.append(("builtin", start, end))
+                previous = word
+                position = end
+                continue
+            else:
+                tokens.append((kind, start, end))
+            previous = None
+            position = end
+
+
+def lexer_for_path(path):
+    """Returns a lexer for a file name, or None when it has no highlighting."""
+    if path and os.path.splitext(path)[1].lower() in (".py", ".pyw"):
+        return PythonLexer()
+    return None
+
+
+class SyntaxHighlighter:
+    """
+    Incremental, viewport-driven syntax highlighter for a tk.Text widget.
+
+    The lexer state at the end of every line is stored. An edit re-lexes
+    from its first line and stops as soon as a line past the edit ends in the
+    same state as before. Tags are only applied to lines that are visible;
+    the rest of the file is scanned for states alone. All work runs in short
+    time slices from the event loop, so typing cost does not grow with the
+    file size.
+    """
+    # Seconds of work per event-loop slice
+    slice_budget = 0.008
+    # Lines read from the widget at a time
+    batch_size = 64
+
+    def __init__(self, text_widget, command=None, lexer=None):
+        """
+        Initializes the highlighter.
+
+        Args:
+            text_widget (tk.Text): Widget to highlight.
+            command (str, optional): Tcl command of the widget, if it was renamed
+                to observe edits. Defaults to the widget path.
+            lexer (optional): Lexer with ``token_types`` and ``lex_line``.
+        """
+        self.text_widget = text_widget
+        self.command = command or text_widget._w
+        self.theme_manager = ThemeManager()
+        self.lexer = None
+        self._states = []
+        self._tagged = bytearray()
+        self._valid = 0
+        self._relex_from = None
+        self._relex_through = 0
+        self._after_id = None
+        self.set_lexer(lexer)
+
+    def _call(self, *args):
+        return self.text_widget.tk.call((self.command,) + args)
+
+    def _line_count(self):
+        return int(str(self._call("index", "end-1c")).split(".")[0])
+
+    def set_lexer(self, lexer):
+        """Switches lexers and re-highlights from scratch."""
+        if self.lexer is not None:
+            for token_type in self.lexer.token_types:
+                self._call("tag", "remove", f"syntax.{token_type}", "1.0", "end")
+        self.lexer = lexer
+        count = self._line_count() if lexer else 0
+        self._states = [None] * count
+        self._tagged = bytearray(count)
+        self._valid = 0
+        self._relex_from = None
+        self._relex_through = 0
+        if lexer:
+            self.apply_theme()
+            self._schedule()
+
+    def apply_theme(self):
+        """Colors the token tags from the current theme."""
+        if not self.lexer:
+            return
+        syntax_colors = self.theme_manager.get_syntax_colors()
+        for token_type in self.lexer.token_types:
+            self._call("tag", "configure", f"syntax.{token_type}", "-foreground", syntax_colors.get(token_type, ""))
+        self._call("tag", "raise", "sel")
+
+    def on_change(self, first_line, last_line):
+        """
+        Records an edit.
+
+        Args:
+            first_line (int): First line the edit touched.
+            last_line (int): Last line the edit touched, after the edit.
+        """
+        if not self.lexer:
+            return
+        total = self._line_count()
+        delta = total - len(self._states)
+        if delta > 0:
+            self._states[first_line:first_line] = [None] * delta
+            self._tagged[first_line:first_line] = bytes(delta)
+        elif delta < 0:
+            del self._states[first_line:first_line - delta]
+            del self._tagged[first_line:first_line - delta]
+        last_line = min(max(first_line, last_line), total)
+        for index in range(first_line - 1, last_line):
+            self._tagged[index] = 0
+
+        if self._valid >= first_line:
+            self._valid = max(first_line - 1, self._valid + delta)
+        if self._relex_from is not None and self._relex_through >= first_line:
+            self._relex_through = max(first_line, self._relex_through + delta)
+        # Edits past the scanned prefix are picked up by the scan itself
+        if first_line <= self._valid + 1:
+            if self._relex_from is None:
+                self._relex_from, self._relex_through = first_line, last_line
+            else:
+                self._relex_from = min(self._relex_from, first_line)
+                self._relex_through = max(self._relex_through, last_line)
+        self._schedule()
+
+    def on_view_changed(self, *args):
+        """Highlights lines that scrolled into view."""
+        if self.lexer:
+            self._schedule()
+
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.text_widget.after(1, self._work)
+
+    def _visible_range(self):
+        first = int(str(self._call("index", "@0,0")).split(".")[0])
+        last = int(str(self._call("index", f"@0,{self.text_widget.winfo_height()}")).split(".")[0])
+        return first, last
+
+    def _get_lines(self, first, last):
+        return str(self._call("get", f"{first}.0", f"{last}.end")).split("\n")
+
+    def _work(self):
+        """Runs one time slice: visible lines first, then edits, then the scan."""
+        self._after_id = None
+        if not self.lexer:
+            return
+        deadline = time.perf_counter() + self.slice_budget
+        total = len(self._states)
+        visible = self._visible_range()
+        ranges = {token_type: [] for token_type in self.lexer.token_types}
+        retagged = []
+
+        def lex(line, text):
+            state = self._states[line - 2] if line > 1 else None
+            tokens, state = self.lexer.lex_line(text, state)
+            if visible[0] <= line <= visible[1] and not self._tagged[line - 1]:
+                for token_type, start, end in tokens:
+                    ranges[token_type].extend((f"{line}.{start}", f"{line}.{end}"))
+                retagged.append(line)
+                self._tagged[line - 1] = 1
+            return state
+
+        # Visible lines whose starting state is already known and current
+        stale_from = self._relex_from if self._relex_from is not None else self._valid + 1
+        first, last = visible[0], min(visible[1], total, stale_from - 1)
+        if first <= last and not all(self._tagged[first - 1:last]):
+            for offset, text in enumerate(self._get_lines(first, last)):
+                line = first + offset
+                if not self._tagged[line - 1]:
+                    lex(line, text)
+
+        while time.perf_counter() < deadline:
+            if self._relex_from is not None:
+                # Re-lex an edited range until the end-of-line state converges
+                first = self._relex_from
+                last = min(total, first + self.batch_size - 1)
+                if first > total:
+                    self._relex_from = None
+                    continue
+                for offset, text in enumerate(self._get_lines(first, last)):
+                    line = first + offset
+                    known = line <= self._valid
+                    previous = self._states[line - 1]
+                    self._states[line - 1] = lex(line, text)
+                    if not known:
+                        self._valid = line
+                    elif line >= self._relex_through and previous == self._states[line - 1]:
+                        self._relex_from = None
+                        break
+                    # Later lines start from a new state, so their tags are stale
+                    if line < total and previous != self._states[line - 1]:
+                        self._tagged[line] = 0
+                else:
+                    self._relex_from = last + 1 if last < total else None
+            elif self._valid < total:
+                # Background scan for states; tags only where visible
+                first = self._valid + 1
+                last = min(total, first + self.batch_size - 1)
+                for offset, text in enumerate(self._get_lines(first, last)):
+                    self._states[first + offset - 1] = lex(first + offset, text)
+                self._valid = last
+            else:
+                break
+
+        self._flush_tags(retagged, ranges)
+        if self._relex_from is not None or self._valid < total:
+            self._schedule()
+
+    def _flush_tags(self, lines, ranges):
+        """Replaces the tags of the re-lexed lines with a few batched Tk calls."""
+        if not lines:
+            return
+        lines.sort()
+        runs = []
+        for line in lines:
+            if runs and runs[-1][1] == line - 1:
+                runs[-1][1] = line
+            else:
+                runs.append([line, line])
+        for token_type, indices in ranges.items():
+            tag = f"syntax.{token_type}"
+            for first, last in runs:
+                self._call("tag", "remove", tag, f"{first}.0", f"{last}.end")
+            if indices:
+                self._call("tag", "add", tag, *indices)
+
+
+class SearchWorker:
+    """
+    Runs regex searches and replace-all over buffer snapshots on a worker thread.
+
+    Results are posted to ``results`` as ``(generation, kind, payload)``.
+    Starting a new job or calling ``cancel`` makes older jobs stop early and
+    their remaining results get dropped.
+    """
+    # Matches posted per batch
+    batch_size = 500
+
+    def __init__(self):
+        """Initializes the worker and starts its thread."""
+        self.results = queue.Queue()
+        self._jobs = queue.Queue()
+        self._generation = 0
+        self._thread = threading.Thread(target=self._run, name="search-worker", daemon=True)
+        self._thread.start()
+
+    def find(self, text, pattern):
+        """
+        Queues a search.
+
+        Posts ``"matches"`` batches of ``(line, column, end_line, end_column)``
+        tuples in buffer order, then ``"done"`` with the total count.
+
+        Returns:
+            int: The job's generation.
+        """
+        return self._submit("find", text, pattern, None)
+
+    def replace_all(self, text, pattern, replacement):
+        """
+        Queues a replace-all; posts ``"replaced"`` with ``(new_text, count)``.
+
+        Returns:
+            int: The job's generation.
+        """
+        return self._submit("replace", text, pattern, replacement)
+
+    def cancel(self):
+        """Stops the running job."""
+        self._generation += 1
+
+    def _submit(self, kind, text, pattern, replacement):
+        self._generation += 1
+        self._jobs.put((self._generation, kind, text, pattern, replacement))
+        return self._generation
+
+    def _run(self):
+        while True:
+            generation, kind, text, pattern, replacement = self._jobs.get()
+            if generation != self._generation:
+                continue
+            try:
+                if kind == "find":
+                    self._find(generation, text, pattern)
+                else:
+                    self.results.put((generation, "replaced", pattern.subn(replacement, text)))
+            except Exception as e:
+                self.results.put((generation, "error", e))
+
+    def _find(self, generation, text, pattern):
+        line = 1
+        line_start = 0
+        scanned = 0
+        count = 0
+        batch = []
+        for match in pattern.finditer(text):
+            if generation != self._generation:
+                return
+            start, end = match.span()
+            if start == end:
+                continue
+            # Advance the line counter incrementally instead of rescanning from the top
+            newlines = text.count("\n", scanned, start)
+            if newlines:
+                line += newlines
+                line_start = text.rfind("\n", scanned, start) + 1
+            scanned = start
+            newlines = text.count("\n", start, end)
+            if newlines:
+                end_line, end_start = line + newlines, text.rfind("\n", start, end) + 1
+            else:
+                end_line, end_start = line, line_start
+            batch.append((line, start - line_start, end_line, end - end_start))
+            count += 1
+            if len(batch) >= self.batch_size:
+                self.results.put((generation, "matches", batch))
+                batch = []
+        if batch:
+            self.results.put((generation, "matches", batch))
+        self.results.put((generation, "done", count))
+
+
+class FindReplacePanel:
+    """
+    Find/replace bar for a tk.Text widget, backed by a SearchWorker.
+
+    Matches arrive in batches while the search runs. Only the matches in
+    the visible lines are tagged, and the tags are updated as the view
+    scrolls. Replace All is applied as a single undo step.
+    """
+    # Milliseconds between checks of the search worker
+    poll_interval = 50
+    # Milliseconds of typing pause before searching
+    search_delay = 200
+
+    def __init__(self, parent, text_widget):
+        """
+        Initializes the panel (hidden until ``show`` is called).
+
+        Args:
+            parent (ttk.Frame): Frame the panel is packed into.
+            text_widget (tk.Text): Widget to search.
+        """
+        self.parent = parent
+        self.text_widget = text_widget
+        self.theme_manager = ThemeManager()
+        self.worker = SearchWorker()
+        self.matches = []
+        self._match_lines = []
+        # Most lines any match spans beyond its first one
+        self._match_span = 0
+        self._generation = None
+        self._searching = False
+        self._poll_id = None
+        self._replace_snapshot = None
+        self._visible = False
+        self._search_later = CoalescedCall(text_widget, self.search, delay=self.search_delay, mode="debounce")
+        self._retag = CoalescedCall(text_widget, self._tag_visible, delay=int(1000 / FrameClock.fps))
+
+        self.frame = ttk.Frame(parent)
+        self.find_entry = CustomEntry(self.frame, width=30)
+        self.find_entry.pack(side=LEFT, padx=(5, 2), pady=5)
+        self.replace_entry = CustomEntry(self.frame, width=20)
+        self.replace_entry.pack(side=LEFT, padx=2, pady=5)
+        self.regex_check = CustomCheckbutton(self.frame, text="Regex")
+        self.regex_check.pack(side=LEFT, padx=2)
+        self.case_check = CustomCheckbutton(self.frame, text="Match case")
+        self.case_check.pack(side=LEFT, padx=2)
+        for text, command, bootstyle in (
+            ("Prev", lambda: self.find_next(backwards=True), SECONDARY),
+            ("Next", self.find_next, PRIMARY),
+            ("Replace", self.replace_current, SECONDARY),
+            ("Replace All", self.replace_all, WARNING),
+            ("Close", self.hide, SECONDARY),
+        ):
+            CustomButton(self.frame, text=text, command=command, bootstyle=bootstyle).pack(side=LEFT, padx=2)
+        self.count_label = CustomLabel(self.frame, text="")
+        self.count_label.pack(side=LEFT, padx=5)
+
+        self.find_entry.element.bind("<KeyRelease>", self._on_pattern_changed)
+        self.find_entry.element.bind("<Return>", lambda e: self.find_next())
+        self.find_entry.element.bind("<Shift-Return>", lambda e: self.find_next(backwards=True))
+        for check in (self.regex_check, self.case_check):
+            check.element.config(command=self._on_pattern_changed)
+        self.apply_theme()
+
+    def show(self, before=None):
+        """Packs the panel and focuses the search field."""
+        if not self._visible:
+            self.frame.pack(side=BOTTOM, fill=X, before=before)
+            self._visible = True
+        self.find_entry.element.focus_set()
+        self.find_entry.element.select_range(0, END)
+        if self.find_entry.get_text():
+            self.search()
+
+    def hide(self):
+        """Hides the panel and clears the match tags."""
+        if not self._visible:
+            return
+        self.frame.pack_forget()
+        self._visible = False
+        self._searching = False
+        self.worker.cancel()
+        self._set_matches([])
+        self.text_widget.focus_set()
+
+    def is_visible(self):
+        return self._visible
+
+    def apply_theme(self):
+        """Colors the match tags from the current theme."""
+        theme_colors = self.theme_manager.get_theme_colors()
+        self.text_widget.tag_configure("search.match", background=theme_colors["info"], foreground=theme_colors["background"])
+        self.text_widget.tag_configure("search.current", background=theme_colors["warning"], foreground=theme_colors["background"])
+        self.text_widget.tag_raise("search.current", "search.match")
+        self.text_widget.tag_raise("sel")
+
+    def _compile(self):
+        """Returns the compiled pattern, or None (with a message) if it is empty or invalid."""
+        text = self.find_entry.get_text()
+        if not text:
+            self.count_label.element.config(text="")
+            return None
+        flags = 0 if self.case_check.get_value() else re.IGNORECASE
+        try:
+            return re.compile(text if self.regex_check.get_value() else re.escape(text), flags | re.MULTILINE)
+        except re.error as e:
+            self.count_label.element.config(text=f"Invalid pattern: {e}")
+            return None
+
+    def _on_pattern_changed(self, event=None):
+        self._search_later()
+
+    def on_text_changed(self):
+        """Re-runs the search after the buffer changed."""
+        if self._visible and self.find_entry.get_text():
+            self._search_later()
+
+    def on_view_changed(self):
+        """Tags matches that scrolled into view."""
+        if self.matches:
+            self._retag()
+
+    def search(self):
+        """Starts a background search over a snapshot of the buffer."""
+        self._set_matches([])
+        pattern = self._compile()
+        if pattern is None:
+            self.worker.cancel()
+            return
+        self._generation = self.worker.find(self.text_widget.get("1.0", "end-1c"), pattern)
+        self._searching = True
+        self.count_label.element.config(text="Searching...")
+        if self._poll_id is None:
+            self._poll()
+
+    def _poll(self):
+        """Drains worker results for the current job."""
+        self._poll_id = None
+        got_matches = False
+        while self._searching:
+            try:
+                generation, kind, payload = self.worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation:
+                continue
+            if kind == "matches":
+                self.matches.extend(payload)
+                self._match_lines.extend(match[0] for match in payload)
+                self._match_span = max(self._match_span, max(match[2] - match[0] for match in payload))
+                got_matches = True
+            elif kind == "done":
+                self._searching = False
+                self.count_label.element.config(text=f"{payload} matches")
+            elif kind == "replaced":
+                self._searching = False
+                self._apply_replace_all(*payload)
+            elif kind == "error":
+                self._searching = False
+                self.count_label.element.config(text=f"Error: {payload}")
+        if got_matches:
+            self._retag()
+        if self._searching:
+            if got_matches:
+                self.count_label.element.config(text=f"{len(self.matches)} matches (searching...)")
+            self._poll_id = self.text_widget.after(self.poll_interval, self._poll)
+
+    def _set_matches(self, matches):
+        self.matches = matches
+        self._match_lines = [match[0] for match in matches]
+        self._match_span = max((match[2] - match[0] for match in matches), default=0)
+        self.text_widget.tag_remove("search.match", "1.0", END)
+        self.text_widget.tag_remove("search.current", "1.0", END)
+
+    def _tag_visible(self):
+        """Tags the matches of the visible lines only."""
+        first = int(self.text_widget.index("@0,0").split(".")[0])
+        last = int(self.text_widget.index(f"@0,{self.text_widget.winfo_height()}").split(".")[0])
+        # Matches are ordered by start line; one starting above the view may reach into it
+        start = bisect.bisect_left(self._match_lines, first - self._match_span)
+        end = bisect.bisect_right(self._match_lines, last)
+        indices = []
+        for line, column, end_line, end_column in self.matches[start:end]:
+            if end_line >= first:
+                indices.extend((f"{line}.{column}", f"{end_line}.{end_column}"))
+        self.text_widget.tag_remove("search.match", "1.0", END)
+        if indices:
+            self.text_widget.tag_add("search.match", *indices)
+
+    def find_next(self, backwards=False):
+        """Selects the next (or previous) match after the cursor."""
+        if not self.matches:
+            return
+        line, column = (int(part) for part in self.text_widget.index(INSERT).split("."))
+        position = bisect.bisect_left(self.matches, (line, column, 0, 0))
+        if backwards:
+            position = (position - 1) % len(self.matches)
+        else:
+            # Skip the match the cursor is sitting at
+            if position < len(self.matches) and self.matches[position][:2] == (line, column):
+                position += 1
+            position %= len(self.matches)
+        line, column, end_line, end_column = self.matches[position]
+        start, end = f"{line}.{column}", f"{end_line}.{end_column}"
+        self.text_widget.tag_remove("search.current", "1.0", END)
+        self.text_widget.tag_add("search.current", start, end)
+        self.text_widget.tag_remove(SEL, "1.0", END)
+        self.text_widget.tag_add(SEL, start, end)
+        self.text_widget.mark_set(INSERT, start)
+        self.text_widget.see(start)
+        self.count_label.element.config(text=f"{position + 1} of {len(self.matches)}")
+
+    def replace_current(self):
+        """Replaces the selected match and moves to the next one."""
+        ranges = self.text_widget.tag_ranges("search.current")
+        pattern = self._compile()
+        if not ranges or pattern is None:
+            self.find_next()
+            return
+        start, end = ranges[0], ranges[1]
+        replacement = self.replace_entry.get_text()
+        if self.regex_check.get_value():
+            # Match again in the whole buffer, so anchors and lookarounds see the surrounding text
+            text = self.text_widget.get("1.0", "end-1c")
+            offset = (self.text_widget.count("1.0", start, "chars") or (0,))[0]
+            length = (self.text_widget.count(start, end, "chars") or (0,))[0]
+            match = pattern.match(text, offset)
+            if match is None or match.end() != offset + length:
+                # The buffer changed since the search; the new results will be selected next
+                self.search()
+                return
+            try:
+                replacement = match.expand(replacement)
+            except (re.error, IndexError) as e:
+                self.count_label.element.config(text=f"Error: {e}")
+                return
+        self.text_widget.delete(start, end)
+        self.text_widget.insert(start, replacement)
+        self.text_widget.mark_set(INSERT, f"{start}+{len(replacement)}c")
+
+    def replace_all(self):
+        """Replaces every match, computed in the background, as one undo step."""
+        pattern = self._compile()
+        if pattern is None:
+            return
+        replacement = self.replace_entry.get_text()
+        if not self.regex_check.get_value():
+            replacement = replacement.replace("\\", "\\\\")
+        self._replace_snapshot = self.text_widget.get("1.0", "end-1c")
+        self._generation = self.worker.replace_all(self._replace_snapshot, pattern, replacement)
+        self._searching = True
+        self.count_label.element.config(text="Replacing...")
+        if self._poll_id is None:
+            self._poll()
+
+    def _apply_replace_all(self, new_text, count):
+        snapshot, self._replace_snapshot = self._replace_snapshot, None
+        if self.text_widget.get("1.0", "end-1c") != snapshot:
+            self.count_label.element.config(text="Text changed while replacing, try again")
+            return
+        if count:
+            insert = self.text_widget.index(INSERT)
+            self.text_widget.config(autoseparators=False)
+            try:
+                self.text_widget.edit_separator()
+                self.text_widget.delete("1.0", "end-1c")
+                self.text_widget.insert("1.0", new_text)
+                self.text_widget.edit_separator()
+            finally:
+                self.text_widget.config(autoseparators=True)
+            self.text_widget.mark_set(INSERT, insert)
+            self.text_widget.see(INSERT)
+        self._set_matches([])
+        self.count_label.element.config(text=f"Replaced {count} matches")
+
 
 class TextEditorApp(MainWindow):
+    # Read files through mmap while loading them
+    use_mmap = True
+    # Files larger than this (in bytes) are offered in the read-only viewer
+    viewer_threshold = 64 * 1024 * 1024
+    # Milliseconds between autosaves of unsaved changes
+    autosave_interval = 30000
+    # Milliseconds between checks for finished background saves
+    save_poll_interval = 100
+
     def __init__(self):
         super().__init__(title="Text Editor", theme="nordic_frost")
         self.theme_manager = ThemeManager()
         self.file_path = None
+        self._loader = None
+        self._viewer = None
+        self.saver = BackgroundSaver()
+        self._edit_generation = 0
+        self._autosaved_generation = 0
+        # Error of the last failed autosave, shown in the status bar until one succeeds
+        self._autosave_error = None
+        self._char_count = 0
         self.status_text = tk.StringVar(value="Ready")
+        # Status bar refreshes at most once per frame; counting characters waits for a pause
+        self._status_update = CoalescedCall(self, self.update_status_bar, delay=int(1000 / FrameClock.fps))
+        self._count_update = CoalescedCall(self, self._update_char_count, delay=250, mode="debounce")
         self._create_widgets()  
         self._create_menu()     
         self._bind_events()
+        self._hook_text_changes()
+        self.highlighter = SyntaxHighlighter(self.text_area, command=self._text_command)
+        self.find_panel = FindReplacePanel(self.content_frame, self.text_area)
+        self.text_area.config(yscrollcommand=self._on_view_changed)
+        self.after(self.autosave_interval, self._autosave)
+        self.after(self.save_poll_interval, self._poll_saves)
 
     def _create_menu(self):
         # Create a menu bar
@@ -30,6 +1183,7 @@ class TextEditorApp(MainWindow):
         self.menu_bar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="New", command=self._new_file, accelerator="Ctrl+N")
         file_menu.add_command(label="Open", command=self._open_file, accelerator="Ctrl+O")
+        file_menu.add_command(label="Open in Viewer (Read-Only)", command=self._open_viewer)
         file_menu.add_command(label="Save", command=self._save_file, accelerator="Ctrl+S")
         file_menu.add_command(label="Save As", command=self._save_as, accelerator="Ctrl+Shift+S")
         file_menu.add_separator()
@@ -46,6 +1200,8 @@ class TextEditorApp(MainWindow):
         edit_menu.add_command(label="Paste", command=lambda: self.text_area.event_generate("<<Paste>>"), accelerator="Ctrl+V")
         edit_menu.add_separator()
         edit_menu.add_command(label="Select All", command=lambda: self.text_area.tag_add(SEL, "1.0", END), accelerator="Ctrl+A")
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Find / Replace", command=self._show_find, accelerator="Ctrl+F")
 
     def _create_widgets(self):
         # Theme Switcher
@@ -74,6 +1230,9 @@ class TextEditorApp(MainWindow):
         self.text_area.pack(fill=BOTH, expand=True)
         self._update_text_area_style()
 
+        # Scrollbar of the large-file viewer, only packed while it is active
+        self.viewer_scrollbar = ttk.Scrollbar(self.content_frame, orient=VERTICAL)
+
         # Status Bar
         self.status_bar = CustomLabel(self.content_frame, textvariable=self.status_text, bootstyle="info.TLabel")
         self.status_bar.pack(fill=X, side=BOTTOM)
@@ -83,18 +1242,58 @@ class TextEditorApp(MainWindow):
         self.text_area.bind("<Control-o>", self._open_file)
         self.text_area.bind("<Control-s>", self._save_file)
         self.text_area.bind("<Control-Shift-s>", self._save_as)
-        self.text_area.bind("<Key>", self._on_key_press)
+        self.bind("<Escape>", self._on_escape)
+        self.bind("<Control-f>", self._show_find)
+        self.bind("<Control-h>", self._show_find)
+        self.text_area.bind("<KeyRelease>", self._on_key_press)
+        self.text_area.bind("<ButtonRelease-1>", self._on_key_press)
+        self.text_area.bind("<<Modified>>", self._on_modified, add="+")
 
     def _on_key_press(self, event=None):
-        self.update_status_bar()
+        # Cursor moves do not change the text, so they are not seen by the change hook
+        self._status_update()
+
+    def _hook_text_changes(self):
+        """Routes the text widget's Tcl command through Python to observe every edit."""
+        widget = self.text_area._w
+        self._text_command = widget + "_orig"
+        self.tk.call("rename", widget, self._text_command)
+        self.tk.createcommand(widget, self._text_proxy)
+
+    def _text_proxy(self, *args):
+        """Forwards a widget command and reports inserts, deletes and replaces."""
+        operation = args[0] if args else None
+        if operation not in ("insert", "delete", "replace"):
+            return self.tk.call((self._text_command,) + args)
+        first_line = int(str(self.tk.call(self._text_command, "index", args[1])).split(".")[0])
+        result = self.tk.call((self._text_command,) + args)
+        # Inserted text comes as (chars, tags) pairs after the index arguments
+        inserted = args[2::2] if operation == "insert" else args[3::2] if operation == "replace" else ()
+        last_line = first_line + sum(str(chars).count("\n") for chars in inserted)
+        self._on_text_changed(first_line, last_line)
+        return result
+
+    def _on_text_changed(self, first_line, last_line):
+        """Called after every edit with the range of lines it touched."""
+        self._edit_generation += 1
+        self.highlighter.on_change(first_line, last_line)
+        self.find_panel.on_text_changed()
+        self._status_update()
+        self._count_update()
 
     def _new_file(self, event=None):
         if self._check_unsaved_changes():
+            self._cancel_load()
+            self._close_viewer()
+            self.highlighter.set_lexer(None)
             self.text_area.delete("1.0", END)
+            self._mark_clean()
             self.file_path = None
             self.title("Text Editor")
+            self.update_status_bar()
 
     def _open_file(self, event=None):
+        mb, fd = _dialogs()
         if not self._check_unsaved_changes():
             return
 
@@ -103,52 +1302,235 @@ class TextEditorApp(MainWindow):
             filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
         )
         if filepath:
-            try:
-                with open(filepath, "r") as file:
-                    self.text_area.delete("1.0", END)
-                    self.text_area.insert("1.0", file.read())
-                self.file_path = filepath
-                self.title(f"Text Editor - {filepath}")
+            if os.path.getsize(filepath) > self.viewer_threshold and mb.askyesno(
+                    "Large File", "This file is very large. Open it read-only in the viewer?"):
+                self._view_file(filepath)
+            else:
+                self._load_file(filepath)
+
+    def _open_viewer(self, event=None):
+        _, fd = _dialogs()
+        if not self._check_unsaved_changes():
+            return
+
+        filepath = fd.askopenfilename(filetypes=[("Text Files", "*.txt"), ("Log Files", "*.log"), ("All Files", "*.*")])
+        if filepath:
+            self._view_file(filepath)
+
+    def _view_file(self, filepath):
+        """Opens a file read-only, rendering only the visible lines."""
+        mb, _ = _dialogs()
+        self._cancel_load()
+        self._close_viewer()
+        file_name = os.path.basename(filepath)
+        try:
+            index = LineIndex(filepath)
+        except Exception as e:
+            mb.showerror("Error", f"Failed to open file: {e}")
+            return
+        self.highlighter.set_lexer(None)
+        self.find_panel.hide()
+        self.file_path = filepath
+        self.title(f"Text Editor - {filepath} (read-only)")
+        self.viewer_scrollbar.pack(side=RIGHT, fill=Y, before=self.text_area)
+        self._viewer = LargeFileViewer(
+            self.text_area,
+            self.viewer_scrollbar,
+            index,
+            on_status=lambda message: self.status_text.set(f"{file_name} (read-only): {message}")
+        )
+        self._viewer.start()
+
+    def _close_viewer(self):
+        """Leaves viewer mode and returns to normal editing."""
+        if self._viewer:
+            self._viewer.close()
+            self._viewer = None
+            # Rendering the viewport went through the edit hook; the emptied buffer is clean
+            self._mark_clean()
+            self.viewer_scrollbar.pack_forget()
+            self.file_path = None
+            self.title("Text Editor")
+
+    def _load_file(self, filepath):
+        """Streams a file into the text area, showing progress in the status bar."""
+        mb, _ = _dialogs()
+        self._cancel_load()
+        self._close_viewer()
+        self.highlighter.set_lexer(None)
+        file_name = os.path.basename(filepath)
+
+        def on_progress(fraction):
+            self.status_text.set(f"Loading {file_name}... {int(fraction * 100)}% (Esc to cancel)")
+
+        def on_done(error):
+            self._loader = None
+            if error:
+                mb.showerror("Error", f"Failed to open file: {error}")
                 self.update_status_bar()
-            except Exception as e:
-                mb.showerror("Error", f"Failed to open file: {e}")
+                return
+            self._mark_clean()
+            self.file_path = filepath
+            self.title(f"Text Editor - {filepath}")
+            self.highlighter.set_lexer(lexer_for_path(filepath))
+            self.update_status_bar()
 
-    def _save_file(self, event=None):
+        self._loader = ChunkedFileLoader(
+            self.text_area,
+            filepath,
+            on_progress=on_progress,
+            on_done=on_done,
+            use_mmap=self.use_mmap
+        )
+        try:
+            self._loader.start()
+        except Exception as e:
+            self._loader = None
+            mb.showerror("Error", f"Failed to open file: {e}")
+
+    def _on_view_changed(self, *args):
+        self.highlighter.on_view_changed()
+        self.find_panel.on_view_changed()
+
+    def _show_find(self, event=None):
+        if not self._viewer:
+            self.find_panel.show(before=self.text_area)
+        return "break"
+
+    def _on_escape(self, event=None):
+        if self._loader:
+            self._cancel_load()
+        else:
+            self.find_panel.hide()
+
+    def _cancel_load(self, event=None):
+        """Stops a file load in progress."""
+        if self._loader:
+            self._loader.cancel()
+            self._loader = None
+            self._mark_clean()
+            self.file_path = None
+            self.title("Text Editor")
+            self.status_text.set("Loading cancelled")
+
+    def _on_modified(self, event=None):
+        """Refreshes the unsaved-changes marker."""
+        self._status_update()
+
+    def _mark_clean(self):
+        """Marks the buffer as matching what is on disk."""
+        self.text_area.edit_modified(False)
+        self._autosaved_generation = self._edit_generation
+
+    def _autosave_path(self):
+        """Returns the recovery file for the current buffer."""
         if self.file_path:
+            directory, name = os.path.split(self.file_path)
+            return os.path.join(directory, f".{name}.autosave")
+        return os.path.join(os.path.dirname(self.settings.path), "autosave", "untitled.txt")
+
+    def _autosave(self):
+        """Snapshots the buffer to its recovery file when it changed since the last autosave."""
+        if not self._viewer and not self._loader and self._edit_generation != self._autosaved_generation:
+            self._autosaved_generation = self._edit_generation
+            self.saver.save(self._autosave_path(), self.text_area.get("1.0", END),
+                            tag=("autosave", self._edit_generation))
+        self.after(self.autosave_interval, self._autosave)
+
+    def _poll_saves(self):
+        """Reports finished background saves in the status bar."""
+        while True:
             try:
-                with open(self.file_path, "w") as file:
-                    file.write(self.text_area.get("1.0", END))
-                self.update_status_bar()
-                return True
-            except Exception as e:
-                mb.showerror("Error", f"Failed to save file: {e}")
+                result = self.saver.results.get_nowait()
+            except queue.Empty:
+                break
+            self._report_save(result)
+        self.after(self.save_poll_interval, self._poll_saves)
+
+    def _report_save(self, result):
+        """
+        Shows the outcome of a save and updates the clean state.
+
+        The buffer is only marked clean once the write of a snapshot has
+        succeeded and no edit was made since the snapshot was taken. Failed
+        saves show an error dialog; failed autosaves are only noted in the
+        status bar, once, since every later tick retries them.
+
+        Returns:
+            bool: Whether the write succeeded.
+        """
+        mb, _ = _dialogs()
+        file_name = os.path.basename(result["path"])
+        kind, generation = result["tag"] or (None, None)
+        if result["error"]:
+            if kind != "autosave":
+                mb.showerror("Error", f"Failed to save file: {result['error']}")
                 return False
+            # Let the next autosave tick retry a failed recovery write
+            if self._autosaved_generation == generation:
+                self._autosaved_generation = -1
+            if self._autosave_error is None:
+                self._autosave_error = result["error"]
+                self.update_status_bar()
+            return False
+        self._autosave_error = None
+        if kind == "file" and generation == self._edit_generation:
+            self._mark_clean()
+        if result["skipped"]:
+            self.status_text.set(f"{file_name}: no changes to save")
+        elif kind == "autosave":
+            self.status_text.set(f"Autosaved in {result['elapsed'] * 1000:.0f} ms")
+        else:
+            self.status_text.set(f"Saved {file_name} in {result['elapsed'] * 1000:.0f} ms")
+        return True
+
+    def _write_file(self, filepath, wait=False, autosave_path=None):
+        """
+        Snapshots the buffer and writes it in the background, dropping its recovery file.
+
+        The buffer stays modified until ``_report_save`` sees the write succeed.
+        """
+        snapshot = self.text_area.get("1.0", END)
+        result = self.saver.save(filepath, snapshot, wait=wait, remove=autosave_path or self._autosave_path(),
+                                 tag=("file", self._edit_generation))
+        if wait:
+            return self._report_save(result)
+        return True
+
+    def _save_file(self, event=None, wait=False):
+        mb, _ = _dialogs()
+        if self._viewer:
+            mb.showinfo("Read-Only", "Files opened in the viewer cannot be saved.")
+            return False
+        if self.file_path:
+            return self._write_file(self.file_path, wait=wait)
         else:
-            return self._save_as()
+            return self._save_as(wait=wait)
 
-    def _save_as(self, event=None):
+    def _save_as(self, event=None, wait=False):
+        mb, fd = _dialogs()
+        if self._viewer:
+            mb.showinfo("Read-Only", "Files opened in the viewer cannot be saved.")
+            return False
         filepath = fd.asksaveasfilename(
             defaultextension=".txt",
             filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
         )
         if filepath:
-            try:
-                with open(filepath, "w") as file:
-                    file.write(self.text_area.get("1.0", END))
-                self.file_path = filepath
-                self.title(f"Text Editor - {filepath}")
-                self.update_status_bar()
-                return True
-            except Exception as e:
-                mb.showerror("Error", f"Failed to save file: {e}")
-                return False
+            previous_autosave = self._autosave_path()
+            self.file_path = filepath
+            self.title(f"Text Editor - {filepath}")
+            if type(self.highlighter.lexer) is not type(lexer_for_path(filepath)):
+                self.highlighter.set_lexer(lexer_for_path(filepath))
+            return self._write_file(filepath, wait=wait, autosave_path=previous_autosave)
         return False
 
     def _check_unsaved_changes(self):
+        mb, _ = _dialogs()
         if self.text_area.edit_modified():
             response = mb.askyesnocancel("Unsaved Changes", "Do you want to save changes before closing?")
             if response is True:
-                return self._save_file()
+                return self._save_file(wait=True)
             elif response is False:
                 return True
             else:
@@ -159,6 +1541,8 @@ class TextEditorApp(MainWindow):
         selected_theme = self.theme_combobox.get_value()
         self.theme_manager.set_theme(selected_theme)
         self._update_text_area_style()
+        self.highlighter.apply_theme()
+        self.find_panel.apply_theme()
         self.update_ui()
 
     def _update_text_area_style(self):
@@ -175,15 +1559,32 @@ class TextEditorApp(MainWindow):
             highlightbackground=theme_colors["secondary"]
         )
 
+    def _update_char_count(self):
+        self._char_count = (self.text_area.count("1.0", "end-1c", "chars") or (0,))[0]
+        self._status_update()
+
     def update_status_bar(self):
+        if self._viewer or self._loader:
+            return  # The viewer and the loader keep their own status up to date
         if self.file_path:
             file_name = os.path.basename(self.file_path)
-            if self.text_area.edit_modified():
-                file_name = "*" + file_name
-            self.status_text.set(file_name)
         else:
-            self.status_text.set("New File")
-        self.text_area.edit_modified(False)
+            file_name = "New File"
+        if self.text_area.edit_modified():
+            file_name = "*" + file_name
+        line, column = self.text_area.index(INSERT).split(".")
+        status = f"{file_name}    Ln {line}, Col {int(column) + 1}    {self._char_count} chars"
+        if self._autosave_error is not None:
+            status += f"    Autosave failed: {self._autosave_error}"
+        self.status_text.set(status)
+
+    def _on_close(self):
+        if not self._check_unsaved_changes():
+            return
+        self._cancel_load()
+        self._close_viewer()
+        self.saver.stop()
+        super()._on_close()
 
 if __name__ == "__main__":
     app = TextEditorApp()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "sample_use"))
+
+import gui_lib
+
+
+@pytest.fixture
+def settings_path(tmp_path, monkeypatch):
+    """Points SettingsStore at a temporary file and gives each test a fresh store."""
+    path = tmp_path / "settings.json"
+    monkeypatch.setenv("EASY_GUI_SETTINGS", str(path))
+    # The legacy fallback file is looked up in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(gui_lib.SettingsStore, "_instance", None)
+    yield path
+    store = gui_lib.SettingsStore._instance
+    if store is not None:
+        store.close()
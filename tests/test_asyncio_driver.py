@@ -0,0 +1,102 @@
+import asyncio
+import socket
+import threading
+import time
+import tkinter
+
+import pytest
+
+from gui_lib import _AsyncioDriver
+
+pytestmark = pytest.mark.skipif(not hasattr(tkinter.Tcl().tk, "createfilehandler"),
+                                reason="Tk file handlers are POSIX only")
+
+
+@pytest.fixture
+def interp():
+    # A Tcl interpreter runs Tk's event loop and timers without a display
+    return tkinter.Tcl()
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    if not loop.is_closed():
+        loop.close()
+
+
+@pytest.fixture
+def driver(interp, loop):
+    driver = _AsyncioDriver(interp, loop, 0.032)
+    yield driver
+    if not loop.is_closed():
+        driver.close()
+
+
+def pump(interp, condition, timeout=2.0):
+    """Runs Tk events until ``condition()`` holds or ``timeout`` seconds passed."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        interp.tk.dooneevent(tkinter._tkinter.DONT_WAIT)
+        time.sleep(0.0005)
+    return condition()
+
+
+def timers(interp):
+    return interp.tk.splitlist(interp.tk.call("after", "info"))
+
+
+def test_idle_loop_schedules_nothing(interp, driver):
+    pump(interp, lambda: False, 0.05)
+    assert timers(interp) == ()
+
+
+def test_timer_without_a_task(interp, loop, driver):
+    fired = []
+    loop.call_soon_threadsafe(loop.call_later, 0.02, fired.append, True)
+    assert pump(interp, lambda: fired)
+    assert not asyncio.all_tasks(loop)
+    assert timers(interp) == ()
+
+
+def test_reader_without_a_task(interp, loop, driver):
+    left, right = socket.socketpair()
+    left.setblocking(False)
+    received = []
+    loop.call_soon_threadsafe(loop.add_reader, left, lambda: received.append(left.recv(16)))
+    pump(interp, lambda: False, 0.02)
+    threading.Timer(0.02, right.send, (b"ping",)).start()
+    try:
+        assert pump(interp, lambda: received)
+        assert received == [b"ping"]
+    finally:
+        loop.remove_reader(left)
+        left.close()
+        right.close()
+
+
+def test_waiting_task_only_arms_its_own_timer(interp, loop, driver):
+    async def wait():
+        await asyncio.sleep(100)
+
+    task = loop.create_task(wait())
+    driver.wake()
+    pump(interp, lambda: False, 0.05)
+    assert len(timers(interp)) == 1
+    driver.close()
+    assert task.cancelled()
+    assert loop.is_closed()
+    assert timers(interp) == ()
+
+
+def test_coroutine_result_is_not_delayed_by_polling(interp, loop, driver):
+    async def sleep():
+        start = time.monotonic()
+        await asyncio.sleep(0.01)
+        return time.monotonic() - start
+
+    task = loop.create_task(sleep())
+    driver.wake()
+    assert pump(interp, task.done)
+    assert task.result() < 0.01 + 0.02
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from text_editor import BackgroundSaver
+
+
+@pytest.fixture
+def saver():
+    saver = BackgroundSaver(encoding="utf-8")
+    yield saver
+    saver.stop()
+
+
+def test_writes_and_returns_the_tag(tmp_path, saver):
+    path = tmp_path / "out.txt"
+    result = saver.save(str(path), "one\ntwo", wait=True, tag=("file", 3))
+    assert result["error"] is None
+    assert not result["skipped"]
+    assert result["tag"] == ("file", 3)
+    assert path.read_text(encoding="utf-8") == "one\ntwo".replace("\n", os.linesep)
+    assert sorted(os.listdir(tmp_path)) == ["out.txt"]
+
+
+def test_unchanged_content_is_skipped(tmp_path, saver):
+    path = str(tmp_path / "out.txt")
+    saver.save(path, "same", wait=True)
+    assert saver.save(path, "same", wait=True)["skipped"]
+    assert not saver.save(path, "changed", wait=True)["skipped"]
+
+
+def test_deleted_target_is_written_again(tmp_path, saver):
+    path = tmp_path / "out.txt"
+    saver.save(str(path), "text", wait=True)
+    path.unlink()
+    assert not saver.save(str(path), "text", wait=True)["skipped"]
+    assert path.exists()
+
+
+def test_removes_the_given_file_after_writing(tmp_path, saver):
+    autosave = tmp_path / "autosave.txt"
+    autosave.write_text("draft")
+    saver.save(str(tmp_path / "out.txt"), "final", wait=True, remove=str(autosave))
+    assert not autosave.exists()
+
+
+def test_failed_write_keeps_the_original(tmp_path, saver):
+    target = tmp_path / "target"
+    target.mkdir()
+    result = saver.save(str(target), "text", wait=True)
+    assert isinstance(result["error"], OSError)
+    assert target.is_dir()
+    assert sorted(os.listdir(tmp_path)) == ["target"]
+
+
+def test_results_are_posted_in_order(tmp_path, saver):
+    for number in range(3):
+        saver.save(str(tmp_path / f"{number}.txt"), str(number), tag=number)
+    results = [saver.results.get(timeout=5) for _ in range(3)]
+    assert [result["tag"] for result in results] == [0, 1, 2]
+    assert all(result["error"] is None for result in results)
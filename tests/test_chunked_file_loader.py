@@ -0,0 +1,37 @@
+import pytest
+
+from text_editor import ChunkedFileLoader
+
+
+def read_chunks(tmp_path, data, chunk_size, use_mmap=False, encoding="utf-8"):
+    path = tmp_path / "file.txt"
+    path.write_bytes(data)
+    loader = ChunkedFileLoader(None, str(path), use_mmap=use_mmap, encoding=encoding)
+    loader.chunk_size = chunk_size
+    return list(loader._iter_chunks())
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test_joined_chunks_match_the_normalized_file(tmp_path, use_mmap, chunk_size):
+    text = "héllo\r\nwörld\rmac\nunix\r\n€ end\r"
+    chunks = read_chunks(tmp_path, text.encode("utf-8"), chunk_size, use_mmap)
+    assert "".join(chunk for chunk, _ in chunks) == "héllo\nwörld\nmac\nunix\n€ end\n"
+    assert all("\r" not in chunk for chunk, _ in chunks)
+
+
+def test_progress_reaches_one(tmp_path):
+    chunks = read_chunks(tmp_path, b"x" * 10, 3)
+    progress = [fraction for _, fraction in chunks]
+    assert progress == sorted(progress)
+    assert progress[-1] == 1.0
+
+
+def test_empty_file(tmp_path):
+    assert read_chunks(tmp_path, b"", 4) == []
+    assert read_chunks(tmp_path, b"", 4, use_mmap=True) == []
+
+
+def test_invalid_bytes_raise(tmp_path):
+    with pytest.raises(UnicodeDecodeError):
+        read_chunks(tmp_path, b"ok\xff", 2)
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from gui_lib import ColorEngine
+
+
+def reference_scale(color, factor):
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"#{min(255, int(r * factor)):02x}{min(255, int(g * factor)):02x}{min(255, int(b * factor)):02x}"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    ColorEngine.clear()
+    yield
+    ColorEngine.clear()
+
+
+def test_parse_and_format():
+    assert ColorEngine.parse("#1a2B3c") == 0x1A2B3C
+    assert ColorEngine.parse("#abc") == 0xAABBCC
+    assert ColorEngine.format(0x0A0B0C) == "#0a0b0c"
+
+
+@pytest.mark.parametrize("color", ["1a2b3c", "#12345", "#1a2b3c80", None, "red"])
+def test_parse_rejects_non_hex(color):
+    with pytest.raises(ValueError):
+        ColorEngine.parse(color)
+
+
+def test_scale_matches_per_channel_reference():
+    rng = random.Random(1)
+    for _ in range(2000):
+        color = "#%06x" % rng.getrandbits(24)
+        factor = rng.choice([0.5, 0.9, 1.1, 1.25, 3.0])
+        assert ColorEngine.scale_color(color, factor) == reference_scale(color, factor)
+
+
+def test_scale_covers_every_hex_role_and_skips_the_rest():
+    colors = {"primary": "#102030", "background": "#000000", "font": "Helvetica"}
+    assert dict(ColorEngine.scale(colors, 2)) == {"primary": "#204060", "background": "#000000"}
+
+
+def test_blend_is_opaque_and_uses_the_background():
+    colors = {"foreground": "#ffffff", "background": "#000000"}
+    assert ColorEngine.blend(colors, 0.5)["foreground"] == "#808080"
+    assert ColorEngine.blend(colors, 1.0)["foreground"] == "#ffffff"
+    assert ColorEngine.blend(colors, 0.0)["foreground"] == "#000000"
+    assert ColorEngine.blend_color("#ff0000", "#0000ff", 0.3) == "#4d00b3"
+
+
+def test_results_are_memoized_per_palette_and_factor():
+    colors = {"primary": "#102030"}
+    first = ColorEngine.scale(colors, 1.1)
+    assert ColorEngine.scale(dict(colors), 1.1) is first
+    assert ColorEngine.scale(colors, 0.9) is not first
+
+
+def test_edited_palette_is_parsed_again():
+    colors = {"primary": "#102030"}
+    ColorEngine.scale(colors, 2)
+    colors["primary"] = "#010101"
+    assert ColorEngine.scale(colors, 2)["primary"] == "#020202"
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(ColorEngine, "cache_size", 8)
+    for value in range(50):
+        ColorEngine.scale_color("#%06x" % value, 1.5)
+    assert len(ColorEngine._cache) <= 8
+
+
+def test_ramp():
+    colors = {"info": "#404040"}
+    assert ColorEngine.ramp(colors, "info", (0.5, 1.0, 2.0)) == ("#202020", "#404040", "#808080")
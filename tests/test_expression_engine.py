@@ -0,0 +1,100 @@
+from fractions import Fraction
+
+import pytest
+
+from simple_calculator import ExpressionEngine, ExpressionError
+
+
+def evaluate(text):
+    engine = ExpressionEngine()
+    engine.set_text(text)
+    return engine.evaluate()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1+2", 3),
+    ("2+3*4", 14),
+    ("(2+3)*4-6/3", 18),
+    ("-3+5", 2),
+    ("2*-3", -6),
+    ("((1))", 1),
+    ("7/2", Fraction(7, 2)),
+    ("0.1+0.2", Fraction(3, 10)),
+])
+def test_evaluate(text, expected):
+    assert evaluate(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "1/0", "2*(3", "1+", "(1))"])
+def test_invalid_expressions_raise(text):
+    with pytest.raises(ExpressionError):
+        evaluate(text)
+
+
+def test_rejects_non_arithmetic_input():
+    engine = ExpressionEngine()
+    with pytest.raises(ExpressionError):
+        engine.set_text("__import__('os')")
+
+
+def test_second_decimal_point_is_rejected():
+    engine = ExpressionEngine()
+    engine.set_text("1.5")
+    with pytest.raises(ExpressionError):
+        engine.push(".")
+    assert engine.text == "1.5"
+
+
+def test_nesting_limit():
+    depth = ExpressionEngine.max_depth + 1
+    with pytest.raises(ExpressionError):
+        evaluate("(" * depth + "1" + ")" * depth)
+
+
+def test_repeated_subexpressions_share_nodes():
+    engine = ExpressionEngine()
+    engine.set_text("(1+2)*(1+2)")
+    assert engine.evaluate() == 9
+    # 1, 2, 1+2 and the product
+    assert len(engine._values) == 4
+
+
+@pytest.mark.parametrize("value, text", [
+    (Fraction(6), "6"),
+    (Fraction(7, 2), "3.5"),
+    (Fraction(-1, 4), "-0.25"),
+    (Fraction(1, 3), "0." + "3" * ExpressionEngine.precision),
+])
+def test_format(value, text):
+    assert ExpressionEngine().format(value) == text
+
+
+def test_result_stays_exact_for_the_next_operation():
+    engine = ExpressionEngine()
+    engine.set_text("1/3")
+    engine.set_value(engine.evaluate())
+    assert engine.text == "0." + "3" * ExpressionEngine.precision
+    for char in "*3":
+        engine.push(char)
+    assert engine.evaluate() == 1
+
+
+def test_negative_result_as_operand():
+    engine = ExpressionEngine()
+    engine.set_text("1-4/3")
+    engine.set_value(engine.evaluate())
+    assert engine.text.startswith("-0.333")
+    for char in "*-3":
+        engine.push(char)
+    assert engine.evaluate() == 1
+
+
+def test_typing_digits_after_a_result_edits_the_shown_number():
+    engine = ExpressionEngine()
+    engine.set_text("6/4")
+    engine.set_value(engine.evaluate())
+    engine.push("5")
+    assert engine.text == "1.55"
+    assert engine.evaluate() == Fraction(155, 100)
+    with pytest.raises(ExpressionError):
+        engine.push(".")
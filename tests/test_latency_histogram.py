@@ -0,0 +1,37 @@
+from gui_lib import LatencyHistogram
+
+
+def test_empty():
+    histogram = LatencyHistogram()
+    assert histogram.summary() == {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+
+
+def test_buckets_are_inclusive_upper_bounds():
+    histogram = LatencyHistogram()
+    for value in (0.5, 1, 1.5, 2, 5000):
+        histogram.add(value)
+    buckets = dict(histogram.buckets())
+    assert buckets[1] == 2
+    assert buckets[2] == 2
+    assert buckets[float("inf")] == 1
+    assert sum(buckets.values()) == histogram.count == 5
+
+
+def test_summary():
+    histogram = LatencyHistogram()
+    for _ in range(99):
+        histogram.add(3)
+    histogram.add(100)
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["mean"] == (99 * 3 + 100) / 100
+    assert summary["p50"] == 4
+    assert summary["p99"] == 4
+    assert summary["max"] == 100
+    assert histogram.percentile(100) == 100
+
+
+def test_percentile_never_exceeds_the_max():
+    histogram = LatencyHistogram()
+    histogram.add(5)
+    assert histogram.percentile(50) == 5
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from gui_lib import Layout
+
+
+@pytest.fixture(autouse=True)
+def layout_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(Layout, "cache_dir", str(tmp_path / "layouts"))
+    monkeypatch.setattr(Layout, "_plans", {})
+    return tmp_path / "layouts"
+
+
+SPEC = {
+    "type": "frame", "pack": {"fill": "both"},
+    "columnconfigure": {"1": {"weight": 1}, "0": {"weight": 2}},
+    "children": [
+        {"type": "label", "name": "title", "text": "Hello", "grid": {"row": 0, "column": 0}},
+        {"type": "frame", "name": "row", "children": [
+            {"type": "button", "text": "OK", "command": ["accept", 1], "pack": {}},
+        ]},
+        {"type": "entry", "command": "changed"},
+    ],
+}
+
+
+def test_compile_flattens_in_creation_order():
+    steps = Layout.compile(SPEC)
+    assert [(step["type"], step["parent"], step["name"]) for step in steps] == [
+        ("frame", -1, None),
+        ("label", 0, "title"),
+        ("frame", 0, "row"),
+        ("button", 2, None),
+        ("entry", 0, None),
+    ]
+    assert steps[0]["columns"] == [[0, {"weight": 2}], [1, {"weight": 1}]]
+    assert steps[0]["rows"] == []
+    assert steps[1]["options"] == {"text": "Hello"}
+    assert steps[1]["geometry"] == ["grid", {"row": 0, "column": 0}]
+    assert steps[3]["command"] == ["accept", 1]
+    assert steps[4]["command"] == ["changed"]
+    assert steps[4]["geometry"] is None
+    assert Layout._valid_steps(steps)
+
+
+def test_compile_handles_deep_specs():
+    spec = node = {"type": "frame"}
+    for _ in range(5000):
+        child = {"type": "frame"}
+        node["children"] = [child]
+        node = child
+    steps = Layout.compile(spec)
+    assert len(steps) == 5001
+    assert steps[-1]["parent"] == 4999
+
+
+@pytest.mark.parametrize("spec", [
+    [],
+    {"type": "window"},
+    {"type": "frame", "children": [{"type": "label", "name": "a"}, {"type": "label", "name": "a"}]},
+    {"type": "label", "pack": {}, "grid": {}},
+    {"type": "label", "pack": "top"},
+    {"type": "button", "command": 3},
+    {"type": "button", "command": []},
+    {"type": "label", "children": [{"type": "label"}]},
+    {"type": "frame", "rowconfigure": {"x": {}}},
+    {"type": "frame", "children": {"type": "label"}},
+])
+def test_compile_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        Layout.compile(spec)
+
+
+def test_plans_are_cached_in_memory_and_on_disk(layout_cache):
+    layout = Layout.from_spec(SPEC)
+    assert Layout.from_spec(json.loads(json.dumps(SPEC))) is layout
+    cache_file = layout_cache / f"{layout.digest}.json"
+    assert json.loads(cache_file.read_text())["steps"] == layout.steps
+
+    Layout._plans.clear()
+    assert Layout.from_spec(SPEC).steps == layout.steps
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda text: text[:len(text) // 2],
+    lambda text: text.replace('"parent":0', '"parent":1', 1),
+    lambda text: text.replace('"type":"label"', '"type":"window"'),
+    lambda text: json.dumps({"version": Layout.plan_version, "steps": []}),
+])
+def test_damaged_cache_files_are_recompiled(layout_cache, corrupt):
+    digest = Layout.from_spec(SPEC).digest
+    cache_file = layout_cache / f"{digest}.json"
+    cache_file.write_text(corrupt(cache_file.read_text()))
+    Layout._plans.clear()
+    assert Layout.from_spec(SPEC).steps == Layout.compile(SPEC)
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(SPEC))
+    assert Layout.from_file(str(path)).steps == Layout.compile(SPEC)
+
+
+def test_invalid_spec_is_not_cached(layout_cache):
+    with pytest.raises(ValueError):
+        Layout.from_spec({"type": "window"})
+    assert not Layout._plans
+    assert not os.path.exists(layout_cache) or not os.listdir(layout_cache)
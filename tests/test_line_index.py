@@ -0,0 +1,53 @@
+import pytest
+
+from text_editor import LineIndex
+
+
+def open_index(tmp_path, content, **kwargs):
+    path = tmp_path / "file.txt"
+    path.write_bytes(content)
+    index = LineIndex(str(path), encoding="utf-8")
+    for name, value in kwargs.items():
+        setattr(index, name, value)
+    index.start()
+    assert index.done.wait(5)
+    return index
+
+
+@pytest.mark.parametrize("content, lines", [
+    (b"", []),
+    (b"one", ["one"]),
+    (b"one\n", ["one"]),
+    (b"one\ntwo\n\nfour", ["one", "two", "", "four"]),
+    (b"a\r\nb\r\n", ["a", "b"]),
+])
+def test_lines(tmp_path, content, lines):
+    index = open_index(tmp_path, content)
+    try:
+        assert index.line_count == len(lines)
+        assert index.get_lines(0, len(lines) + 5) == "\n".join(lines)
+        for number, line in enumerate(lines):
+            assert index.get_lines(number, 1) == line
+        assert index.get_lines(len(lines), 1) == ""
+        assert index.progress == 1.0
+    finally:
+        index.close()
+
+
+def test_lines_spanning_scan_chunks(tmp_path):
+    lines = [f"line {number} " + "x" * (number % 7) for number in range(1000)]
+    index = open_index(tmp_path, "\n".join(lines).encode(), scan_size=64)
+    try:
+        assert index.line_count == len(lines)
+        assert index.get_lines(0, len(lines)) == "\n".join(lines)
+        assert index.get_lines(500, 3) == "\n".join(lines[500:503])
+    finally:
+        index.close()
+
+
+def test_decodes_with_the_given_encoding(tmp_path):
+    index = open_index(tmp_path, "héllo\nwörld\n".encode("utf-8"))
+    try:
+        assert index.get_lines(1, 1) == "wörld"
+    finally:
+        index.close()
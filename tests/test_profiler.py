@@ -0,0 +1,75 @@
+import json
+import threading
+
+import pytest
+
+from gui_lib import Profiler, profiled
+
+
+@pytest.fixture(autouse=True)
+def profiler():
+    Profiler.reset()
+    Profiler.enable()
+    yield Profiler
+    Profiler.disable()
+    Profiler.reset()
+
+
+def test_spans_are_recorded_while_enabled():
+    with Profiler.span("load"):
+        pass
+    Profiler.disable()
+    with Profiler.span("load"):
+        pass
+    assert Profiler.stats()["load"]["count"] == 1
+
+
+def test_record_feeds_the_histogram():
+    Profiler.record("work", 10.0, 10.003)
+    stats = Profiler.stats()["work"]
+    assert stats["count"] == 1
+    assert stats["max"] == pytest.approx(3.0)
+
+
+def test_profiled_times_calls_and_keeps_exceptions():
+    @profiled("double")
+    def double(value):
+        if value is None:
+            raise ValueError("no value")
+        return value * 2
+
+    assert double(2) == 4
+    with pytest.raises(ValueError):
+        double(None)
+    assert double.__name__ == "double"
+    assert Profiler.stats()["double"]["count"] == 2
+
+
+def test_export_json(tmp_path):
+    Profiler.record("a", Profiler._origin + 0.5, Profiler._origin + 0.75)
+    path = tmp_path / "profile.json"
+    data = Profiler.export_json(str(path))
+    assert json.loads(path.read_text()) == data
+    span, = data["spans"]
+    assert span["name"] == "a"
+    assert span["start_ms"] == pytest.approx(500.0)
+    assert span["duration_ms"] == pytest.approx(250.0)
+    assert span["thread"] == threading.get_ident()
+
+
+def test_export_chrome_trace(tmp_path):
+    Profiler.record("a", Profiler._origin + 0.001, Profiler._origin + 0.003)
+    path = tmp_path / "trace.json"
+    data = Profiler.export_chrome_trace(str(path))
+    assert json.loads(path.read_text()) == data
+    event, = data["traceEvents"]
+    assert event["ph"] == "X"
+    assert event["ts"] == pytest.approx(1000.0)
+    assert event["dur"] == pytest.approx(2000.0)
+
+
+def test_spans_are_bounded():
+    for _ in range(Profiler.max_events + 5):
+        Profiler.record("tick", 0.0, 0.0)
+    assert len(Profiler.export_json()["spans"]) == Profiler.max_events
+    assert Profiler.stats()["tick"]["count"] == Profiler.max_events + 5
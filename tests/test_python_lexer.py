@@ -0,0 +1,50 @@
+import pytest
+
+from text_editor import PythonLexer
+
+
+def lex(lines):
+    lexer = PythonLexer()
+    state = None
+    result = []
+    for line in lines:
+        tokens, state = lexer.lex_line(line, state)
+        result.append(tokens)
+    return result, state
+
+
+def test_tokens():
+    tokens, state = PythonLexer().lex_line('def foo(x): return "a" + 1  # c', None)
+    assert tokens == [("keyword", 0, 3), ("definition", 4, 7), ("keyword", 12, 18),
+                      ("string", 19, 22), ("number", 25, 26), ("comment", 28, 31)]
+    assert state is None
+
+
+def test_builtins():
+    tokens, _ = PythonLexer().lex_line("print(len(x))", None)
+    assert tokens == [("builtin", 0, 5), ("builtin", 6, 9)]
+
+
+def test_hash_inside_string_is_not_a_comment():
+    tokens, _ = PythonLexer().lex_line("x = '#' # real", None)
+    assert tokens == [("string", 4, 7), ("comment", 8, 14)]
+
+
+@pytest.mark.parametrize("delimiter", ['"""', "'''"])
+def test_triple_quoted_string_across_lines(delimiter):
+    tokens, state = lex([f"s = {delimiter}abc", "middle", f"end{delimiter} + len(x)"])
+    assert tokens == [[("string", 4, 10)], [("string", 0, 6)], [("string", 0, 6), ("builtin", 9, 12)]]
+    assert state is None
+
+
+def test_other_delimiter_does_not_close_the_string():
+    tokens, state = lex(['s = """abc', "'''", "x"])
+    assert tokens[1] == [("string", 0, 3)]
+    assert state == '"""'
+
+
+def test_triple_quoted_string_on_one_line():
+    tokens, state = PythonLexer().lex_line('x = """doc""" if True else 0', None)
+    assert tokens == [("string", 4, 13), ("keyword", 14, 16), ("keyword", 17, 21),
+                      ("keyword", 22, 26), ("number", 27, 28)]
+    assert state is None
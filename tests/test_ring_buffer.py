@@ -0,0 +1,45 @@
+import pytest
+
+from gui_lib import RingBuffer
+
+
+def test_empty():
+    buffer = RingBuffer(3)
+    assert len(buffer) == 0
+    assert buffer.values() == []
+    assert buffer.latest() is None
+
+
+def test_keeps_the_newest_values_in_order():
+    buffer = RingBuffer(3)
+    for value in range(1, 6):
+        buffer.append(value)
+    assert buffer.values() == [3.0, 4.0, 5.0]
+    assert list(buffer) == [3.0, 4.0, 5.0]
+    assert len(buffer) == 3
+    assert buffer.latest() == 5.0
+
+
+@pytest.mark.parametrize("count", range(0, 12))
+def test_matches_a_list_reference(count):
+    buffer = RingBuffer(4)
+    reference = []
+    for value in range(count):
+        buffer.append(value)
+        reference = (reference + [float(value)])[-4:]
+        assert buffer.values() == reference
+
+
+def test_clear():
+    buffer = RingBuffer(2)
+    buffer.append(1)
+    buffer.append(2)
+    buffer.clear()
+    assert buffer.values() == []
+    buffer.append(7)
+    assert buffer.values() == [7.0]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
@@ -0,0 +1,73 @@
+import re
+
+import pytest
+
+from text_editor import SearchWorker
+
+
+@pytest.fixture
+def worker():
+    return SearchWorker()
+
+
+def collect(worker, generation):
+    matches = []
+    while True:
+        job, kind, payload = worker.results.get(timeout=5)
+        assert job == generation
+        if kind == "matches":
+            matches.extend(payload)
+        elif kind == "done":
+            assert payload == len(matches)
+            return matches
+        else:
+            raise AssertionError((kind, payload))
+
+
+def reference(text, pattern):
+    def position(offset):
+        line = text.count("\n", 0, offset) + 1
+        return line, offset - (text.rfind("\n", 0, offset) + 1)
+    return [position(match.start()) + position(match.end())
+            for match in pattern.finditer(text) if match.end() > match.start()]
+
+
+@pytest.mark.parametrize("text, pattern", [
+    ("foo bar\nbar foo\n\nfoo", r"foo"),
+    ("a\nb\nc", r"a\nb"),
+    ("x\n\n\nx\n", r"x\n+"),
+    ("abc", r"z*"),
+    ("line\n" * 50, r"^l"),
+])
+def test_positions_match_a_reference(worker, text, pattern):
+    compiled = re.compile(pattern, re.MULTILINE)
+    assert collect(worker, worker.find(text, compiled)) == reference(text, compiled)
+
+
+def test_results_are_batched(worker, monkeypatch):
+    monkeypatch.setattr(worker, "batch_size", 4)
+    text = "ab\n" * 10
+    worker.find(text, re.compile("a"))
+    sizes = []
+    while True:
+        _, kind, payload = worker.results.get(timeout=5)
+        if kind == "done":
+            break
+        sizes.append(len(payload))
+    assert sizes == [4, 4, 2]
+
+
+def test_replace_all(worker):
+    generation = worker.replace_all("a-a-b", re.compile("a"), "x")
+    assert worker.results.get(timeout=5) == (generation, "replaced", ("x-x-b", 2))
+
+
+def test_newer_job_supersedes_older_results(worker):
+    worker.find("a" * 10000, re.compile("a"))
+    generation = worker.find("b", re.compile("b"))
+    while True:
+        job, kind, payload = worker.results.get(timeout=5)
+        if job == generation and kind == "done":
+            assert payload == 1
+            break
+    assert worker.results.empty()
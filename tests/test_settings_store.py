@@ -0,0 +1,141 @@
+import json
+import os
+import time
+
+from gui_lib import SettingsStore
+
+
+def test_is_a_singleton(settings_path):
+    assert SettingsStore() is SettingsStore()
+    assert SettingsStore().path == str(settings_path)
+
+
+def test_round_trip(settings_path, monkeypatch):
+    store = SettingsStore()
+    store.set("theme", "nordic_frost")
+    store.set("window", [800, 600], app="calculator")
+    store.flush()
+
+    monkeypatch.setattr(SettingsStore, "_instance", None)
+    reloaded = SettingsStore()
+    assert reloaded is not store
+    assert reloaded.get("theme") == "nordic_frost"
+    assert reloaded.get("window", app="calculator") == [800, 600]
+    assert reloaded.get("window") is None
+    assert reloaded.get("missing", "default", app="editor") == "default"
+
+
+def test_changes_are_coalesced_and_written_in_the_background(settings_path, monkeypatch):
+    monkeypatch.setattr(SettingsStore, "write_delay", 0.01)
+    store = SettingsStore()
+    store.set("count", 1)
+    store.set("count", 2)
+    deadline = time.monotonic() + 5
+    while store._written_version != store._version and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store._written_version == store._version
+    assert json.loads(settings_path.read_text()) == {"count": 2}
+    store.close()
+    store._worker.join(5)
+    assert not store._worker.is_alive()
+
+
+def test_write_replaces_the_file_atomically(settings_path, monkeypatch):
+    store = SettingsStore()
+    store.on_error = lambda error: None
+    store.set("value", "old")
+    store.flush()
+    original = settings_path.read_text()
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    store.set("value", "new")
+    store.flush()
+    assert settings_path.read_text() == original
+    assert sorted(os.listdir(settings_path.parent)) == [settings_path.name]
+
+
+def test_failed_write_stays_pending_until_it_succeeds(settings_path, monkeypatch):
+    errors = []
+    store = SettingsStore()
+    store.on_error = errors.append
+    real_replace = os.replace
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    store.set("value", 1)
+    store.flush()
+    store.flush()
+    assert len(errors) == 1
+    assert isinstance(errors[0], OSError)
+    assert not settings_path.exists()
+
+    monkeypatch.setattr(os, "replace", real_replace)
+    store.flush()
+    assert json.loads(settings_path.read_text()) == {"value": 1}
+    assert store._failures == 0
+
+
+def test_worker_retries_with_a_growing_delay(settings_path, monkeypatch):
+    monkeypatch.setattr(SettingsStore, "write_delay", 0.0)
+    monkeypatch.setattr(SettingsStore, "retry_delay", 0.05)
+    attempts = []
+    real_replace = os.replace
+
+    def flaky(*args):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise OSError("disk full")
+        real_replace(*args)
+
+    monkeypatch.setattr(os, "replace", flaky)
+    store = SettingsStore()
+    store.on_error = lambda error: None
+    store.set("value", 1)
+    deadline = time.monotonic() + 5
+    while not settings_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert json.loads(settings_path.read_text()) == {"value": 1}
+    assert len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.05
+    assert attempts[2] - attempts[1] >= 0.1
+
+
+def test_close_gives_up_on_a_failing_write(settings_path, monkeypatch, capsys):
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    store = SettingsStore()
+    store.set("value", 1)
+    store.close()
+    store._worker.join(5)
+    assert not store._worker.is_alive()
+    assert capsys.readouterr().out.count("Error saving settings") == 1
+
+
+def test_older_snapshot_never_overwrites_a_newer_one(settings_path):
+    store = SettingsStore()
+    store.set("value", 1)
+    with store._cond:
+        old = store._take_snapshot()
+    store.set("value", 2)
+    store.flush()
+    store._write(*old)
+    assert json.loads(settings_path.read_text()) == {"value": 2}
+
+
+def test_falls_back_to_the_legacy_file(settings_path):
+    with open(SettingsStore.legacy_file, "w") as file:
+        json.dump({"theme": "flat_ui_light"}, file)
+    assert SettingsStore().get("theme") == "flat_ui_light"
+
+
+def test_unreadable_file_gives_empty_settings(settings_path, capsys):
+    settings_path.write_text("{not json")
+    assert SettingsStore().get("theme") is None
+    assert "Error reading settings" in capsys.readouterr().out
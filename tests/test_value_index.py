@@ -0,0 +1,54 @@
+import random
+
+from gui_lib import ValueIndex
+
+
+def check_search(values, query, limit, result):
+    """Checks a result against a linear scan; non-prefix matches may come in any order."""
+    query = query.casefold()
+    keys = [str(value).casefold() for value in values]
+    prefix = sorted((key for key in keys if key.startswith(query)))
+    total = sum(query in key for key in keys)
+    found, complete = result
+    found_keys = [str(value).casefold() for value in found]
+    assert len(found) == min(limit, total)
+    assert complete == (total <= limit)
+    assert found_keys[:len(prefix)] == prefix[:limit]
+    assert all(query in key and not key.startswith(query) for key in found_keys[len(prefix):])
+
+
+def test_prefix_matches_come_first():
+    index = ValueIndex(["Banana", "Apple", "Pineapple", "apricot"])
+    values, complete = index.search("ap", 10)
+    assert values == ["Apple", "apricot", "Pineapple"]
+    assert complete
+
+
+def test_empty_query_returns_the_first_values():
+    index = ValueIndex(["a", "b", "c"])
+    assert index.search("", 2) == (["a", "b"], False)
+    assert index.search("", 3) == (["a", "b", "c"], True)
+
+
+def test_limit_reports_incomplete_results():
+    index = ValueIndex([f"item {i}" for i in range(10)])
+    values, complete = index.search("item", 3)
+    assert len(values) == 3
+    assert not complete
+
+
+def test_non_string_values():
+    index = ValueIndex([10, 110, 21])
+    assert index.search("1", 10) == ([10, 110, 21], True)
+
+
+def test_typing_a_query_matches_the_reference():
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcab") for _ in range(rng.randint(1, 6))) for _ in range(500)]
+    index = ValueIndex(words)
+    for _ in range(100):
+        query = ""
+        for char in rng.choice(words)[:4]:
+            query += char
+            for limit in (5, 1000):
+                check_search(words, query, limit, index.search(query, limit))